@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+try:
+    import aiohttp
+except ImportError:     # aiohttp yoksa requests oturumu thread'lerde kullanılır
+    aiohttp = None
+
+# Uç nokta başına (yöntem, zaman aşımı s). Telemetri 2 Hz gönderilir; yavaş bir
+# telemetri çağrısı en fazla iki periyot sürer, diğer uç noktaları hiç bekletmez.
+ENDPOINTS = {
+    "giris":              ("POST", 5.0),
+    "sunucusaati":        ("GET", 2.0),
+    "telemetri_gonder":   ("POST", 1.0),
+    "kilitlenme_bilgisi": ("POST", 3.0),
+    "kamikaze_bilgisi":   ("POST", 3.0),
+    "qr_koordinati":      ("GET", 3.0),
+    "hss_koordinatlari":  ("GET", 3.0),
+}
+
+POOL_SIZE = 8               # aynı anda açık tutulan keep-alive bağlantı sayısı
+KEEPALIVE_TIMEOUT = 30.0    # s, boştaki bağlantı havuzda bu kadar tutulur
+LATENCY_WINDOW = 100        # uç nokta başına son N istek gecikmesi
+
+
+class EndpointStats:
+    """Request count, errors and latency of the last LATENCY_WINDOW requests of one endpoint."""
+    __slots__ = ("requests", "errors", "timeouts", "last_error", "_latencies")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.last_error = None
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, latency: float, ok: bool, error=None, timeout=False):
+        self.requests += 1
+        self._latencies.append(latency)
+        if not ok:
+            self.errors += 1
+            self.last_error = error
+        if timeout:
+            self.timeouts += 1
+
+    def report(self) -> dict:
+        lat = sorted(self._latencies)
+        if not lat:
+            return {"requests": self.requests, "errors": self.errors, "timeouts": self.timeouts}
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "last_ms": self._latencies[-1] * 1e3,
+            "avg_ms": sum(lat) / len(lat) * 1e3,
+            "p95_ms": lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1e3,
+            "max_ms": lat[-1] * 1e3,
+            "last_error": self.last_error,
+        }
+
+
+class AsyncCompetitionClient:
+    """
+    asyncio version of CompetitionClient with the same (ok, data) results.
+
+    All endpoints share one keep-alive connection pool, so concurrent calls
+    (telemetry, lock info, kamikaze info, coordinate refreshes) do not wait
+    for each other. Each endpoint has its own timeout (ENDPOINTS) and its
+    latency is tracked in an EndpointStats. Uses aiohttp when installed,
+    otherwise a pooled requests.Session driven through asyncio.to_thread.
+    """
+    def __init__(self, base_url, pool_size: int = POOL_SIZE, timeouts=None):
+        self.base_url = base_url.rstrip('/')
+        self.pool_size = pool_size
+        self.timeouts = {name: t for name, (_, t) in ENDPOINTS.items()}
+        self.timeouts.update(timeouts or {})
+        self.stats = {name: EndpointStats() for name in ENDPOINTS}
+        self.logger = logging.getLogger("CompetitionClient")
+        self._session = None
+
+    @property
+    def backend(self) -> str:
+        return "aiohttp" if aiohttp is not None else "requests"
+
+    def _url(self, endpoint):
+        return f"{self.base_url}/api/{endpoint.lstrip('/')}"
+
+    async def open(self):
+        if self._session is not None:
+            return
+        if aiohttp is not None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=KEEPALIVE_TIMEOUT)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  headers={'Content-Type': 'application/json'})
+        else:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.headers.update({'Content-Type': 'application/json'})
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+
+    async def close(self):
+        session, self._session = self._session, None
+        if session is None:
+            return
+        if aiohttp is not None:
+            await session.close()
+        else:
+            session.close()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def request(self, endpoint, payload=None):
+        """Calls one endpoint; returns (ok, parsed JSON or error text)."""
+        if self._session is None:
+            await self.open()
+        method, _ = ENDPOINTS[endpoint]
+        timeout = self.timeouts[endpoint]
+        stats = self.stats[endpoint]
+        t0 = time.perf_counter()
+        try:
+            if aiohttp is not None:
+                ok, data = await self._request_aiohttp(method, endpoint, payload, timeout)
+            else:
+                ok, data = await asyncio.to_thread(self._request_requests, method, endpoint, payload, timeout)
+        except (asyncio.TimeoutError, TimeoutError):
+            stats.record(time.perf_counter() - t0, False, "timeout", timeout=True)
+            return False, f"Zaman aşımı ({timeout:g} s)"
+        except Exception as e:
+            stats.record(time.perf_counter() - t0, False, str(e))
+            return False, str(e)
+        stats.record(time.perf_counter() - t0, ok, None if ok else str(data)[:200])
+        return ok, data
+
+    async def _request_aiohttp(self, method, endpoint, payload, timeout):
+        async with self._session.request(method, self._url(endpoint), json=payload,
+                                         timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            if resp.status == 200:
+                return True, await resp.json(content_type=None)
+            return False, await resp.text()
+
+    def _request_requests(self, method, endpoint, payload, timeout):
+        import requests
+        try:
+            resp = self._session.request(method, self._url(endpoint), json=payload, timeout=timeout)
+        except requests.Timeout as e:
+            raise TimeoutError(str(e)) from e
+        if resp.status_code == 200:
+            return True, resp.json()
+        return False, resp.text
+
+    def report(self) -> dict:
+        """Per-endpoint latency/error statistics of the endpoints used so far."""
+        return {name: s.report() for name, s in self.stats.items() if s.requests}
+
+    # --- Uç noktalar (CompetitionClient ile aynı) ----------------------
+
+    async def login(self, username, password):
+        ok, data = await self.request("giris", {"kadi": username, "sifre": password})
+        if ok:
+            self.logger.info("Login successful")
+        else:
+            self.logger.error(f"Login failed: {data}")
+        return ok, data
+
+    async def get_server_time(self):
+        return await self.request("sunucusaati")
+
+    async def send_telemetry(self, data):
+        return await self.request("telemetri_gonder", data)
+
+    async def send_lock_info(self, data):
+        return await self.request("kilitlenme_bilgisi", data)
+
+    async def send_kamikaze_info(self, text_info):
+        return await self.request("kamikaze_bilgisi", {"kamikaze_bilgisi": text_info})
+
+    async def get_qr_coord(self):
+        return await self.request("qr_koordinati")
+
+    async def get_hss_coords(self):
+        return await self.request("hss_koordinatlari")
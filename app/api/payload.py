@@ -0,0 +1,50 @@
+import re
+
+from mavlink.time_sync import gps_saati
+
+
+def team_number(username: str, default: int = 1) -> int:
+    """Team number taken from the server username (e.g. 'takim12' -> 12)."""
+    match = re.search(r"\d+", username or "")
+    return int(match.group()) if match else default
+
+
+# None veya bozuk değerler sunucuya 0 olarak gider
+def _float(val) -> float:
+    try:
+        return float(val) if val is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _int(val) -> int:
+    try:
+        return int(val) if val is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def build_telemetry_payload(t, team: int) -> dict:
+    """
+    POST /api/telemetri_gonder body from a TelemetrySnapshot (or Telemetry).
+    gps_saati comes from the vehicle's UTC time (TIMESYNC/SYSTEM_TIME) when
+    synced, otherwise from the system clock.
+    """
+    return {
+        "takim_numarasi": team,
+        "iha_enlem": _float(getattr(t, "iha_enlem", 0)),
+        "iha_boylam": _float(getattr(t, "iha_boylam", 0)),
+        "iha_irtifa": _float(getattr(t, "iha_irtifa", 0)),
+        "iha_dikilme": _float(getattr(t, "iha_dikilme", 0)),
+        "iha_yonelme": _float(getattr(t, "iha_yonelme", 0)),
+        "iha_yatis": _float(getattr(t, "iha_yatis", 0)),
+        "iha_hiz": _float(getattr(t, "iha_hiz", 0)),
+        "iha_batarya": _float(getattr(t, "iha_batarya0", 0)),
+        "iha_otonom": _int(getattr(t, "iha_otonom", 0)),
+        "iha_kilitlenme": _int(getattr(t, "iha_kilitlenme", 0)),
+        "hedef_merkez_X": _int(getattr(t, "hedef_merkez_X", 0)),
+        "hedef_merkez_Y": _int(getattr(t, "hedef_merkez_Y", 0)),
+        "hedef_genislik": _int(getattr(t, "hedef_genislik", 0)),
+        "hedef_yukseklik": _int(getattr(t, "hedef_yukseklik", 0)),
+        "gps_saati": gps_saati(t),
+    }
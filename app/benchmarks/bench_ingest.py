@@ -0,0 +1,167 @@
+# MAVLink okuma yolu karşılaştırması: recv_match() (mesaj başına çözme) ile
+# BatchReader (toplu okuma + sadece abone olunan mesajları çözme).
+#
+#   cd app && python -m benchmarks.bench_ingest [kayit.tlog] [--baud 921600]
+#
+# Kayıt verilmezse tipik ArduPilot akışına benzeyen sentetik bir yakalama üretilir.
+import argparse
+import time
+
+from pymavlink import mavutil
+
+from mavlink.batch_reader import BatchReader, RawFrame, CHUNK_SIZE
+from mavlink.router import FrameSplitter
+from mavlink.telemetry_handler import TelemetryHandler
+from mavlink.tlog import TlogReader, TlogWriter
+from mavlink.vehicle import Vehicle
+
+mavlink = mavutil.mavlink
+
+DEFAULT_BAUD = 921600
+SYNTHETIC_SECONDS = 60
+
+# Sentetik akış: (Hz, mesaj üreticisi); abone olunmayan IMU/servo/basınç mesajları dahil
+_SYNTHETIC_STREAMS = (
+    (1, lambda m, t: m.heartbeat_encode(mavlink.MAV_TYPE_FIXED_WING, mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                                        mavlink.MAV_MODE_FLAG_SAFETY_ARMED, 10, mavlink.MAV_STATE_ACTIVE)),
+    (50, lambda m, t: m.attitude_encode(t, 0.1, -0.05, 1.2, 0.0, 0.0, 0.0)),
+    (10, lambda m, t: m.global_position_int_encode(t, 411234567, 291234567, 120000, 80000, 150, 0, 0, 12000)),
+    (5, lambda m, t: m.gps_raw_int_encode(t * 1000, 3, 411234567, 291234567, 120000, 80, 120, 1500, 12000, 14)),
+    (10, lambda m, t: m.vfr_hud_encode(18.0, 17.5, 120, 55, 80.0, 0.2)),
+    (2, lambda m, t: m.sys_status_encode(0, 0, 0, 500, 15800, 1200, 76, 0, 0, 0, 0, 0, 0)),
+    (50, lambda m, t: m.raw_imu_encode(t * 1000, 10, -5, -1000, 1, 2, 3, 200, 100, -300)),
+    (50, lambda m, t: m.scaled_imu2_encode(t, 10, -5, -1000, 1, 2, 3, 200, 100, -300)),
+    (20, lambda m, t: m.servo_output_raw_encode(t * 1000, 0, 1500, 1500, 1100, 1500, 0, 0, 0, 0)),
+    (10, lambda m, t: m.scaled_pressure_encode(t, 1013.2, 0.1, 2500)),
+    (10, lambda m, t: m.rc_channels_encode(t, 8, 1500, 1500, 1100, 1500, 1000, 1000, 1000, 1000,
+                                           0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 200)),
+)
+
+
+def synthetic_capture(seconds: float = SYNTHETIC_SECONDS) -> bytes:
+    """Raw MAVLink byte stream of `seconds` of the _SYNTHETIC_STREAMS mix."""
+    mav = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+    events = []
+    for rate, build in _SYNTHETIC_STREAMS:
+        period_ms = 1000 / rate
+        events += [(int(i * period_ms), build) for i in range(int(seconds * rate))]
+    events.sort(key=lambda e: e[0])
+    return b"".join(build(mav, t).pack(mav) for t, build in events)
+
+
+def load_capture(path) -> bytes:
+    """Frames of a tlog joined into the byte stream the link would deliver."""
+    reader = TlogReader(path)
+    try:
+        return b"".join(bytes(frame) for _, _, frame in reader.frames())
+    finally:
+        reader.close()
+
+
+def save_capture(data: bytes, path):
+    writer = TlogWriter(path)
+    for frame in FrameSplitter().feed(data):
+        writer.write(frame)
+    writer.close()
+
+
+class _MemoryLink(mavutil.mavfile):
+    """mavfile that serves a capture from memory, as if it was all buffered on the port."""
+    def __init__(self, data: bytes):
+        super().__init__(None, "memory")
+        self._data = memoryview(data)
+        self._pos = 0
+
+    def recv(self, n=None):
+        if n is None:
+            n = self.mav.bytes_needed()
+        chunk = self._data[self._pos:self._pos + n]
+        self._pos += len(chunk)
+        return bytes(chunk)
+
+    def write(self, buf):
+        pass
+
+
+def _run_recv_match(data: bytes):
+    link = _MemoryLink(data)
+    handler = TelemetryHandler()
+    vehicle = Vehicle(1, 1)
+    count = 0
+    while True:
+        msg = link.recv_match(blocking=False)
+        if msg is None:
+            break
+        count += 1
+        handler.handle_message(msg, vehicle.state, vehicle.history)
+    return count, vehicle.state
+
+
+def _run_batch(data: bytes):
+    link = _MemoryLink(data)
+    handler = TelemetryHandler()
+    reader = BatchReader(link, handler.subscribed_ids)
+    vehicle = Vehicle(1, 1)
+    count = 0
+    while True:
+        reader.read()
+        msgs = reader.parse()
+        if not msgs:
+            break
+        count += len(msgs)
+        for msg in msgs:
+            if type(msg) is not RawFrame:
+                handler.handle_message(msg, vehicle.state, vehicle.history)
+    return count, vehicle.state
+
+
+def measure(fn, data: bytes, baud: int) -> dict:
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+    count, state = fn(data)
+    cpu = time.process_time() - cpu0
+    wall = time.perf_counter() - wall0
+    link_bytes_per_sec = baud / 10          # 8N1: byte başına 10 bit
+    return {
+        "messages": count,
+        "msgs_per_sec": count / wall,
+        "us_per_msg": cpu / count * 1e6 if count else 0.0,
+        # Bu baud hızında dolu bir linki okumanın gerektirdiği tek çekirdek CPU yüzdesi
+        "cpu_pct_at_baud": 100.0 * cpu / len(data) * link_bytes_per_sec,
+        "state": state,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="recv_match ile toplu okuma yolunun karşılaştırması")
+    parser.add_argument("capture", nargs="?", help="tlog kaydı (verilmezse sentetik akış)")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUD)
+    parser.add_argument("--seconds", type=float, default=SYNTHETIC_SECONDS, help="sentetik akış süresi")
+    parser.add_argument("--save", help="sentetik akışı tlog olarak kaydet")
+    args = parser.parse_args(argv)
+
+    if args.capture:
+        data = load_capture(args.capture)
+        source = args.capture
+    else:
+        data = synthetic_capture(args.seconds)
+        source = f"sentetik {args.seconds:g} s"
+        if args.save:
+            save_capture(data, args.save)
+
+    print(f"Kaynak: {source}, {len(data) / 1024:.0f} kB, {args.baud} baud, parça {CHUNK_SIZE // 1024} kB")
+    results = {}
+    for name, fn in (("recv_match", _run_recv_match), ("batch", _run_batch)):
+        results[name] = r = measure(fn, data, args.baud)
+        print(f"{name:>10}: {r['messages']:>8} mesaj  {r['msgs_per_sec']:>10.0f} msg/s  "
+              f"{r['us_per_msg']:>6.1f} µs/msg  CPU %{r['cpu_pct_at_baud']:.1f} @ {args.baud}")
+    base, batch = results["recv_match"], results["batch"]
+    print(f"Hızlanma: {batch['msgs_per_sec'] / base['msgs_per_sec']:.2f}x")
+    if base["messages"] != batch["messages"] or base["state"].snapshot(0, 0) != batch["state"].snapshot(0, 0):
+        print("UYARI: iki yolun sonuçları farklı")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,366 @@
+# Telemetri alım yolu mikro-benchmark'ları; sonuçlar JSON baseline dosyasına yazılır,
+# --compare ile eski bir baseline'a göre eşik üstü gerilemeler işaretlenir.
+#
+#   cd app && python -m benchmarks.suite --save benchmarks/baseline.json
+#   cd app && python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 10
+#   cd app && python -m benchmarks.suite --only handle,qt kayit.tlog
+#
+# handle      TelemetryHandler.handle_message, kayıttaki mesaj karışımı üzerinde
+# ingest      recv_match() ile BatchReader okuma yolları (bellekten)
+# worker      MavlinkWorker döngüsü, sentetik UDP kaynağına karşı (toplu ve recv_match)
+# qt          TelemetrySnapshot yayını, offscreen platformdaki bir Qt alıcısına
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from pymavlink import mavutil
+
+from benchmarks.bench_ingest import (DEFAULT_BAUD, _run_batch, _run_recv_match, load_capture,
+                                     measure, synthetic_capture)
+from mavlink.router import FrameSplitter
+from mavlink.telemetry_handler import TelemetryHandler
+from mavlink.vehicle import Vehicle
+
+mavlink = mavutil.mavlink
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 10.0        # %, bundan fazla kötüleşme gerileme sayılır
+REPEATS = 5                     # bellek içi benchmark'lar en iyi N tekrarın sonucu
+WORKER_SECONDS = 5.0
+WORKER_RATE = 20000             # msg/s, UDP kaynağının sunduğu hız
+QT_MESSAGES = 20000
+BENCHES = ("handle", "ingest", "worker", "qt")
+
+# Karşılaştırılan metrikler: +1 büyük olan iyi, -1 küçük olan iyi
+METRICS = {
+    "msgs_per_sec": +1,
+    "us_per_msg": -1,
+    "latency_p99_us": -1,
+}
+
+
+def qt_app(gui: bool):
+    """The process-wide Qt application; a QApplication on the offscreen platform if gui."""
+    from PyQt5.QtCore import QCoreApplication
+    app = QCoreApplication.instance()
+    if app is not None:
+        return app
+    if not gui:
+        return QCoreApplication(sys.argv[:1])
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    return QApplication(sys.argv[:1])
+
+
+# --- handle_message ----------------------------------------------------
+
+def decode_capture(data: bytes):
+    """Decodes a capture once, so the handler benchmark does not time the parser."""
+    mav = mavlink.MAVLink(None)
+    mav.robust_parsing = True
+    return [m for m in mav.parse_buffer(data) or () if m.get_type() != "BAD_DATA"]
+
+
+def bench_handle(msgs, repeats: int = REPEATS) -> dict:
+    handler = TelemetryHandler()
+    best = None
+    for _ in range(repeats):
+        vehicle = Vehicle(1, 1)
+        handle, state, history = handler.handle_message, vehicle.state, vehicle.history
+        t0 = time.perf_counter()
+        for msg in msgs:
+            handle(msg, state, history)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return {"messages": len(msgs), "msgs_per_sec": len(msgs) / best, "us_per_msg": best / len(msgs) * 1e6}
+
+
+# --- okuma yolları -------------------------------------------------------
+
+def bench_ingest(data: bytes, baud: int = DEFAULT_BAUD, repeats: int = REPEATS) -> dict:
+    results = {}
+    for name, fn in (("ingest_recv_match", _run_recv_match), ("ingest_batch", _run_batch)):
+        runs = [measure(fn, data, baud) for _ in range(repeats)]
+        best = max(runs, key=lambda r: r["msgs_per_sec"])
+        best.pop("state")
+        results[name] = best
+    return results
+
+
+# --- MavlinkWorker / UDP -----------------------------------------------
+
+def _free_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _UdpSource(threading.Thread):
+    """
+    Sends capture frames, one per datagram, at a fixed rate on absolute
+    deadlines. Heartbeats are repeated until the worker has seen the vehicle.
+    """
+    BATCH = 0.001       # s, her uyanışta gönderilen dilim
+
+    def __init__(self, frames, port, rate, seconds):
+        super().__init__(daemon=True)
+        self.frames = frames
+        self.dest = ("127.0.0.1", port)
+        self.rate = rate
+        self.seconds = seconds
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.ready = threading.Event()      # worker ilk heartbeat'i aldı
+        self.sent = 0
+        self.cpu = 0.0
+        self.elapsed = 0.0
+        mav = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+        self._heartbeat = mav.heartbeat_encode(mavlink.MAV_TYPE_FIXED_WING, mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                                               0, 0, mavlink.MAV_STATE_ACTIVE).pack(mav)
+
+    def run(self):
+        while not self.ready.wait(0.05):
+            self.sock.sendto(self._heartbeat, self.dest)
+        cpu0 = time.thread_time()
+        t0 = time.perf_counter()
+        total = int(self.rate * self.seconds)
+        frames, n = self.frames, len(self.frames)
+        while self.sent < total:
+            due = min(total, int((time.perf_counter() - t0) * self.rate) + 1)
+            while self.sent < due:
+                self.sock.sendto(frames[self.sent % n], self.dest)
+                self.sent += 1
+            time.sleep(self.BATCH)
+        self.elapsed = time.perf_counter() - t0
+        self.cpu = time.thread_time() - cpu0
+        self.sock.close()
+
+
+def bench_worker(frames, batch_ingest: bool, rate: int = WORKER_RATE, seconds: float = WORKER_SECONDS) -> dict:
+    from PyQt5.QtCore import QEventLoop, QTimer
+    from mavlink.mavlink_worker import MavlinkWorker
+
+    app = qt_app(gui=False)
+    port = _free_udp_port()
+    # Watchdog kapalı: worker yetişemezse yeniden bağlanma ölçümü bozmasın
+    worker = MavlinkWorker(f"udpin:127.0.0.1:{port}", batch_ingest=batch_ingest, heartbeat_timeout=0)
+    source = _UdpSource(frames, port, rate, seconds)
+    worker.vehicle_added.connect(lambda *_: source.ready.set())
+
+    loop = QEventLoop()
+    worker.start()
+    source.start()
+    wait = QTimer()
+    wait.timeout.connect(lambda: None if source.is_alive() else loop.quit())
+    wait.start(50)
+    cpu0 = time.process_time()
+    loop.exec_()
+    # Soketteki son mesajların işlenmesi için kısa bir süre
+    time.sleep(0.2)
+    cpu = time.process_time() - cpu0
+    worker.stop()
+    worker.wait()
+    wait.stop()
+    app.processEvents()
+
+    received = worker.stats.total
+    worker_cpu = max(cpu - source.cpu, 0.0)
+    return {
+        "offered": source.sent,
+        "messages": received,
+        "msgs_per_sec": received / source.elapsed if source.elapsed else 0.0,
+        "us_per_msg": worker_cpu / received * 1e6 if received else 0.0,
+        "loss_pct": 100.0 * (1 - received / source.sent) if source.sent else 0.0,
+    }
+
+
+# --- Qt yayını -----------------------------------------------------------
+
+def bench_qt(count: int = QT_MESSAGES) -> dict:
+    """
+    A QThread emits `count` freshly built snapshots as fast as it can; a
+    receiver in the GUI thread of an offscreen QApplication takes them
+    through the queued connection, as the main window does.
+    """
+    from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+    app = qt_app(gui=True)
+
+    class Emitter(QThread):
+        telemetry = pyqtSignal(object)
+
+        def run(self):
+            vehicle = Vehicle(1, 1)
+            for seq in range(count):
+                vehicle.state.iha_hiz = float(seq)
+                self.telemetry.emit(vehicle.state.snapshot(seq, time.monotonic()))
+
+    class Receiver(QObject):
+        def __init__(self):
+            super().__init__()
+            self.latencies = []
+            self.last = None
+
+        def on_telemetry(self, snap):
+            now = time.monotonic()
+            self.latencies.append(now - snap.rx_time)
+            self.last = now
+            if len(self.latencies) == count:
+                app.quit()
+
+    emitter, receiver = Emitter(), Receiver()
+    emitter.telemetry.connect(receiver.on_telemetry)
+    QTimer.singleShot(60000, app.quit)      # alıcı takılırsa
+    t0 = time.monotonic()
+    emitter.start()
+    app.exec_()
+    emitter.wait()
+
+    received = len(receiver.latencies)
+    elapsed = (receiver.last or t0) - t0
+    lat = sorted(receiver.latencies) or [0.0]
+    return {
+        "messages": received,
+        "msgs_per_sec": received / elapsed if elapsed else 0.0,
+        "us_per_msg": elapsed / received * 1e6 if received else 0.0,
+        "latency_p50_us": statistics.median(lat) * 1e6,
+        "latency_p99_us": lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1e6,
+    }
+
+
+# --- baseline ------------------------------------------------------------
+
+def environment() -> dict:
+    import PyQt5.QtCore
+    from pymavlink import __version__ as pymavlink_version
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "qt": PyQt5.QtCore.QT_VERSION_STR,
+        "pymavlink": pymavlink_version,
+    }
+
+
+def save_baseline(results: dict, path, source: str):
+    doc = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": source,
+        "environment": environment(),
+        "results": results,
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def load_baseline(path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Compares results against a baseline's results. Returns rows of
+    (bench, metric, old, new, change_pct, regressed); change_pct is signed
+    so that positive always means better.
+    """
+    rows = []
+    for bench, new in results.items():
+        old = baseline.get(bench)
+        if not old:
+            continue
+        for metric, direction in METRICS.items():
+            if metric not in new or not old.get(metric):
+                continue
+            change = direction * (new[metric] - old[metric]) / old[metric] * 100.0
+            rows.append((bench, metric, old[metric], new[metric], change, change < -threshold))
+    return rows
+
+
+# --- komut satırı --------------------------------------------------------
+
+def run(benches, data: bytes, baud: int, worker_seconds: float, worker_rate: int, qt_messages: int) -> dict:
+    results = {}
+    if "qt" in benches:
+        qt_app(gui=True)        # worker benchmark'ı düz QCoreApplication oluşturmasın
+    if "handle" in benches:
+        results["handle_message"] = bench_handle(decode_capture(data))
+    if "ingest" in benches:
+        results.update(bench_ingest(data, baud))
+    if "worker" in benches:
+        frames = [bytes(f) for f in FrameSplitter().feed(data)]
+        results["worker_batch"] = bench_worker(frames, True, worker_rate, worker_seconds)
+        results["worker_recv_match"] = bench_worker(frames, False, worker_rate, worker_seconds)
+    if "qt" in benches:
+        results["qt_publish"] = bench_qt(qt_messages)
+    return results
+
+
+def _print_results(results: dict):
+    for name, r in results.items():
+        extra = ""
+        if "loss_pct" in r:
+            extra = f"  kayıp %{r['loss_pct']:.1f} ({r['offered']} gönderildi)"
+        elif "latency_p99_us" in r:
+            extra = f"  gecikme p50 {r['latency_p50_us']:.0f} µs  p99 {r['latency_p99_us']:.0f} µs"
+        print(f"{name:>18}: {r['messages']:>8} mesaj  {r['msgs_per_sec']:>10.0f} msg/s  "
+              f"{r['us_per_msg']:>7.2f} µs/msg{extra}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Telemetri alım yolu benchmark'ları")
+    parser.add_argument("capture", nargs="?", help="tlog kaydı (verilmezse sentetik akış)")
+    parser.add_argument("--only", default=",".join(BENCHES), help=f"virgülle ayrılmış: {', '.join(BENCHES)}")
+    parser.add_argument("--seconds", type=float, default=60, help="sentetik akış süresi")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUD)
+    parser.add_argument("--worker-seconds", type=float, default=WORKER_SECONDS)
+    parser.add_argument("--worker-rate", type=int, default=WORKER_RATE, help="UDP kaynağının hızı (msg/s)")
+    parser.add_argument("--qt-messages", type=int, default=QT_MESSAGES)
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="sonuçları baseline olarak kaydet")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="baseline ile karşılaştır")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="gerileme eşiği (%%)")
+    args = parser.parse_args(argv)
+
+    benches = [b.strip() for b in args.only.split(",") if b.strip()]
+    unknown = set(benches) - set(BENCHES)
+    if unknown:
+        parser.error(f"bilinmeyen benchmark: {', '.join(sorted(unknown))}")
+
+    if args.capture:
+        data = load_capture(args.capture)
+        source = args.capture
+    else:
+        data = synthetic_capture(args.seconds)
+        source = f"sentetik {args.seconds:g} s"
+    print(f"Kaynak: {source}, {len(data) / 1024:.0f} kB")
+
+    results = run(benches, data, args.baud, args.worker_seconds, args.worker_rate, args.qt_messages)
+    _print_results(results)
+
+    status = 0
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        rows = compare(results, baseline["results"], args.threshold)
+        print(f"\nBaseline: {args.compare} ({baseline.get('created', '?')}), eşik %{args.threshold:g}")
+        for bench, metric, old, new, change, regressed in rows:
+            mark = "GERİLEME" if regressed else ""
+            print(f"{bench:>18} {metric:<15} {old:>12.2f} -> {new:>12.2f}  {change:+6.1f}%  {mark}")
+        if any(r[5] for r in rows):
+            status = 1
+    if args.save:
+        save_baseline(results, args.save, source)
+        print(f"Baseline kaydedildi: {args.save}")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
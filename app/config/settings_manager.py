@@ -4,14 +4,24 @@ import os
 from pathlib import Path
 
 SETTINGS_FILE = Path(__file__).resolve().parent / "connection_settings.json"
+LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
 
 DEFAULT_SETTINGS = {
-    "plane_connection_type": "udp",    # 'udp' or 'serial'
+    "plane_connection_type": "udp",    # 'udp', 'serial' or 'replay'
     "plane_port": "14550",
     "plane_address": "0.0.0.0",
     "plane_serial_port": "/dev/ttyUSB0",
     "plane_baud": "57600",
+    "secondary_link": "",              # yedek link (ör. '/dev/ttyUSB0:57600' veya 'udpin:0.0.0.0:14551')
+    "replay_file": "",
+    "replay_speed": "1",               # 0 = olabildiğince hızlı
+    "record_tlog": False,              # ham MAVLink akışını logs/*.tlog'a kaydet
+    "stream_profile": "radio",         # 'radio', 'wifi', 'bench' veya '' (dokunma)
+    "ingest_process": False,           # MAVLink çözümlemeyi ayrı süreçte çalıştır (shared memory)
+    "router_outputs": "",              # virgülle ayrılmış: udp:HOST:PORT, tcpin:[HOST:]PORT
     "camera_port": "5000",
+    "ui_rate_hz": "25",                # GUI telemetri yayın hızı (Hz)
+    "heartbeat_timeout": "3",          # s, heartbeat gelmezse link kopmuş sayılır ve yeniden açılır (0 = kapalı)
     "server_address": "http://10.1.36.78:8000",
     "server_username": "",
     "server_password": ""
@@ -44,3 +54,44 @@ class SettingsManager:
         except Exception as e:
             print(f"Error saving settings: {e}")
             return False
+
+
+# --- Ayarlardan worker parametreleri (GUI ve headless ortak) ---
+
+def mavlink_connection_string(settings) -> str:
+    ctype = settings.get("plane_connection_type", "udp")
+    if ctype == "serial":
+        port = settings.get("plane_serial_port", "/dev/ttyUSB0")
+        baud = settings.get("plane_baud", "57600")
+        conn = f"{port}:{baud}"
+    elif ctype == "replay":
+        path = settings.get("replay_file", "")
+        speed = settings.get("replay_speed", "1") or "1"
+        return f"replay:{speed}:{path}"
+    else:
+        # UDP (default)
+        addr = settings.get("plane_address", "0.0.0.0")
+        port = settings.get("plane_port", "14550")
+        conn = f"udpin:{addr}:{port}"
+
+    # Yedek link varsa ikisinden birden okunur (MultiLinkConnection)
+    secondary = (settings.get("secondary_link") or "").strip()
+    if secondary:
+        conn = f"{conn},{secondary}"
+    return conn
+
+
+def tlog_record_path(settings):
+    """Kayıt açıksa logs/ altında zaman damgalı bir .tlog yolu döndürür."""
+    if not settings.get("record_tlog", False):
+        return None
+    from datetime import datetime
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    return str(LOG_DIR / datetime.now().strftime("%Y%m%d_%H%M%S.tlog"))
+
+
+def float_setting(settings, key, default: float) -> float:
+    try:
+        return float(settings.get(key, default))
+    except (TypeError, ValueError):
+        return default
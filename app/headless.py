@@ -0,0 +1,176 @@
+# Arayüzsüz yer istasyonu: MAVLink linki ve yarışma sunucusuna telemetri aktarımı,
+# QtWebEngine / OpenCV / ekran gerektirmeden (ör. yardımcı bilgisayarda yedek röle).
+#
+#   cd app && python headless.py                       # connection_settings.json ile
+#   cd app && python headless.py --no-server --stats 2
+#   cd app && python headless.py --connection udpin:0.0.0.0:14551
+import argparse
+import signal
+import sys
+import time
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+
+from api.payload import build_telemetry_payload, team_number
+from config.settings_manager import SettingsManager, float_setting, mavlink_connection_string, tlog_record_path
+from mavlink.mavlink_worker import MavlinkWorker
+from mavlink.process_worker import ProcessMavlinkWorker
+from mavlink.router import parse_output_list
+
+STATS_PERIOD = 10.0     # s, özet satırı aralığı
+
+
+def _log(text):
+    print(f"{time.strftime('%H:%M:%S')} {text}", flush=True)
+
+
+class HeadlessGCS:
+    """
+    MavlinkWorker + ServerWorker wired together the way MainWindow does,
+    with log lines instead of widgets.
+    """
+    def __init__(self, settings, connection=None, server=True, stats_period=STATS_PERIOD):
+        self.settings = settings
+        self.team = team_number(settings.get("server_username", ""))
+        self.stats_period = stats_period
+        self.link = None
+        self.endpoints = {}
+        self.rate = None
+        self.sent_ok = 0
+        self.sent_err = 0
+        self.last_error = None
+
+        worker_class = ProcessMavlinkWorker if settings.get("ingest_process", False) else MavlinkWorker
+        self.w = worker_class(connection_string=connection or mavlink_connection_string(settings),
+                              ui_rate_hz=float_setting(settings, "ui_rate_hz", 25.0),
+                              record_path=tlog_record_path(settings),
+                              stream_profile=settings.get("stream_profile") or None,
+                              router_outputs=parse_output_list(settings.get("router_outputs")),
+                              heartbeat_timeout=float_setting(settings, "heartbeat_timeout", 3.0))
+        self.w.status.connect(_log)
+        self.w.error.connect(lambda e: _log(f"HATA: {e}"))
+        self.w.telemetry.connect(self.on_telemetry)
+        self.w.link_stats.connect(self.on_link_stats)
+        self.w.link_lost.connect(lambda silent: _log(f"Link koptu ({silent:.1f} s heartbeat yok)"))
+        self.w.link_restored.connect(lambda took: _log(f"Link geri geldi ({took:.1f} s)"))
+        self.w.param_update.connect(self.on_param_update)
+
+        self.srv_worker = None
+        if server:
+            # requests sadece sunucu kullanılıyorsa yüklenir
+            from workers.server_worker import ServerWorker
+            self.srv_worker = ServerWorker(settings.get("server_address", "http://10.1.36.78:8000"),
+                                           settings.get("server_username", ""),
+                                           settings.get("server_password", ""))
+            self.srv_worker.login_result.connect(lambda ok, msg: _log(f"Sunucu: {msg}"))
+            self.srv_worker.data_fetched.connect(lambda dtype, data: _log(f"Sunucu {dtype}: {data}"))
+            self.srv_worker.telemetry_result.connect(self.on_server_telemetry_result)
+            self.srv_worker.endpoint_stats.connect(self.on_endpoint_stats)
+            self.srv_worker.telemetry_rate.connect(self.on_telemetry_rate)
+            self.srv_worker.error.connect(lambda e: _log(f"Sunucu hatası: {e}"))
+
+        self._stats_timer = QTimer()
+        self._stats_timer.timeout.connect(self.print_stats)
+
+    def start(self):
+        self.w.start()
+        if self.srv_worker is not None:
+            self.srv_worker.start()
+        if self.stats_period > 0:
+            self._stats_timer.start(int(self.stats_period * 1000))
+
+    def stop(self):
+        self._stats_timer.stop()
+        if self.srv_worker is not None:
+            self.srv_worker.stop()
+        self.w.stop()
+        self.w.wait(1500)
+
+    def on_telemetry(self, t):
+        if self.srv_worker is not None and self.srv_worker.isRunning():
+            self.srv_worker.update_telemetry_data(build_telemetry_payload(t, self.team))
+
+    def on_param_update(self, report):
+        # Sayılar status satırında; burada sadece değişen/kaldırılan isimler
+        if report["state"] != "ready":
+            return
+        for label, names in (("değişen", report["changed"]), ("kaldırılan", report["removed"])):
+            if names:
+                shown = ", ".join(names[:20])
+                more = f" (+{len(names) - 20})" if len(names) > 20 else ""
+                _log(f"Parametre {label}: {shown}{more}")
+
+    def on_link_stats(self, stats):
+        self.link = stats
+
+    def on_endpoint_stats(self, stats):
+        self.endpoints = stats
+
+    def on_telemetry_rate(self, rate):
+        self.rate = rate
+
+    def on_server_telemetry_result(self, success, result):
+        if success:
+            self.sent_ok += 1
+        else:
+            self.sent_err += 1
+            self.last_error = result
+
+    def print_stats(self):
+        parts = []
+        link = self.link
+        if link:
+            parts.append(f"link kayıp %{link['loss_pct']:.1f} {link['msgs_per_sec']:.0f} msg/s")
+            if link.get("heartbeat_age") is not None:
+                parts.append(f"HB {link['heartbeat_age']:.1f}s")
+        else:
+            parts.append("link -")
+        snap = self.w.latest_snapshot
+        if snap is not None and snap.iha_enlem is not None:
+            parts.append(f"konum {snap.iha_enlem:.6f},{snap.iha_boylam:.6f} {snap.iha_irtifa or 0:.0f} m")
+        if self.srv_worker is not None:
+            parts.append(f"sunucu {self.sent_ok} OK / {self.sent_err} hata")
+            telem = self.endpoints.get("telemetri_gonder")
+            if telem and "avg_ms" in telem:
+                parts.append(f"telemetri ort {telem['avg_ms']:.0f} ms p95 {telem['p95_ms']:.0f} ms")
+            rate = self.rate
+            if rate and rate["sent"]:
+                parts.append(f"{rate['achieved_hz']:.2f} Hz sapma p95 {rate['jitter_p95_ms']:.0f} ms "
+                             f"kaçırılan {rate['missed']} meşgul {rate['busy']}")
+            if self.sent_err and self.last_error:
+                parts.append(f"son hata: {str(self.last_error)[:80]}")
+        _log(" | ".join(parts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="UFK-GCS arayüzsüz mod: MAVLink + sunucu telemetrisi")
+    parser.add_argument("--connection", help="ayarlardaki MAVLink bağlantısı yerine (ör. udpin:0.0.0.0:14550)")
+    parser.add_argument("--server", help="ayarlardaki sunucu adresi yerine (ör. http://127.0.0.1:8000)")
+    parser.add_argument("--no-server", action="store_true", help="yarışma sunucusuna bağlanma")
+    parser.add_argument("--stats", type=float, default=STATS_PERIOD, help="özet satırı aralığı (s), 0 = kapalı")
+    args = parser.parse_args(argv)
+
+    settings = SettingsManager.load_settings()
+    if args.server:
+        settings["server_address"] = args.server
+    app = QCoreApplication(sys.argv[:1])
+    gcs = HeadlessGCS(settings, args.connection,
+                      server=not args.no_server, stats_period=args.stats)
+
+    # Qt olay döngüsündeyken Python sinyal işleyicileri ancak yorumlayıcıya dönünce çalışır
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    tick = QTimer()
+    tick.timeout.connect(lambda: None)
+    tick.start(200)
+
+    gcs.start()
+    _log("Headless GCS çalışıyor (Ctrl+C ile çıkış)")
+    try:
+        return app.exec_()
+    finally:
+        gcs.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@ import sys, qtawesome as qta, signal, traceback, os
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPushButton,
     QVBoxLayout, QHBoxLayout, QGridLayout, QFrame, QSizePolicy,QMessageBox, QInputDialog, QListWidget, QListWidgetItem,
-    QDialog
+    QDialog, QFileDialog
 )
 from widgets.status_widget import ConnectionStatusWidget
 from PyQt5.QtCore import Qt, QSize, QCoreApplication
@@ -14,13 +14,17 @@ from widgets.region_dialog import RegionDialog
 from pathlib import Path
 import json
 from mavlink.mavlink_worker import MavlinkWorker 
+from mavlink.process_worker import ProcessMavlinkWorker
+from mavlink.router import parse_output_list
+from mavlink.mission_manager import load_waypoints
 import dotenv
 from widgets.camera import VideoWidget 
 from widgets.hud_widget import HorizonHUD
 from widgets.precheck_modal import PreCheckDialog
 from workers.server_worker import ServerWorker
+from api.payload import build_telemetry_payload, team_number
 # from widgets.telemetry_sender import TelemetrySenderDialog # Removing as it's replaced
-from config.settings_manager import SettingsManager
+from config.settings_manager import SettingsManager, float_setting, mavlink_connection_string, tlog_record_path
 from widgets.connection_modal import ConnectionDialog
 
 
@@ -155,6 +159,8 @@ class MainWindow(QMainWindow):
         self.controls.regionBtn.clicked.connect(self.on_region_clicked)
         # Mission butonu: waypoint / görev ekleme
         self.controls.missionBtn.clicked.connect(self.on_mission_clicked)
+        # Rota butonu: waypoint dosyasını araca yükle
+        self.controls.routeBtn.clicked.connect(self.on_route_clicked)
         # QR noktası butonu: lat,lon al, arı marker çiz ve kaydet
         self.controls.qrBtn.clicked.connect(self.on_qr_clicked)
         # Ön kontrol
@@ -176,10 +182,21 @@ class MainWindow(QMainWindow):
 
         # Worker
         conn_str = self._build_mavlink_connection_string()
-        self.w = MavlinkWorker(connection_string=conn_str)
+        self.w = self._mavlink_worker_class()(connection_string=conn_str, ui_rate_hz=self._ui_rate_hz(),
+                                                  record_path=self._tlog_record_path(),
+                                                  stream_profile=self.settings.get("stream_profile") or None,
+                                                  router_outputs=parse_output_list(self.settings.get("router_outputs")),
+                                                  heartbeat_timeout=self._heartbeat_timeout())
         # self.w.status.connect(self.statusLbl.setText) # Legacy removed
         # self.w.error.connect(self.statusLbl.setText)   # Legacy removed
         self.w.telemetry.connect(self.on_telemetry)
+        self.w.vehicle_telemetry.connect(self.on_vehicle_telemetry)
+        self.w.command_result.connect(self.on_command_result)
+        self.w.link_stats.connect(self.status_widget.set_link_stats)
+        self.w.link_lost.connect(self.on_link_lost)
+        self.w.link_restored.connect(self.on_link_restored)
+        self.w.mission_result.connect(self.on_mission_result)
+        self.w.param_update.connect(self.on_param_update)
         # self.w.start() # Manual Start
         
         # Kamera
@@ -191,67 +208,12 @@ class MainWindow(QMainWindow):
             
         # Server Worker'a veri bas
         if hasattr(self, "srv_worker") and self.srv_worker.isRunning():
-            # Telemetri objesini dict/json formatına çevirmek lazım.
-            # Telemetry objesi likely bir struct/namespace. 
-            # API formatına uygun dict oluştur.
-            # Şimdilik varsayım: t.__dict__ veya manuel mapping.
-            # Yarışma isterlerine göre:
-            # Telemetry objesinden veya sistem saatinden GPS saati oluştur
-            from datetime import datetime
-            now = datetime.now()
-            gps_time = {
-                "saat": now.hour,
-                "dakika": now.minute,
-                "saniye": now.second,
-                "milisaniye": int(now.microsecond / 1000)
-            }
-            
-            # Takım Numarası: Username'den çıkar veya settings'den, yoksa 1
-            t_num = 1
-            try:
-                # Kullanıcı adı "takim1" gibiyse
-                srv_user = self.settings.get("server_username", "")
-                import re
-                match = re.search(r'\d+', srv_user)
-                if match:
-                    t_num = int(match.group())
-            except:
-                pass
+            team = team_number(self.settings.get("server_username", ""))
+            self.srv_worker.update_telemetry_data(build_telemetry_payload(t, team))
 
-            # Yardımcı fonksiyonlar: None gelirse 0'a çevir
-            def sf(val): 
-                try:
-                    return float(val) if val is not None else 0.0
-                except:
-                    return 0.0
-            
-            def si(val):
-                try:
-                    return int(val) if val is not None else 0
-                except:
-                    return 0
-
-            data = {
-                "takim_numarasi": t_num, 
-                "iha_enlem": sf(getattr(t, "iha_enlem", 0)),
-                "iha_boylam": sf(getattr(t, "iha_boylam", 0)),
-                "iha_irtifa": sf(getattr(t, "iha_irtifa", 0)),
-                "iha_dikilme": sf(getattr(t, "iha_dikilme", 0)),
-                "iha_yonelme": sf(getattr(t, "iha_yonelme", 0)),
-                "iha_yatis": sf(getattr(t, "iha_yatis", 0)),
-                "iha_hiz": sf(getattr(t, "iha_hiz", 0)),
-                "iha_batarya": sf(getattr(t, "iha_batarya0", 0)), 
-                "iha_otonom": si(getattr(t, "iha_otonom", 0)),
-                "iha_kilitlenme": si(getattr(t, "iha_kilitlenme", 0)),
-                "hedef_merkez_X": si(getattr(t, "hedef_merkez_X", 0)),
-                "hedef_merkez_Y": si(getattr(t, "hedef_merkez_Y", 0)),
-                "hedef_genislik": si(getattr(t, "hedef_genislik", 0)),
-                "hedef_yukseklik": si(getattr(t, "hedef_yukseklik", 0)),
-                "gps_saati": gps_time
-            }
-            # Takım numarasını statik 1 veya settings'den alalım.
-            # Geçici olarak 1.
-            self.srv_worker.update_telemetry_data(data)
+        # Manuel gönderim penceresi açıksa son snapshot'ı versin
+        if getattr(self, "server_dlg", None) is not None:
+            self.server_dlg.telemetry_state = t
 
         # Üstteki kartları güncelle
         self.panel.update_telemetry(t)
@@ -305,6 +267,78 @@ class MainWindow(QMainWindow):
 
 
 
+    def on_vehicle_telemetry(self, sysid, compid, t):
+        """
+        Aynı linkteki diğer araçları (test uçağı, röle vb.) haritada göster.
+        Birincil araç on_telemetry ile işleniyor.
+        """
+        if not self.isVisible() or (sysid, compid) == self.w.primary.key:
+            return
+        if t.iha_enlem is None or t.iha_boylam is None:
+            return
+        try:
+            self.map.update_vehicle(t.iha_enlem, t.iha_boylam, t.iha_yonelme,
+                                    marker_id=f"vehicle_{sysid}_{compid}", opacity=0.6)
+        except Exception:
+            pass
+
+    def on_command_result(self, r):
+        """Komut sonucu: başarılıysa yeşil, değilse kırmızı göster."""
+        if r.ok:
+            self.status_widget.set_plane_text(f"{r.name} OK ({r.rtt * 1e3:.0f} ms)", "green")
+        else:
+            self.status_widget.set_plane_text(f"{r.name}: {r.detail}", "red")
+
+    def on_mission_result(self, r):
+        """Görev aktarım sonucu; yükleme süresi etikette gösterilir."""
+        if not r.ok:
+            self.status_widget.set_plane_text(f"Görev: {r.detail}", "red")
+            return
+        if r.cached:
+            # Önizleme; asıl indirme bitince tekrar çizilir
+            self.status_widget.set_plane_text(f"Görev: {r.count} öğe (cache, indiriliyor)", "yellow")
+        else:
+            self.status_widget.set_plane_text(f"Görev: {r.count} öğe, {r.elapsed:.1f} s", "green")
+        self._draw_mission(r.items)
+
+    def on_param_update(self, report):
+        """Parametre indirme ilerlemesi ve sonucu (ParamManager.report())."""
+        state = report["state"]
+        if state in ("list", "missing"):
+            self.status_widget.set_plane_text(
+                f"Parametreler: {report['received']}/{report['count'] or '?'}", "yellow")
+        elif state == "ready":
+            self.status_widget.set_plane_text(
+                f"Parametreler: {report['received']} ({len(report['changed'])} değişti, "
+                f"{len(report['removed'])} kaldırıldı)", "green")
+        elif state == "partial":
+            self.status_widget.set_plane_text(
+                f"Parametreler eksik: {report['received']}/{report['count']}", "yellow")
+        elif state == "failed":
+            self.status_widget.set_plane_text("Parametre listesi alınamadı", "red")
+
+    def _draw_mission(self, items):
+        # Önceki görevin (veya cache önizlemesinin) fazla noktaları kalmasın
+        try:
+            self.map.clear_markers("wp_")
+        except Exception:
+            pass
+        # 0. öğe ArduPilot'ta home; sadece global çerçevede konumu olan öğeler çizilir
+        for i, it in enumerate(items):
+            if i == 0 or not it.has_position:
+                continue
+            try:
+                self.map.add_marker(f"wp_{i}", it.lat, it.lon, popup=f"WP {i} ({it.z:.0f} m)",
+                                    icon_size=(18, 18))
+            except Exception:
+                pass
+
+    def on_link_lost(self, silent):
+        self.status_widget.set_plane_text(f"Uçak: Link koptu ({silent:.0f} s)", "red")
+
+    def on_link_restored(self, took):
+        self.status_widget.set_plane_text(f"Uçak: Yeniden bağlandı ({took:.1f} s)", "green")
+
     def on_precheck_clicked(self):
         """
         Uçuş öncesi kontrol modalını aç.
@@ -327,8 +361,8 @@ class MainWindow(QMainWindow):
         # Basitlik için worker'ın state'ine erişmeye çalışalım.
         state = None
         if hasattr(self, "w"):
-            if hasattr(self.w, "telemetry_state"):
-                state = self.w.telemetry_state
+            # Worker'ın canlı state'i yerine son yayınlanan değişmez snapshot
+            state = getattr(self.w, "latest_snapshot", None)
     
         if not state:
             # Eğer worker'da state yoksa, boş bir state ile de açılabilir,
@@ -362,16 +396,22 @@ class MainWindow(QMainWindow):
         self.server_dlg.activateWindow()
 
     def _build_mavlink_connection_string(self):
-        ctype = self.settings.get("plane_connection_type", "udp")
-        if ctype == "serial":
-            port = self.settings.get("plane_serial_port", "/dev/ttyUSB0")
-            baud = self.settings.get("plane_baud", "57600")
-            return f"{port}:{baud}"
-        else:
-            # UDP (default)
-            addr = self.settings.get("plane_address", "0.0.0.0")
-            port = self.settings.get("plane_port", "14550")
-            return f"udpin:{addr}:{port}"
+        return mavlink_connection_string(self.settings)
+
+    def _tlog_record_path(self):
+        return tlog_record_path(self.settings)
+
+    def _mavlink_worker_class(self):
+        # İsteğe bağlı: çözümleme ayrı süreçte, GUI shared memory'den okur
+        if self.settings.get("ingest_process", False):
+            return ProcessMavlinkWorker
+        return MavlinkWorker
+
+    def _ui_rate_hz(self):
+        return float_setting(self.settings, "ui_rate_hz", 25.0)
+
+    def _heartbeat_timeout(self):
+        return float_setting(self.settings, "heartbeat_timeout", 3.0)
 
     def on_connection_clicked(self):
         # Eğer zaten bağlıysak (buton "Bağlantıyı Kes" ise) direkt keselim
@@ -410,10 +450,21 @@ class MainWindow(QMainWindow):
                 self.w.stop(); self.w.wait(500)
         
         conn_str = self._build_mavlink_connection_string()
-        self.w = MavlinkWorker(connection_string=conn_str)
+        self.w = self._mavlink_worker_class()(connection_string=conn_str, ui_rate_hz=self._ui_rate_hz(),
+                                                  record_path=self._tlog_record_path(),
+                                                  stream_profile=self.settings.get("stream_profile") or None,
+                                                  router_outputs=parse_output_list(self.settings.get("router_outputs")),
+                                                  heartbeat_timeout=self._heartbeat_timeout())
         # self.w.status.connect(self.statusLbl.setText) # Legacy
         self.w.error.connect(lambda e: self.status_widget.set_plane_status(False)) # On Error
         self.w.telemetry.connect(self.on_telemetry)
+        self.w.vehicle_telemetry.connect(self.on_vehicle_telemetry)
+        self.w.command_result.connect(self.on_command_result)
+        self.w.link_stats.connect(self.status_widget.set_link_stats)
+        self.w.link_lost.connect(self.on_link_lost)
+        self.w.link_restored.connect(self.on_link_restored)
+        self.w.mission_result.connect(self.on_mission_result)
+        self.w.param_update.connect(self.on_param_update)
         
         # Bağlantı başarılı olduğunda (Heartbeat) yeşil yapmak için sinyal lazım.
         # Şimdilik "Bağlanıyor" sarı kalsın, heartbeat gelince on_telemetry'de yeşil yaparız.
@@ -439,6 +490,8 @@ class MainWindow(QMainWindow):
         self.srv_worker.login_result.connect(self.on_server_login)
         self.srv_worker.data_fetched.connect(self.on_server_data)
         self.srv_worker.telemetry_result.connect(self.on_server_telemetry_result)
+        self.srv_worker.endpoint_stats.connect(self.status_widget.set_server_stats)
+        self.srv_worker.telemetry_rate.connect(self.status_widget.set_server_rate)
         self.srv_worker.error.connect(lambda e: self.status_widget.set_server_status(False))
         self.srv_worker.start()
 
@@ -447,7 +500,8 @@ class MainWindow(QMainWindow):
             self.status_widget.set_plane_status(False)
             self.status_widget.set_camera_status(False)
             self.status_widget.set_server_status(False)
-            
+            self.status_widget.set_link_stats(None)
+
             # 1. Mavlink
             if hasattr(self, "w") and self.w:
                 try:
@@ -734,6 +788,23 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Hata", f"QR noktası kaydedilemedi:\n{e}")
 
+    def on_route_clicked(self):
+        """Rota butonu: QGC WPL waypoint dosyasını seçip araca yükler."""
+        if not hasattr(self, "w") or self.w is None or not self.w.isRunning():
+            QMessageBox.warning(self, "Rota", "Önce araca bağlanın.")
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Waypoint Dosyası", "",
+                                              "Waypoint (*.waypoints *.txt);;Tümü (*)")
+        if not path:
+            return
+        try:
+            items = load_waypoints(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Rota", f"Dosya okunamadı:\n{e}")
+            return
+        self.status_widget.set_plane_text(f"Görev yükleniyor: {len(items)} öğe", "yellow")
+        self.w.upload_mission(items)
+
     def on_mission_clicked(self):
         """
         Mission butonu:
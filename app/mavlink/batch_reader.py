@@ -0,0 +1,205 @@
+import sys
+from typing import NamedTuple
+
+from pymavlink import mavutil
+
+from mavlink.framing import frame_crc_ok, frame_length, frame_header, MARKER_V1, MARKER_V2
+from mavlink.telemetry_handler import msg_name
+
+mavlink = mavutil.mavlink
+
+CHUNK_SIZE = 64 * 1024      # tek okumada en fazla bu kadar byte
+
+# Abonelik dışında kalsa da her zaman çözülen mesajlar
+# (komut ACK'leri, zaman senkronu, link durumu, parametreler, görev protokolü)
+DECODE_ALWAYS = frozenset((
+    mavlink.MAVLINK_MSG_ID_HEARTBEAT,
+    mavlink.MAVLINK_MSG_ID_COMMAND_ACK,
+    mavlink.MAVLINK_MSG_ID_TIMESYNC,
+    mavlink.MAVLINK_MSG_ID_SYSTEM_TIME,
+    mavlink.MAVLINK_MSG_ID_RADIO_STATUS,
+    mavlink.MAVLINK_MSG_ID_PARAM_VALUE,
+    mavlink.MAVLINK_MSG_ID_AUTOPILOT_VERSION,
+    mavlink.MAVLINK_MSG_ID_MISSION_COUNT,
+    mavlink.MAVLINK_MSG_ID_MISSION_REQUEST,
+    mavlink.MAVLINK_MSG_ID_MISSION_REQUEST_INT,
+    mavlink.MAVLINK_MSG_ID_MISSION_ITEM_INT,
+    mavlink.MAVLINK_MSG_ID_MISSION_ACK,
+    mavlink.MAVLINK_MSG_ID_MISSION_CURRENT,
+))
+
+_MARKERS = (MARKER_V1, MARKER_V2)
+
+
+class RawFrame(NamedTuple):
+    """
+    A frame that was cut from the stream but not decoded. Offers the header
+    accessors of a MAVLink message so link statistics, recording and routing
+    treat it like any other message.
+    """
+    msg_id: int
+    sysid: int
+    compid: int
+    seq: int
+    frame: bytes
+
+    def get_msgbuf(self):
+        return self.frame
+
+    def get_msgId(self):
+        return self.msg_id
+
+    def get_type(self):
+        return msg_name(self.msg_id)
+
+    def get_srcSystem(self):
+        return self.sysid
+
+    def get_srcComponent(self):
+        return self.compid
+
+    def get_seq(self):
+        return self.seq
+
+
+def _decode_errors(mav):
+    """
+    MAVError classes `mav.decode` can raise. pymavlink switches master.mav to
+    the MAVLink 2 dialect after the first v2 frame; that module has its own
+    MAVError, unrelated to the one bound as `mavlink.MAVError` at import.
+    """
+    dialect = sys.modules.get(type(mav).__module__)
+    error = getattr(dialect, "MAVError", mavlink.MAVError)
+    return (mavlink.MAVError,) if error is mavlink.MAVError else (mavlink.MAVError, error)
+
+
+def _crc_extras(mav):
+    """msg_id -> CRC_EXTRA for the dialect `mav` decodes with."""
+    dialect = sys.modules.get(type(mav).__module__)
+    return {msg_id: cls.crc_extra
+            for msg_id, cls in getattr(dialect, "mavlink_map", mavlink.mavlink_map).items()}
+
+
+def _find_marker(buf, start: int) -> int:
+    """Offset of the next start marker at or after start, len(buf) if none."""
+    n = len(buf)
+    a = buf.find(MARKER_V1, start)
+    b = buf.find(MARKER_V2, start)
+    if a < 0:
+        return b if b >= 0 else n
+    return a if b < 0 or a < b else b
+
+
+class BatchReader:
+    """
+    Bulk ingest for mavutil serial/UDP/TCP connections: reads up to
+    CHUNK_SIZE bytes per call instead of one message per recv_match(), cuts
+    the buffer into frames by header length and only decodes (CRC check +
+    unpack) the frames whose msg id is in decode_ids. Other frames only get
+    their checksum verified and are returned as RawFrame so they can still
+    be recorded, routed and counted.
+
+    Frames are decoded with the connection's own MAVLink object, so signing
+    settings apply, and passed to master.post_message() like recv_msg() does
+    (target_system, flight mode, last messages).
+    """
+    def __init__(self, master, decode_ids=None, chunk_size: int = CHUNK_SIZE):
+        self.master = master
+        self.mav = master.mav
+        self._errors = _decode_errors(self.mav)
+        self._crc_extras = _crc_extras(self.mav)
+        self.decode_ids = None if decode_ids is None else frozenset(decode_ids) | DECODE_ALWAYS
+        self.chunk_size = chunk_size
+        self._buf = bytearray()
+        self.bytes_read = 0
+        self.bad_bytes = 0
+        self.decoded = 0
+        self.skipped = 0
+        self._take_parser_buffer()
+
+    def _take_parser_buffer(self):
+        # wait_heartbeat() recv_match ile okur; ayrıştırıcıda kalan byte'ları devral
+        buf = getattr(self.mav, "buf", None)
+        index = getattr(self.mav, "buf_index", 0)
+        if buf is not None and len(buf) > index:
+            self._buf += buf[index:]
+            self.mav.buf = bytearray()
+            self.mav.buf_index = 0
+            self.mav.expected_length = mavlink.HEADER_LEN_V1 + 2
+
+    def read(self) -> int:
+        """Moves whatever the link has buffered into the parse buffer, up to chunk_size bytes in total."""
+        total = 0
+        room = self.chunk_size - len(self._buf)
+        while total < room:
+            data = self.master.recv(room - total)
+            if not data:
+                break
+            self._buf += data
+            total += len(data)
+        self.bytes_read += total
+        return total
+
+    def parse(self, limit: int = None):
+        """
+        Whole frames currently in the buffer as MAVLink messages (wanted ids
+        and BAD_DATA-free) or RawFrame, in stream order. Stops after `limit`
+        frames; the rest stays buffered for the next call.
+        """
+        buf = self._buf
+        n = len(buf)
+        off = 0
+        out = []
+        decode_ids = self.decode_ids
+        if self.master.mav is not self.mav:
+            # Bağlantı MAVLink 2'ye geçti: yeni dialect nesnesi ve hata sınıfı
+            self.mav = self.master.mav
+            self._errors = _decode_errors(self.mav)
+            self._crc_extras = _crc_extras(self.mav)
+        decode = self.mav.decode
+        errors = self._errors
+        crc_extras = self._crc_extras
+        while off < n and (limit is None or len(out) < limit):
+            if buf[off] not in _MARKERS:
+                nxt = _find_marker(buf, off + 1)
+                self.bad_bytes += nxt - off
+                off = nxt
+                continue
+            flen = frame_length(buf, off)
+            if flen is None or off + flen > n:
+                break
+            end = off + flen
+            seq, sysid, compid, msg_id = frame_header(buf, off)
+            # Çözülmeyen frame'in sadece CRC'si kontrol edilir. Dialect'te olmayan id'ler
+            # ve ardından frame başı gelmeyen (uzunluğu şüpheli) frame'ler yine de çözülür
+            crc_extra = crc_extras.get(msg_id)
+            if (decode_ids is None or msg_id in decode_ids or crc_extra is None
+                    or (end < n and buf[end] not in _MARKERS)):
+                try:
+                    msg = decode(buf[off:end])
+                except errors:
+                    # Bozuk frame: işaretçiden bir byte ilerleyip yeniden senkronize ol
+                    self.bad_bytes += 1
+                    off += 1
+                    continue
+                self.master.post_message(msg)
+                self.decoded += 1
+                out.append(msg)
+            elif not frame_crc_ok(buf, off, crc_extra):
+                self.bad_bytes += 1
+                off += 1
+                continue
+            else:
+                self.skipped += 1
+                out.append(RawFrame(msg_id, sysid, compid, seq, bytes(buf[off:end])))
+            off = end
+        del buf[:off]
+        return out
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buf)
+
+    def stats(self) -> dict:
+        return {"bytes_read": self.bytes_read, "decoded": self.decoded,
+                "skipped": self.skipped, "bad_bytes": self.bad_bytes}
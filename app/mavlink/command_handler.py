@@ -1,18 +1,32 @@
 from pymavlink import mavutil
 
+from mavlink.command_tracker import CommandStep
+
+mavlink = mavutil.mavlink
+
+
+def _is_armed(hb):
+    return bool(hb.base_mode & mavlink.MAV_MODE_FLAG_SAFETY_ARMED)
+
+
 class CommandHandler:
-    def __init__(self, master):
+    """
+    Builds the command sequences and hands them to a CommandTracker, which
+    sends them and waits for their acknowledgements without blocking the
+    receive loop. Returns False if the same command is already running.
+    """
+    def __init__(self, master, tracker=None):
         self.master = master
+        self.tracker = tracker
 
-    def start_mission(self, status_signal=None):
-        if not self.master: return
+    def start_mission(self):
+        if not self.master or not self.tracker: return False
 
-        if status_signal: status_signal.emit("Komut: ARM")
-        self.master.arducopter_arm()
-        self.master.motors_armed_wait()
-        
-        if status_signal: status_signal.emit("Komut: MISSION START")
-        self.master.set_mode_auto() 
+        # ARM kabul edildikten sonra heartbeat'te armed bayrağı görülmeli
+        return self.tracker.start("start_mission", [
+            CommandStep("ARM", mavlink.MAV_CMD_COMPONENT_ARM_DISARM, (1,), confirm=_is_armed),
+            CommandStep("MISSION START", mavlink.MAV_CMD_MISSION_START),
+        ])
 
     def send_manual_control(self, x, y, z, r):
         if not self.master: return
@@ -29,17 +43,15 @@ class CommandHandler:
             ix, iy, iz, ir,
             0) # buttons
 
-    def test_motor(self, motor_id, status_signal=None):
-        if not self.master: return
+    def test_motor(self, motor_id):
+        if not self.master or not self.tracker: return False
 
-        if status_signal: status_signal.emit(f"Komut: Motor Test {motor_id}")
-        self.master.mav.command_long_send(
-            self.master.target_system, self.master.target_component,
-            mavutil.mavlink.MAV_CMD_DO_MOTOR_TEST,
-            0,
-            motor_id, # Motor instance
-            0, # Throttle type: percent
-            15, # Throttle 15%
-            3, # Timeout 3s
-            1, # Motor count
-            0, 0) # Unused
+        return self.tracker.start("motor_test", [
+            CommandStep(f"Motor Test {motor_id}", mavlink.MAV_CMD_DO_MOTOR_TEST, (
+                motor_id, # Motor instance
+                0, # Throttle type: percent
+                15, # Throttle 15%
+                3, # Timeout 3s
+                1, # Motor count
+            )),
+        ])
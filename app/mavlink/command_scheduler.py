@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import deque
+
+PRIORITY_SAFETY = 0   # arm/disarm, mod değişimi, görev başlatma
+PRIORITY_NORMAL = 1
+
+COMMAND_PRIORITIES = {
+    "start_mission": PRIORITY_SAFETY,
+    "motor_test": PRIORITY_NORMAL,
+    "replay_seek": PRIORITY_NORMAL,
+}
+
+MANUAL_RATE_HZ = 25.0   # manuel kontrol gönderim hızı
+MANUAL_TIMEOUT = 0.5    # s, bu süre yeni örnek gelmezse göndermeyi bırak
+
+
+class _WaitStats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, wait):
+        self.count += 1
+        self.total += wait
+        if wait > self.max:
+            self.max = wait
+
+
+class CommandScheduler:
+    """
+    Command queue between the GUI and the receive loop.
+
+    - Discrete commands go into priority lanes; safety/mode commands are
+      always taken before normal ones, FIFO within a lane.
+    - Manual control is a single latest-wins slot, sent at a fixed rate
+      and dropped once no new sample has arrived for MANUAL_TIMEOUT, so a
+      burst of stick samples can neither delay commands nor be replayed.
+    - Queue-wait latency is tracked per command type.
+
+    submit()/set_manual() may be called from any thread; pop() and
+    manual_due() are called by the worker thread.
+    """
+    def __init__(self, manual_rate_hz: float = MANUAL_RATE_HZ, manual_timeout: float = MANUAL_TIMEOUT):
+        self._lock = threading.Lock()
+        self._lanes = (deque(), deque())
+        self._manual = None          # (values, set_time)
+        self._manual_next = 0.0
+        self.manual_interval = 1.0 / manual_rate_hz
+        self.manual_timeout = manual_timeout
+        self.manual_overwritten = 0  # gönderilmeden ezilen örnek sayısı
+        self._manual_sent = True
+        self._wait = {}
+
+    def submit(self, cmd, payload=None, priority=None):
+        if priority is None:
+            priority = COMMAND_PRIORITIES.get(cmd, PRIORITY_NORMAL)
+        with self._lock:
+            self._lanes[priority].append((cmd, payload, time.monotonic()))
+
+    def pop(self):
+        """Next (cmd, payload) by priority, None if all lanes are empty."""
+        with self._lock:
+            for lane in self._lanes:
+                if lane:
+                    cmd, payload, t_enq = lane.popleft()
+                    break
+            else:
+                return None
+        self._record_wait(cmd, time.monotonic() - t_enq)
+        return cmd, payload
+
+    def set_manual(self, values):
+        with self._lock:
+            if not self._manual_sent:
+                self.manual_overwritten += 1
+            self._manual = (values, time.monotonic())
+            self._manual_sent = False
+
+    def manual_due(self, now: float):
+        """
+        Values to send now on the manual control channel, or None if it is not
+        time yet or the last sample has gone stale.
+        """
+        with self._lock:
+            slot = self._manual
+            if slot is None or now < self._manual_next:
+                return None
+            values, t_set = slot
+            if now - t_set > self.manual_timeout:
+                self._manual = None
+                return None
+            self._manual_next = now + self.manual_interval
+            first_send = not self._manual_sent
+            self._manual_sent = True
+        if first_send:
+            self._record_wait("manual_control", now - t_set)
+        return values
+
+    def time_until_manual(self, now: float):
+        with self._lock:
+            if self._manual is None:
+                return None
+        return max(0.0, self._manual_next - now)
+
+    def _record_wait(self, cmd, wait):
+        st = self._wait.get(cmd)
+        if st is None:
+            st = self._wait[cmd] = _WaitStats()
+        st.add(wait)
+
+    def stats(self) -> dict:
+        """
+        {"latency": {cmd: {"count", "avg_ms", "max_ms"}}, "manual_overwritten": n}
+        """
+        latency = {cmd: {"count": st.count,
+                         "avg_ms": st.total / st.count * 1e3,
+                         "max_ms": st.max * 1e3}
+                   for cmd, st in self._wait.items() if st.count}
+        return {"latency": latency, "manual_overwritten": self.manual_overwritten}
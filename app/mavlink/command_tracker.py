@@ -0,0 +1,227 @@
+import time
+from typing import NamedTuple
+
+from pymavlink import mavutil
+
+mavlink = mavutil.mavlink
+
+ACK_TIMEOUT = 1.0        # s, ilk deneme için COMMAND_ACK bekleme süresi
+BACKOFF = 2.0            # her tekrarda bekleme süresi bu katsayıyla büyür
+MAX_ATTEMPTS = 4
+CONFIRM_TIMEOUT = 10.0   # s, ACK sonrası durum değişikliği bekleme süresi
+
+
+class CommandStep:
+    """
+    One COMMAND_LONG of a command sequence.
+
+    confirm, if given, is called with every HEARTBEAT from the target after
+    the command was accepted; the step completes once it returns True.
+    """
+    def __init__(self, label: str, command: int, params=(), confirm=None,
+                 ack_timeout: float = ACK_TIMEOUT, confirm_timeout: float = CONFIRM_TIMEOUT,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.label = label
+        self.command = command
+        self.params = tuple(params) + (0,) * (7 - len(params))
+        self.confirm = confirm
+        self.ack_timeout = ack_timeout
+        self.confirm_timeout = confirm_timeout
+        self.max_attempts = max_attempts
+
+
+class CommandResult(NamedTuple):
+    name: str
+    ok: bool
+    detail: str          # MAV_RESULT adı veya zaman aşımı açıklaması
+    rtt: float           # s, son kabul edilen ACK'in gidiş-dönüş süresi (yoksa 0)
+    attempts: int        # toplam gönderim sayısı
+    elapsed: float       # s, dizinin başından sonuca kadar
+
+
+def result_name(result: int) -> str:
+    entry = mavlink.enums["MAV_RESULT"].get(result)
+    return entry.name if entry is not None else str(result)
+
+
+class _Pending:
+    __slots__ = ("name", "steps", "index", "phase", "attempt", "deadline",
+                 "t_start", "t_sent", "rtt", "sends")
+
+    def __init__(self, name, steps, now):
+        self.name = name
+        self.steps = steps
+        self.index = 0
+        self.phase = "ack"       # ack -> confirm -> (sonraki adım)
+        self.attempt = 0
+        self.deadline = now
+        self.t_start = now
+        self.t_sent = now
+        self.rtt = 0.0
+        self.sends = 0
+
+    @property
+    def step(self) -> CommandStep:
+        return self.steps[self.index]
+
+
+class _RttStats:
+    __slots__ = ("count", "total", "min", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, rtt):
+        self.count += 1
+        self.total += rtt
+        self.last = rtt
+        if rtt < self.min:
+            self.min = rtt
+        if rtt > self.max:
+            self.max = rtt
+
+
+class CommandTracker:
+    """
+    Runs command sequences as non-blocking state machines inside the receive
+    loop. Each step is sent as COMMAND_LONG and waits for its COMMAND_ACK
+    (and optionally a state change seen in HEARTBEAT) with a deadline; on
+    timeout it is resent with an incremented confirmation field and an
+    exponentially growing deadline. The outcome of every sequence is passed
+    to on_result as a CommandResult.
+
+    Call poll() every loop turn and on_message() for every received message.
+    """
+    def __init__(self, master, on_result, on_status=None,
+                 target_system: int = 1, target_component: int = 1):
+        self.master = master
+        self.on_result = on_result
+        self.on_status = on_status
+        self.target_system = target_system
+        self.target_component = target_component
+        self.active = {}          # name -> _Pending
+        self._rtt = {}            # name -> _RttStats
+
+    def start(self, name: str, steps) -> bool:
+        """Start a sequence; refused while a sequence with the same name runs."""
+        if name in self.active or not steps:
+            return False
+        now = time.monotonic()
+        pending = _Pending(name, list(steps), now)
+        self.active[name] = pending
+        self._send(pending, now)
+        return True
+
+    def cancel(self, name: str, detail: str = "İptal edildi"):
+        pending = self.active.get(name)
+        if pending is not None:
+            self._finish(pending, False, detail, time.monotonic())
+
+    def cancel_all(self, detail: str = "İptal edildi"):
+        for name in list(self.active):
+            self.cancel(name, detail)
+
+    def _send(self, pending: _Pending, now: float):
+        step = pending.step
+        if pending.attempt == 0 and self.on_status:
+            self.on_status(f"Komut: {step.label}")
+        elif self.on_status:
+            self.on_status(f"Komut: {step.label} (tekrar {pending.attempt})")
+        self.master.mav.command_long_send(
+            self.target_system, self.target_component,
+            step.command, pending.attempt, *step.params)
+        pending.phase = "ack"
+        pending.t_sent = now
+        pending.deadline = now + step.ack_timeout * BACKOFF ** pending.attempt
+        pending.attempt += 1
+        pending.sends += 1
+
+    def _finish(self, pending: _Pending, ok: bool, detail: str, now: float):
+        self.active.pop(pending.name, None)
+        self.on_result(CommandResult(pending.name, ok, detail, pending.rtt,
+                                     pending.sends, now - pending.t_start))
+
+    def _advance(self, pending: _Pending, now: float):
+        pending.index += 1
+        pending.attempt = 0
+        if pending.index >= len(pending.steps):
+            self._finish(pending, True, "ACCEPTED", now)
+        else:
+            self._send(pending, now)
+
+    def poll(self, now: float):
+        for pending in list(self.active.values()):
+            if now < pending.deadline:
+                continue
+            step = pending.step
+            if pending.phase == "confirm":
+                self._finish(pending, False, f"{step.label}: durum değişmedi", now)
+            elif pending.attempt < step.max_attempts:
+                self._send(pending, now)
+            else:
+                self._finish(pending, False, f"{step.label}: ACK zaman aşımı", now)
+
+    def time_until_deadline(self, now: float):
+        if not self.active:
+            return None
+        return max(0.0, min(p.deadline for p in self.active.values()) - now)
+
+    def on_message(self, msg):
+        if not self.active:
+            return
+        msg_id = msg.get_msgId()
+        if msg_id == mavlink.MAVLINK_MSG_ID_COMMAND_ACK:
+            self._on_ack(msg)
+        elif msg_id == mavlink.MAVLINK_MSG_ID_HEARTBEAT:
+            self._on_heartbeat(msg)
+
+    def _on_ack(self, msg):
+        if msg.get_srcSystem() != self.target_system:
+            return
+        now = time.monotonic()
+        for pending in list(self.active.values()):
+            step = pending.step
+            if pending.phase != "ack" or step.command != msg.command:
+                continue
+            if msg.result == mavlink.MAV_RESULT_IN_PROGRESS:
+                # Araç komutu işliyor: tekrar göndermeden bekle
+                pending.deadline = now + step.ack_timeout * BACKOFF ** pending.attempt
+                return
+            if msg.result != mavlink.MAV_RESULT_ACCEPTED:
+                self._finish(pending, False, f"{step.label}: {result_name(msg.result)}", now)
+                return
+            pending.rtt = now - pending.t_sent
+            self._record_rtt(pending.name, pending.rtt)
+            if step.confirm is None:
+                self._advance(pending, now)
+            else:
+                pending.phase = "confirm"
+                pending.deadline = now + step.confirm_timeout
+            return
+
+    def _on_heartbeat(self, msg):
+        if msg.get_srcSystem() != self.target_system:
+            return
+        now = time.monotonic()
+        for pending in list(self.active.values()):
+            if pending.phase == "confirm" and pending.step.confirm(msg):
+                self._advance(pending, now)
+
+    def _record_rtt(self, name, rtt):
+        st = self._rtt.get(name)
+        if st is None:
+            st = self._rtt[name] = _RttStats()
+        st.add(rtt)
+
+    def stats(self) -> dict:
+        """{name: {"count", "last_ms", "avg_ms", "min_ms", "max_ms"}} command round-trip times."""
+        return {name: {"count": st.count,
+                       "last_ms": st.last * 1e3,
+                       "avg_ms": st.total / st.count * 1e3,
+                       "min_ms": st.min * 1e3,
+                       "max_ms": st.max * 1e3}
+                for name, st in self._rtt.items() if st.count}
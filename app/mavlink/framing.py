@@ -0,0 +1,56 @@
+# Payload'u çözmeden ham byte'lar üzerinde çalışan MAVLink frame yardımcıları.
+# tlog okuyucu/indeksleyici ve toplu okuma yolu tarafından kullanılır.
+from pymavlink import mavutil
+
+mavlink = mavutil.mavlink
+
+MARKER_V1 = mavlink.PROTOCOL_MARKER_V1   # 0xFE
+MARKER_V2 = mavlink.PROTOCOL_MARKER_V2   # 0xFD
+HEADER_LEN_V1 = 6
+HEADER_LEN_V2 = 10
+CRC_LEN = 2
+SIGNATURE_LEN = mavlink.MAVLINK_SIGNATURE_BLOCK_LEN
+IFLAG_SIGNED = mavlink.MAVLINK_IFLAG_SIGNED
+
+
+def frame_length(buf, off: int):
+    """
+    Total length of the frame starting at buf[off], or None if buf[off] is
+    not a MAVLink start marker or the header is not complete yet.
+    """
+    n = len(buf)
+    if off + 2 > n:
+        return None
+    magic = buf[off]
+    if magic == MARKER_V2:
+        if off + 3 > n:
+            return None
+        signed = SIGNATURE_LEN if buf[off + 2] & IFLAG_SIGNED else 0
+        return HEADER_LEN_V2 + buf[off + 1] + CRC_LEN + signed
+    if magic == MARKER_V1:
+        return HEADER_LEN_V1 + buf[off + 1] + CRC_LEN
+    return None
+
+
+def frame_header(buf, off: int):
+    """
+    (seq, sysid, compid, msg_id) of the frame at buf[off]. The header must
+    be complete; callers check frame_length() first.
+    """
+    if buf[off] == MARKER_V2:
+        return (buf[off + 4], buf[off + 5], buf[off + 6],
+                buf[off + 7] | (buf[off + 8] << 8) | (buf[off + 9] << 16))
+    return buf[off + 2], buf[off + 3], buf[off + 4], buf[off + 5]
+
+
+def frame_crc_ok(buf, off: int, crc_extra: int) -> bool:
+    """
+    True if the X.25 checksum of the frame at buf[off] matches, seeded with
+    the message's CRC_EXTRA byte. The whole frame must be in buf; a v2
+    signature after the checksum is not checked.
+    """
+    header_len = HEADER_LEN_V2 if buf[off] == MARKER_V2 else HEADER_LEN_V1
+    crc_at = off + header_len + buf[off + 1]
+    crc = mavlink.x25crc(bytes(buf[off + 1:crc_at]))
+    crc.accumulate(bytes((crc_extra,)))
+    return crc.crc == buf[crc_at] | (buf[crc_at + 1] << 8)
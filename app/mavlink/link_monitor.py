@@ -0,0 +1,149 @@
+from collections import deque
+
+WINDOW_SECONDS = 5          # kayan pencere uzunluğu (1 s'lik kovalar)
+MAX_SEQ_GAP = 128           # bundan büyük boşluk kayıp değil, yeniden sıralama/reset sayılır
+
+
+class _Component:
+    __slots__ = ("last_seq", "received", "lost")
+
+    def __init__(self, seq):
+        self.last_seq = seq
+        self.received = 0
+        self.lost = 0
+
+
+class LinkMonitor:
+    """
+    Running link-quality statistics for one MAVLink link.
+
+    on_message() does a couple of dict updates per message; everything else
+    is computed once per report() from 1 s buckets kept over a sliding window
+    of WINDOW_SECONDS:
+    - packet loss per (sysid, compid) from gaps in the 8-bit sequence number,
+    - messages/s and bytes/s per message type,
+    - the latest RADIO_STATUS (rssi/noise, local and remote),
+    - heartbeat age per (sysid, compid).
+
+    Set track_loss to False when the seq gaps do not mean loss (a tlog
+    replay filters message ids and seeks).
+    """
+    def __init__(self, window: int = WINDOW_SECONDS, track_loss: bool = True):
+        self.window = window
+        self.track_loss = track_loss
+        self._components = {}         # (sysid, compid) -> _Component
+        self._types = {}              # type -> [count, bytes] (aktif kova)
+        self._bad_bytes = 0
+        self._buckets = deque(maxlen=window)   # (dt, types, {key: (received, lost)}, bad_bytes)
+        self._bucket_start = None
+        self._heartbeats = {}         # (sysid, compid) -> son heartbeat zamanı
+        self.radio = None
+
+    def reset(self, now: float):
+        self._components.clear()
+        self._types = {}
+        self._bad_bytes = 0
+        self._buckets.clear()
+        self._bucket_start = now
+
+    def on_message(self, msg, now: float):
+        mtype = msg.get_type()
+        size = len(msg.get_msgbuf())
+        if mtype == "BAD_DATA":
+            self.on_bad_data(size)
+            return
+
+        entry = self._types.get(mtype)
+        if entry is None:
+            self._types[mtype] = [1, size]
+        else:
+            entry[0] += 1
+            entry[1] += size
+
+        key = (msg.get_srcSystem(), msg.get_srcComponent())
+        seq = msg.get_seq()
+        comp = self._components.get(key)
+        if comp is None:
+            comp = self._components[key] = _Component(seq)
+        else:
+            gap = (seq - comp.last_seq - 1) & 0xFF
+            if gap < MAX_SEQ_GAP and self.track_loss:
+                comp.lost += gap
+            comp.last_seq = seq
+        comp.received += 1
+
+        if mtype == "HEARTBEAT":
+            self._heartbeats[key] = now
+        elif mtype == "RADIO_STATUS":
+            self.radio = {
+                "rssi": msg.rssi, "remrssi": msg.remrssi,
+                "noise": msg.noise, "remnoise": msg.remnoise,
+                "rxerrors": msg.rxerrors, "fixed": msg.fixed, "txbuf": msg.txbuf,
+                "time": now,
+            }
+
+    def on_bad_data(self, nbytes: int):
+        """Bytes discarded while resyncing (counted by the batch reader itself)."""
+        self._bad_bytes += nbytes
+
+    def heartbeat_age(self, key, now: float):
+        t = self._heartbeats.get(key)
+        return None if t is None else now - t
+
+    def _roll(self, now: float):
+        if self._bucket_start is None:
+            self._bucket_start = now
+        counts = {}
+        for key, comp in self._components.items():
+            counts[key] = (comp.received, comp.lost)
+            comp.received = 0
+            comp.lost = 0
+        self._buckets.append((now - self._bucket_start, self._types, counts, self._bad_bytes))
+        self._types = {}
+        self._bad_bytes = 0
+        self._bucket_start = now
+
+    def report(self, now: float, primary_key=None) -> dict:
+        """Closes the current bucket and returns the statistics over the window."""
+        self._roll(now)
+        duration = sum(b[0] for b in self._buckets) or 1.0
+
+        types = {}
+        components = {}
+        bad_bytes = 0
+        for _, btypes, bcounts, bbad in self._buckets:
+            bad_bytes += bbad
+            for mtype, (count, nbytes) in btypes.items():
+                acc = types.setdefault(mtype, [0, 0])
+                acc[0] += count
+                acc[1] += nbytes
+            for key, (received, lost) in bcounts.items():
+                acc = components.setdefault(key, [0, 0])
+                acc[0] += received
+                acc[1] += lost
+
+        total_rx = sum(c[0] for c in components.values())
+        total_lost = sum(c[1] for c in components.values())
+        return {
+            "window_s": duration,
+            "msgs_per_sec": sum(c for c, _ in types.values()) / duration,
+            "bytes_per_sec": sum(b for _, b in types.values()) / duration,
+            "bad_bytes_per_sec": bad_bytes / duration,
+            "loss_pct": _loss_pct(total_rx, total_lost),
+            "components": {
+                key: {"received": rx, "lost": lost, "loss_pct": _loss_pct(rx, lost),
+                      "heartbeat_age": self.heartbeat_age(key, now)}
+                for key, (rx, lost) in components.items()
+            },
+            "types": {
+                mtype: {"msgs_per_sec": count / duration, "bytes_per_sec": nbytes / duration}
+                for mtype, (count, nbytes) in sorted(types.items())
+            },
+            "radio": self.radio,
+            "heartbeat_age": self.heartbeat_age(primary_key, now),
+        }
+
+
+def _loss_pct(received: int, lost: int) -> float:
+    total = received + lost
+    return 100.0 * lost / total if total else 0.0
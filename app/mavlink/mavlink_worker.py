@@ -1,96 +1,699 @@
 import time
-import queue
+import select
+import socket
 from PyQt5.QtCore import QThread, pyqtSignal
 from pymavlink import mavutil
 
-from mavlink.telemetry_handler import Telemetry, TelemetryHandler
+from mavlink.telemetry_handler import TelemetryHandler
 from mavlink.command_handler import CommandHandler
+from mavlink.command_scheduler import CommandScheduler
+from mavlink.command_tracker import CommandTracker
+from mavlink.telemetry_publisher import DEFAULT_UI_RATE_HZ
+from mavlink.vehicle import Vehicle, SECONDARY_HISTORY_CAPACITY
+from mavlink.stream_rates import StreamRateManager
+from mavlink.link_monitor import LinkMonitor
+from mavlink.time_sync import TimeSync
+from mavlink.param_manager import ParamManager
+from mavlink.mission_manager import MissionManager
+from mavlink.router import MavlinkRouter
+from mavlink.multi_link import MultiLinkConnection, split_links
+from mavlink.batch_reader import BatchReader, RawFrame
+from mavlink.tlog import IndexingTlogWriter, ReplayConnection, parse_replay_string
 
 SERIAL_DEVICE = "/dev/tty.usbmodem1101"
 BAUD = 57600
 CONNECTION_STRING = "udp://0.0.0.0:14554"
 
+# Receive loop tuning
+SELECT_TIMEOUT = 0.05      # s, link fd üzerinde en fazla bu kadar bekle
+FALLBACK_POLL = 0.005      # s, fd'si olmayan bağlantılar (ör. Windows serial) için
+MAX_DRAIN_PER_WAKE = 2000  # tek uyanışta işlenecek en fazla mesaj
+STATS_INTERVAL = 1.0       # s, loop_stats yayın aralığı
+
+# Heartbeat watchdog / yeniden bağlanma
+HEARTBEAT_TIMEOUT = 3.0    # s, bu süre birincil araçtan heartbeat gelmezse link kopmuş sayılır
+HEARTBEAT_POLL = 0.25      # s, heartbeat beklerken stop() kontrol aralığı
+RECONNECT_MIN_DELAY = 0.5  # s, denemeler arası bekleme (her denemede ikiye katlanır)
+RECONNECT_MAX_DELAY = 8.0
+
+# Toplu okuma yapılabilen bağlantılar (ham byte akışı veren mavutil sınıfları)
+BATCH_CONNECTIONS = (mavutil.mavserial, mavutil.mavudp, mavutil.mavtcp, mavutil.mavtcpin)
+
+HEARTBEAT_ID = mavutil.mavlink.MAVLINK_MSG_ID_HEARTBEAT
+
+
+def _is_non_vehicle_heartbeat(hb):
+    # GCS, telsiz, companion computer vb. araç sayılmaz
+    return (hb.type == mavutil.mavlink.MAV_TYPE_GCS
+            or hb.autopilot == mavutil.mavlink.MAV_AUTOPILOT_INVALID)
+
+
+class _Waker:
+    """
+    socketpair based wake-up handle. The receive loop selects on it next to
+    the link fd so that queued commands are processed immediately instead of
+    waiting for the select timeout.
+    """
+    def __init__(self):
+        self._r, self._w = socket.socketpair()
+        self._r.setblocking(False)
+        self._w.setblocking(False)
+
+    def fileno(self):
+        return self._r.fileno()
+
+    def wake(self):
+        try:
+            self._w.send(b"\0")
+        except (BlockingIOError, OSError):
+            # Buffer doluysa zaten uyandırılmış demektir
+            pass
+
+    def clear(self):
+        try:
+            while self._r.recv(1024):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def close(self):
+        for s in (self._r, self._w):
+            try:
+                s.close()
+            except OSError:
+                pass
+
+
+class LoopStats:
+    """
+    Receive loop counters, reported once per STATS_INTERVAL.
+    backlog = most messages drained in a single wake-up during the window.
+    """
+    def __init__(self):
+        self.total = 0          # bağlantı boyunca işlenen mesaj sayısı (pencereyle sıfırlanmaz)
+        self.reset(time.monotonic())
+
+    def reset(self, now):
+        self.window_start = now
+        self.messages = 0
+        self.wakeups = 0
+        self.max_backlog = 0
+
+    def record_wake(self, drained):
+        self.wakeups += 1
+        self.messages += drained
+        self.total += drained
+        if drained > self.max_backlog:
+            self.max_backlog = drained
+
+    def snapshot(self, now, merged=0, handlers=None):
+        dt = max(now - self.window_start, 1e-6)
+        return {
+            "msgs_per_sec": self.messages / dt,
+            "wakeups_per_sec": self.wakeups / dt,
+            "max_backlog": self.max_backlog,
+            "merged": merged,
+            "handlers": handlers or {},
+        }
+
+
 class MavlinkWorker(QThread):
-    telemetry = pyqtSignal(object)   # Telemetry instance
+    telemetry = pyqtSignal(object)   # TelemetrySnapshot instance (birincil araç)
+    vehicle_telemetry = pyqtSignal(int, int, object)  # sysid, compid, TelemetrySnapshot (tüm araçlar)
+    vehicle_added = pyqtSignal(int, int)              # sysid, compid
     status    = pyqtSignal(str)
     error     = pyqtSignal(str)
+    command_result = pyqtSignal(object)   # CommandResult
+    link_stats = pyqtSignal(object)       # dict, LinkMonitor.report()
+    link_lost = pyqtSignal(float)         # heartbeat'siz geçen süre (s)
+    link_restored = pyqtSignal(float)     # kopmadan yeniden bağlanmaya kadar geçen süre (s)
+    param_update = pyqtSignal(object)     # dict, ParamManager.report()
+    mission_result = pyqtSignal(object)   # MissionResult
+    loop_stats = pyqtSignal(object)  # dict: msgs_per_sec, wakeups_per_sec, max_backlog, merged, handlers, commands[, streams, router, batch]
 
-    def __init__(self, connection_string=None):
+    def __init__(self, connection_string=None, ui_rate_hz=DEFAULT_UI_RATE_HZ, record_path=None,
+                 stream_profile=None, router_outputs=None, batch_ingest=True,
+                 heartbeat_timeout=HEARTBEAT_TIMEOUT):
         super().__init__()
         self._stop = False
-        self._cmd_queue = queue.Queue() 
+        self.scheduler = CommandScheduler()
+        self._waker = _Waker()
         self.master = None
         self.cmd_handler = None
-        self.cmd_handler = None
+        self.cmd_tracker = None
+        self.link = LinkMonitor()
+        self.timesync = None
+        self.params = None                      # ParamManager (replay'de yok)
+        self.mission = None                     # MissionManager (replay'de yok)
         self.telem_handler = TelemetryHandler()
-        self.telemetry_state = Telemetry()
+        self.ui_rate_hz = ui_rate_hz
+        # İlk heartbeat'teki araç birincil araçtır; sysid/compid o an atanır
+        self.primary = Vehicle(0, 0, ui_rate_hz)
+        self.vehicles = {}                      # (sysid, compid) -> Vehicle
+        self._last_key = None
+        self._last_vehicle = None
         self.connection_string = connection_string
+        self.stats = LoopStats()
+        self.record_path = record_path
+        self.recorder = None
+        self.router_outputs = list(router_outputs or [])
+        self.router = None
+        self._replay_done = False
+        self.stream_profile = stream_profile   # None: otopilotun akış hızlarına dokunma
+        self.stream_mgr = None
+        self.batch_ingest = batch_ingest
+        self.reader = None                      # BatchReader, toplu okuma açıksa
+        self.heartbeat_timeout = heartbeat_timeout   # 0/None: watchdog kapalı
+        self._connection_str = None
+        self._last_heartbeat = 0.0
+        self.reconnects = 0
+        self.last_reconnect_s = None
+
+    # Birincil araç için geriye dönük uyumlu erişimciler
+    @property
+    def telemetry_state(self):
+        return self.primary.state               # sadece worker thread'i yazar
+
+    @property
+    def latest_snapshot(self):
+        return self.primary.latest_snapshot     # son yayınlanan TelemetrySnapshot
+
+    @property
+    def history(self):
+        return self.primary.history
+
+    @property
+    def publisher(self):
+        return self.primary.publisher
 
     def stop(self):
         self._stop = True
-    
+        self._waker.wake()
+
+    def _enqueue(self, cmd, payload):
+        self.scheduler.submit(cmd, payload)
+        self._waker.wake()
+
     def start_mission(self):
-        self._cmd_queue.put(("start_mission", None))
+        self._enqueue("start_mission", None)
 
     def send_manual_control(self, x, y, z, r):
-        self._cmd_queue.put(("manual_control", (x, y, z, r)))
+        # Son örnek kazanır; worker sabit hızla gönderir
+        self.scheduler.set_manual((x, y, z, r))
+        self._waker.wake()
 
     def test_motor(self, motor_id: int):
-        self._cmd_queue.put(("motor_test", motor_id))
+        self._enqueue("motor_test", motor_id)
+
+    def upload_mission(self, items):
+        """items: MissionItem listesi (0. öğe ArduPilot'ta home)."""
+        self._enqueue("mission_upload", list(items))
+
+    def download_mission(self):
+        self._enqueue("mission_download", None)
+
+    def request_params(self):
+        """Parametreleri yeniden doğrula (hash kontrolü, gerekirse indirme)."""
+        self._enqueue("param_refresh", None)
+
+    def set_param(self, name: str, value):
+        self._enqueue("param_set", (name, value))
+
+    def replay_seek(self, seconds: float):
+        """Replay bağlantısında logun başından itibaren `seconds` saniyeye atla."""
+        self._enqueue("replay_seek", seconds)
 
     def run(self):
         connection_str = self.connection_string if self.connection_string else (CONNECTION_STRING if CONNECTION_STRING else f"{SERIAL_DEVICE}:{BAUD}")
         self.status.emit(f"Bağlanıyor: {connection_str}")
-        
+
         try:
             if "udp://" in connection_str:
                 connection_str = connection_str.replace("udp://", "udpin:")
-            
-            self.master = mavutil.mavlink_connection(connection_str)
-            self.cmd_handler = CommandHandler(self.master)
+            self._connection_str = connection_str
+
+            self.master = self._open_master(connection_str)
+            # Replay abone olunmayan id'leri atlar ve seek yapar: seq boşlukları kayıp değil
+            self.link.track_loss = not isinstance(self.master, ReplayConnection)
+            if self.record_path and not isinstance(self.master, ReplayConnection):
+                self.recorder = IndexingTlogWriter(self.record_path)
+                self.status.emit(f"Kayıt: {self.record_path}")
+            if self.router_outputs:
+                try:
+                    self.router = MavlinkRouter(self.router_outputs, wake=self._waker.wake)
+                    self.status.emit(f"Router: {', '.join(self.router_outputs)}")
+                except (OSError, ValueError) as e:
+                    # Router olmadan da bağlantı kullanılabilir
+                    self.status.emit(f"Router hatası: {e}")
             self.status.emit(f"Bağlandı: {connection_str}")
         except Exception as e:
             self.error.emit(f"Bağlantı hatası: {e}")
             return
 
-        self.status.emit("Heartbeat bekleniyor...")
-        self.master.wait_heartbeat()
-        self.status.emit("MAVLink Heartbeat alındı!")
+        try:
+            self.status.emit("Heartbeat bekleniyor...")
+            hb = self._wait_vehicle_heartbeat()
+            if hb is None:
+                return          # heartbeat gelmeden stop() çağrıldı
+            self.status.emit("MAVLink Heartbeat alındı!")
+
+            self.telemetry_state.heartbeat = True
+            self.primary.sysid = hb.get_srcSystem()
+            self.primary.compid = hb.get_srcComponent()
+            self.vehicles[self.primary.key] = self.primary
+            self.vehicle_added.emit(self.primary.sysid, self.primary.compid)
+            self._last_heartbeat = time.monotonic()
+            self._attach_link()
+            self._loop()
+        finally:
+            self._waker.close()
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.router is not None:
+                self.router.close()
+            self._close_master()
+
+    def _open_master(self, connection_str):
+        if connection_str.startswith("replay:"):
+            path, speed = parse_replay_string(connection_str)
+            return ReplayConnection(path, speed, msg_ids=self.telem_handler.subscribed_ids)
+        links = split_links(connection_str)
+        if len(links) > 1:
+            # Yedekli linkler: hepsinden oku, kopyaları ele
+            return MultiLinkConnection(links)
+        return mavutil.mavlink_connection(connection_str)
+
+    def _close_master(self):
+        if self.master is None:
+            return
+        try:
+            self.master.close()
+        except (OSError, AttributeError):
+            pass
+        self.master = None
+
+    def _attach_link(self):
+        """
+        (Re)creates everything that talks to the current master and the
+        primary vehicle: commands, stream rates, time sync and the reader.
+        """
+        if self.cmd_tracker is None:
+            self.cmd_tracker = CommandTracker(
+                self.master, self._on_command_result, self.status.emit,
+                self.primary.sysid, self.primary.compid)
+        else:
+            self.cmd_tracker.master = self.master   # RTT istatistikleri korunur
+        self.cmd_handler = CommandHandler(self.master, self.cmd_tracker)
+
+        if self.stream_profile and not isinstance(self.master, ReplayConnection):
+            self.stream_mgr = StreamRateManager(
+                self.master, self.telem_handler.subscribed_ids, self.stream_profile,
+                self.primary.sysid, self.primary.compid)
+            self.stream_mgr.start()
+            self.status.emit(f"Akış profili: {self.stream_profile}")
+
+        if not isinstance(self.master, ReplayConnection):
+            self.timesync = TimeSync(self.master, self.primary.sysid, self.primary.compid)
+            # Önce disk cache'i, sonra hash kontrolü; sadece gerekirse liste indirilir
+            self.params = ParamManager(self.master, self.primary.sysid, self.primary.compid,
+                                       self.param_update.emit, self.status.emit)
+            self.params.start()
+            self.mission = MissionManager(self.master, self.primary.sysid, self.primary.compid,
+                                          self._on_mission_result, self.status.emit)
+            self.mission.start()       # "görev yok" kontrolü için öğe sayısı
+
+        self.reader = None
+        if self.batch_ingest and isinstance(self.master, BATCH_CONNECTIONS):
+            # Abone olunmayan mesajlar çözülmeden sadece sayılır/kaydedilir/yönlendirilir
+            self.reader = BatchReader(self.master, self.telem_handler.subscribed_ids)
+
+    def _link_fds(self):
+        fds = getattr(self.master, "fds", None)
+        if fds is None:
+            fd = getattr(self.master, "fd", None)
+            fds = [fd] if fd is not None else []
+        return fds
+
+    def _loop(self):
+        fds = self._link_fds()
+        self.stats.reset(time.monotonic())
+        self.link.reset(time.monotonic())
+        drained = 0
+        while not self._stop:
+            # 1. Link fd veya waker hazır olana kadar bekle
+            #    (önceki tur limite takıldıysa beklemeden devam et)
+            self._wait_for_input(fds, saturated=drained >= MAX_DRAIN_PER_WAKE)
+
+            # 2. Gelen mesajların hepsini oku
+            drained = self._drain_messages()
+
+            # 3. Komut kuyruğunu işle
+            self._process_queue()
+            if self.router is not None:
+                self._route_inbound()
+            self.cmd_tracker.poll(time.monotonic())
+            if self.timesync is not None:
+                self.timesync.poll(time.monotonic())
+            if self.stream_mgr is not None:
+                self.stream_mgr.poll(time.monotonic())
+            if self.params is not None:
+                self.params.poll(time.monotonic())
+            if self.mission is not None:
+                self.mission.poll(time.monotonic())
+
+            # 4. Birleştirilmiş güncellemenin zamanı geldiyse yayınla
+            now = time.monotonic()
+            for vehicle in self.vehicles.values():
+                if vehicle.publisher.due(vehicle.state, now):
+                    self._publish(vehicle)
+
+            if not self._replay_done and getattr(self.master, "eof", False):
+                self._replay_done = True
+                self.status.emit("Replay tamamlandı")
 
+            # 5. Heartbeat watchdog: araç susarsa linki yeniden aç
+            if self._heartbeat_lost(now):
+                if not self._reconnect(now):
+                    return
+                fds = self._link_fds()
+                drained = 0
+                continue
+
+            self.stats.record_wake(drained)
+            if now - self.stats.window_start >= STATS_INTERVAL:
+                snap = self.stats.snapshot(now, self.publisher.merged, self.telem_handler.stats())
+                snap["commands"] = self.scheduler.stats()
+                snap["commands"]["rtt"] = self.cmd_tracker.stats()
+                if self.stream_mgr is not None:
+                    snap["streams"] = self.stream_mgr.report(now)
+                if self.router is not None:
+                    snap["router"] = self.router.stats()
+                if self.reader is not None:
+                    snap["batch"] = self.reader.stats()
+                self.loop_stats.emit(snap)
+                link = self.link.report(now, self.primary.key)
+                if self.timesync is not None:
+                    link["timesync"] = self.timesync.report()
+                if isinstance(self.master, MultiLinkConnection):
+                    link["links"] = self.master.report(now)
+                link["reconnects"] = {"count": self.reconnects, "last_s": self.last_reconnect_s}
+                self.link_stats.emit(link)
+                self.stats.reset(now)
+
+    def _heartbeat_lost(self, now) -> bool:
+        if not self.heartbeat_timeout or isinstance(self.master, ReplayConnection):
+            return False
+        return now - self._last_heartbeat > self.heartbeat_timeout
+
+    def _reconnect(self, lost_at) -> bool:
+        """
+        Marks the link stale and reopens the port/socket with exponential
+        backoff until the primary vehicle's heartbeat is back. Vehicles,
+        history, recorder, router and the UI's signal connections are kept.
+        False if stop() was called meanwhile.
+        """
+        silent = lost_at - self._last_heartbeat
+        self.telemetry_state.heartbeat = False
+        self._publish(self.primary)
+        self.link_lost.emit(silent)
+        self.status.emit(f"Heartbeat yok ({silent:.1f} s), yeniden bağlanılıyor...")
+        self.cmd_tracker.cancel_all("Bağlantı koptu")
+        if self.mission is not None:
+            self.mission.cancel("Bağlantı koptu")
+        self.stream_mgr = None
+        self.timesync = None
+        self.params = None
+        self.mission = None
+
+        delay = RECONNECT_MIN_DELAY
+        attempt = 0
+        while not self._stop:
+            attempt += 1
+            self._close_master()
+            try:
+                self.master = self._open_master(self._connection_str)
+            except Exception as e:
+                # Seri port çıkarılmış olabilir; bir sonraki denemede tekrar açılır
+                self.status.emit(f"Yeniden bağlanma {attempt}: {e}")
+            else:
+                hb = self._wait_vehicle_heartbeat(self.primary.key, self.heartbeat_timeout)
+                if hb is not None:
+                    break
+                self.status.emit(f"Yeniden bağlanma {attempt}: heartbeat yok")
+            self._sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        if self._stop:
+            return False
+
+        now = time.monotonic()
+        self.reconnects += 1
+        self.last_reconnect_s = now - lost_at
+        self._last_heartbeat = now
         self.telemetry_state.heartbeat = True
-        
+        self._attach_link()
+        self.status.emit(f"Yeniden bağlandı: {self.last_reconnect_s:.1f} s, {attempt} deneme")
+        self.link_restored.emit(self.last_reconnect_s)
+        return True
+
+    def _sleep(self, seconds):
+        """Waits on the waker so stop() interrupts the backoff immediately."""
+        try:
+            select.select([self._waker], [], [], seconds)
+        except (OSError, ValueError):
+            time.sleep(FALLBACK_POLL)
+        self._waker.clear()
+
+    def _wait_vehicle_heartbeat(self, key=None, timeout=None):
+        """
+        Waits for the first heartbeat that comes from a vehicle, not a GCS
+        (from `key` only, if given). None on timeout or when stop() is called.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
         while not self._stop:
-            # 1. Gelen mesajları oku
+            wait = HEARTBEAT_POLL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return None
+            hb = self.master.wait_heartbeat(blocking=True, timeout=wait)
+            if hb is None or _is_non_vehicle_heartbeat(hb):
+                continue
+            if key is None or (hb.get_srcSystem(), hb.get_srcComponent()) == key:
+                return hb
+        return None
+
+    def _wait_for_input(self, fds, saturated=False):
+        """
+        Blocks until a link fd or the waker is readable, or SELECT_TIMEOUT
+        elapses. Links without a selectable fd fall back to a short poll.
+        """
+        if fds:
+            readers = fds + [self._waker]
+            timeout = SELECT_TIMEOUT
+        else:
+            readers = [self._waker]
+            timeout = FALLBACK_POLL
+        # Bekleyen bir yayın veya manuel kontrol gönderiminin zamanını kaçırma
+        now = time.monotonic()
+        for pending in (self.scheduler.time_until_manual(now),
+                        self.cmd_tracker.time_until_deadline(now),
+                        self.timesync.time_until_due(now) if self.timesync is not None else None,
+                        self.params.time_until_due(now) if self.params is not None else None,
+                        self.mission.time_until_due(now) if self.mission is not None else None):
+            if pending is not None and pending < timeout:
+                timeout = pending
+        for vehicle in self.vehicles.values():
+            pending = vehicle.publisher.time_until_due(now)
+            if pending is not None and pending < timeout:
+                timeout = pending
+        if saturated:
+            timeout = 0
+        try:
+            ready, _, _ = select.select(readers, [], [], timeout)
+        except (OSError, ValueError):
+            # fd kapanmış olabilir; döngü bir sonraki turda tekrar dener
+            time.sleep(FALLBACK_POLL)
+            return
+        if self._waker in ready:
+            self._waker.clear()
+
+    def _drain_messages(self):
+        """Reads every message already parsed or buffered on the link."""
+        if self.reader is not None:
+            return self._drain_batch()
+        drained = 0
+        now = time.monotonic()
+        while drained < MAX_DRAIN_PER_WAKE:
             msg = self.master.recv_match(blocking=False)
-            if msg:
-                if self.telem_handler.handle_message(msg, self.telemetry_state):
-                    self.telemetry.emit(self.telemetry_state)
-            
-            # 2. Komut kuyruğunu işle
+            if not msg:
+                break
+            drained += 1
+            self._on_message(msg, now)
+        return drained
+
+    def _drain_batch(self):
+        """
+        Bulk path: one large read from the link, then framing without
+        decoding for message ids nobody subscribed to.
+        """
+        reader = self.reader
+        reader.read()
+        bad = reader.bad_bytes
+        msgs = reader.parse(MAX_DRAIN_PER_WAKE)
+        if reader.bad_bytes != bad:
+            self.link.on_bad_data(reader.bad_bytes - bad)
+        now = time.monotonic()
+        for msg in msgs:
+            self._on_message(msg, now)
+        return len(msgs)
+
+    def _on_message(self, msg, now):
+        """Per-message work shared by the recv_match and batch paths."""
+        self.link.on_message(msg, now)
+        if msg.get_type() != "BAD_DATA":
+            # Ham frame, yeniden kodlamadan kayda ve router çıkışlarına
+            if self.recorder is not None:
+                self.recorder.write(msg.get_msgbuf())
+            if self.router is not None:
+                self.router.forward(msg.get_msgbuf())
+        if self.stream_mgr is not None:
+            self.stream_mgr.on_message(msg)
+        if type(msg) is RawFrame:
+            return
+        self.cmd_tracker.on_message(msg)
+        if self.timesync is not None:
+            self.timesync.on_message(msg)
+        if self.params is not None:
+            self.params.on_message(msg)
+        if self.mission is not None:
+            self.mission.on_message(msg)
+        vehicle = self._vehicle_for(msg)
+        if vehicle is None:
+            return
+        if vehicle is self.primary and msg.get_msgId() == HEARTBEAT_ID:
+            self._last_heartbeat = now
+        if self.telem_handler.handle_message(msg, vehicle.state, vehicle.history):
+            vehicle.last_rx = time.monotonic()
+            if vehicle.publisher.offer(vehicle.state, vehicle.last_rx):
+                self._publish(vehicle)
+
+    def _route_inbound(self):
+        """Writes frames sent by router outputs (e.g. a second GCS) to the vehicle link."""
+        for frame in self.router.pending_inbound():
             try:
-                while not self._cmd_queue.empty():
-                    cmd, payload = self._cmd_queue.get_nowait()
-                    self._process_command(cmd, payload)
-            except queue.Empty:
-                pass
+                self.master.write(frame)
+            except OSError as e:
+                self.error.emit(f"Router yazma hatası: {e}")
+                break
+
+    def _vehicle_for(self, msg):
+        """
+        Demultiplexes a message to its (sysid, compid) Vehicle. New vehicles
+        are created on the first subscribed message from a non-GCS source.
+        """
+        key = (msg.get_srcSystem(), msg.get_srcComponent())
+        if key == self._last_key:
+            return self._last_vehicle
+        vehicle = self.vehicles.get(key)
+        if vehicle is None:
+            vehicle = self._add_vehicle(msg, key)
+            if vehicle is None:
+                return None
+        self._last_key = key
+        self._last_vehicle = vehicle
+        return vehicle
+
+    def _add_vehicle(self, msg, key):
+        if not self.telem_handler.wants(msg.get_msgId()):
+            return None
+        if msg.get_type() == "HEARTBEAT" and _is_non_vehicle_heartbeat(msg):
+            return None
+        vehicle = Vehicle(key[0], key[1], self.ui_rate_hz, SECONDARY_HISTORY_CAPACITY)
+        self.vehicles[key] = vehicle
+        self.vehicle_added.emit(key[0], key[1])
+        return vehicle
 
-            time.sleep(0.01)
+    def _publish(self, vehicle):
+        """
+        Freezes a vehicle's worker-owned state into a TelemetrySnapshot and
+        emits it. Only runs at publish rate, so the copy is not paid per message.
+        """
+        snap = vehicle.snapshot(self.timesync if vehicle is self.primary else None)
+        if vehicle is self.primary:
+            self.telemetry.emit(snap)
+        self.vehicle_telemetry.emit(vehicle.sysid, vehicle.compid, snap)
+
+    def _on_command_result(self, result):
+        if result.ok:
+            self.status.emit(f"Komut tamam: {result.name} ({result.rtt * 1e3:.0f} ms)")
+        else:
+            self.status.emit(f"Komut başarısız: {result.name} - {result.detail}")
+        self.command_result.emit(result)
+
+    def _on_mission_result(self, result):
+        op = "yüklendi" if result.op == "upload" else "indirildi"
+        if not result.ok:
+            self.status.emit(f"Görev aktarılamadı: {result.detail}")
+        elif result.cached:
+            self.status.emit(f"Görev cache'ten gösteriliyor: {result.count} öğe, indiriliyor")
+        else:
+            self.status.emit(f"Görev {op}: {result.count} öğe, {result.elapsed:.1f} s"
+                             f" ({result.resent} tekrar)")
+        self.mission_result.emit(result)
+
+    def _process_queue(self):
+        while True:
+            item = self.scheduler.pop()
+            if item is None:
+                break
+            self._process_command(*item)
+
+        values = self.scheduler.manual_due(time.monotonic())
+        if values is not None:
+            self._process_command("manual_control", values)
 
     def _process_command(self, cmd, payload):
         if not self.cmd_handler:
             return
 
         try:
-            if cmd == "start_mission":
-                self.cmd_handler.start_mission(self.status)
-                
+            if cmd == "replay_seek":
+                if isinstance(self.master, ReplayConnection):
+                    self.master.seek(payload)
+                    self._replay_done = False
+
+            elif cmd == "start_mission":
+                if self.mission is not None and self.mission.vehicle_count == 0:
+                    # Yüklü görev yokken AUTO'ya geçme
+                    self.status.emit("Araçta yüklü görev yok")
+                elif not self.cmd_handler.start_mission():
+                    self.status.emit("Komut zaten sürüyor: start_mission")
+
             elif cmd == "manual_control":
                 x, y, z, r = payload
                 self.cmd_handler.send_manual_control(x, y, z, r)
 
+            elif cmd == "mission_upload":
+                if self.mission is None or not self.mission.upload(payload):
+                    self.status.emit("Görev aktarımı zaten sürüyor")
+
+            elif cmd == "mission_download":
+                if self.mission is None or not self.mission.download():
+                    self.status.emit("Görev aktarımı zaten sürüyor")
+
+            elif cmd == "param_refresh":
+                if self.params is not None:
+                    self.params.refresh()
+
+            elif cmd == "param_set":
+                if self.params is not None:
+                    name, value = payload
+                    self.params.set(name, value)
+
             elif cmd == "motor_test":
                 motor_id = payload
-                self.cmd_handler.test_motor(motor_id, self.status)
-                
+                if not self.cmd_handler.test_motor(motor_id):
+                    self.status.emit("Komut zaten sürüyor: motor_test")
+
         except Exception as e:
             self.error.emit(f"Komut hatası ({cmd}): {e}")
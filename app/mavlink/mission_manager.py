@@ -0,0 +1,401 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from pymavlink import mavutil
+
+mavlink = mavutil.mavlink
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "config" / "mission_cache"
+
+ITEM_TIMEOUT = 1.5       # s, araçtan istek / öğe gelmezse tekrar gönder
+MAX_RETRIES = 5          # aynı öğe (veya MISSION_COUNT) için en fazla tekrar
+DOWNLOAD_WINDOW = 4      # indirmede aynı anda istenen öğe sayısı
+NO_MISSION = 0xFFFF      # MISSION_CURRENT.total: araçta görev yok
+
+# WPL dosyalarındaki float çerçeveler -> MISSION_ITEM_INT karşılıkları
+_INT_FRAMES = {
+    mavlink.MAV_FRAME_GLOBAL: mavlink.MAV_FRAME_GLOBAL_INT,
+    mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT: mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT_INT,
+    mavlink.MAV_FRAME_GLOBAL_TERRAIN_ALT: mavlink.MAV_FRAME_GLOBAL_TERRAIN_ALT_INT,
+}
+_GLOBAL_INT_FRAMES = frozenset(_INT_FRAMES.values())
+_GLOBAL_FRAMES = frozenset(_INT_FRAMES) | _GLOBAL_INT_FRAMES
+
+
+class MissionItem(NamedTuple):
+    """One MISSION_ITEM_INT without target and seq (seq is the list index)."""
+    command: int
+    x: int = 0              # enlem * 1e7 (global çerçeveler)
+    y: int = 0              # boylam * 1e7
+    z: float = 0.0
+    frame: int = mavlink.MAV_FRAME_GLOBAL_RELATIVE_ALT_INT
+    param1: float = 0.0
+    param2: float = 0.0
+    param3: float = 0.0
+    param4: float = 0.0
+    current: int = 0
+    autocontinue: int = 1
+
+    @property
+    def lat(self):
+        return self.x / 1e7
+
+    @property
+    def lon(self):
+        return self.y / 1e7
+
+    @property
+    def has_position(self) -> bool:
+        """True if x/y are a lat/lon: a global frame and not 0,0 (e.g. not MAV_FRAME_MISSION)."""
+        return self.frame in _GLOBAL_FRAMES and (self.x != 0 or self.y != 0)
+
+
+class MissionResult(NamedTuple):
+    op: str             # "upload" | "download"
+    ok: bool
+    detail: str
+    count: int
+    elapsed: float      # s
+    resent: int         # tekrar gönderilen/istenen öğe sayısı
+    cached: bool        # önizleme: cache'teki öğeler, asıl indirme sürüyor
+    items: tuple = ()
+
+
+def waypoint(lat: float, lon: float, alt: float, hold: float = 0.0) -> MissionItem:
+    return MissionItem(mavlink.MAV_CMD_NAV_WAYPOINT, int(round(lat * 1e7)), int(round(lon * 1e7)),
+                       float(alt), param1=hold)
+
+
+def load_waypoints(path):
+    """
+    Reads a 'QGC WPL 110' waypoint file (Mission Planner / QGC export) into
+    MissionItems. Raises ValueError on a malformed file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if not lines or not lines[0].startswith("QGC WPL"):
+        raise ValueError("Geçersiz waypoint dosyası (QGC WPL başlığı yok)")
+    items = []
+    for n, line in enumerate(lines[1:], start=2):
+        cols = line.split()
+        if len(cols) != 12:
+            raise ValueError(f"Satır {n}: 12 sütun bekleniyordu")
+        _, current, frame, command, p1, p2, p3, p4, x, y, z, auto = cols
+        frame = int(frame)
+        frame = _INT_FRAMES.get(frame, frame)
+        scale = 1e7 if frame in _GLOBAL_INT_FRAMES else 1.0
+        items.append(MissionItem(int(command), int(round(float(x) * scale)), int(round(float(y) * scale)),
+                                 float(z), frame, float(p1), float(p2), float(p3), float(p4),
+                                 int(current), int(auto)))
+    return items
+
+
+class MissionManager:
+    """
+    MAVLink mission protocol (MISSION_COUNT / MISSION_REQUEST_INT /
+    MISSION_ITEM_INT / MISSION_ACK) driven from the receive loop.
+
+    Upload answers every item request as it comes, in any order, so
+    autopilots that pipeline requests are served at link speed; on a
+    timeout only the item the vehicle is waiting for (or MISSION_COUNT) is
+    sent again. Download keeps DOWNLOAD_WINDOW requests in flight and
+    re-requests only the items that did not arrive.
+
+    The last mission transferred per vehicle is cached on disk. The
+    protocol has no way to compare contents short of a download, so uploads
+    always transfer and downloads always download; when the vehicle reports
+    the cached item count, the cached items are first reported as a preview
+    (MissionResult.cached) so the UI can show them during the download.
+
+    start() asks for the item count once (MISSION_COUNT probe) so
+    vehicle_count is known before any transfer; a transfer requested
+    meanwhile takes over.
+
+    Call poll() every loop turn and on_message() for every received message.
+    """
+    def __init__(self, master, target_system: int = 1, target_component: int = 1,
+                 on_result=None, on_status=None, cache_dir=None):
+        self.master = master
+        self.target_system = target_system
+        self.target_component = target_component
+        self.on_result = on_result
+        self.on_status = on_status
+        self.cache_dir = Path(CACHE_DIR if cache_dir is None else cache_dir)
+        self.vehicle_count = None   # araçtaki öğe sayısı (None: bilinmiyor)
+        self.state = "idle"         # idle | probe | upload | count | download
+        self._op = None
+        self._items = []
+        self._t_start = 0.0
+        self._deadline = None
+        self._attempts = 0
+        self._last_seq = None       # yüklemede araçtan son istenen öğe
+        self._requested = set()     # yüklemede en az bir kez istenen öğeler
+        self._inflight = {}         # indirmede seq -> [deadline, attempts]
+        self._next_seq = 0
+        self._resent = 0
+
+    @property
+    def busy(self) -> bool:
+        # Sayı sorgusu bir aktarımı bekletmez
+        return self.state not in ("idle", "probe")
+
+    @property
+    def cache_path(self) -> Path:
+        return self.cache_dir / f"{self.target_system}_{self.target_component}.json"
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            cache["items"] = [MissionItem(*it) for it in cache["items"]]
+            return cache
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_cache(self, items):
+        cache = {"count": len(items), "items": [list(it) for it in items]}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            self._status(f"Görev cache yazılamadı: {e}")
+
+    # --- başlatma --------------------------------------------------------
+
+    def start(self, now: float = None):
+        """Asks the vehicle for its item count (sets vehicle_count, reports nothing)."""
+        if self.state != "idle":
+            return
+        now = time.monotonic() if now is None else now
+        self._begin("probe", now)
+        self.state = "probe"
+        self._send_request_list(now)
+
+    def upload(self, items, now: float = None) -> bool:
+        if self.busy or not items:
+            return False
+        now = time.monotonic() if now is None else now
+        self._begin("upload", now)
+        self._items = list(items)
+        self._start_upload(now)
+        return True
+
+    def download(self, now: float = None) -> bool:
+        if self.busy:
+            return False
+        now = time.monotonic() if now is None else now
+        self._begin("download", now)
+        self.state = "count"
+        self._send_request_list(now)
+        return True
+
+    def _begin(self, op, now):
+        if self.state == "probe":
+            # Sayı sorgusunun araçtaki indirme işlemini kapat
+            self._send_ack()
+        self._op = op
+        self._t_start = now
+        self._attempts = 0
+        self._resent = 0
+        self._items = []
+        self._requested.clear()
+        self._inflight.clear()
+        self._last_seq = None
+        self._next_seq = 0
+
+    # mission_type bir uzantı alanı: v2 lehçelerinde varsayılanı MAV_MISSION_TYPE_MISSION,
+    # MAVLink 1 lehçesinde hiç yok; bu yüzden gönderirken verilmez.
+    def _send_request_list(self, now):
+        self.master.mav.mission_request_list_send(self.target_system, self.target_component)
+        self._deadline = now + ITEM_TIMEOUT
+
+    def _start_upload(self, now):
+        self.state = "upload"
+        self._status(f"Görev yükleniyor: {len(self._items)} öğe")
+        self._send_count(now)
+
+    def _send_count(self, now):
+        self.master.mav.mission_count_send(
+            self.target_system, self.target_component, len(self._items))
+        self._deadline = now + ITEM_TIMEOUT
+
+    def _send_item(self, seq, now):
+        it = self._items[seq]
+        self.master.mav.mission_item_int_send(
+            self.target_system, self.target_component, seq, it.frame, it.command,
+            it.current, it.autocontinue, it.param1, it.param2, it.param3, it.param4,
+            it.x, it.y, it.z)
+        self._deadline = now + ITEM_TIMEOUT
+
+    def _send_ack(self, result=mavlink.MAV_MISSION_ACCEPTED):
+        self.master.mav.mission_ack_send(self.target_system, self.target_component, result)
+
+    def _request_items(self, now):
+        count = len(self._items)
+        while len(self._inflight) < DOWNLOAD_WINDOW and self._next_seq < count:
+            seq = self._next_seq
+            self._next_seq += 1
+            if self._items[seq] is not None:
+                continue
+            self._request_item(seq, now, 1)
+
+    def _request_item(self, seq, now, attempts):
+        self.master.mav.mission_request_int_send(self.target_system, self.target_component, seq)
+        self._inflight[seq] = [now + ITEM_TIMEOUT, attempts]
+
+    def _finish(self, ok, detail, now):
+        items = tuple(self._items) if ok else ()
+        if ok:
+            self._save_cache(items)
+            self.vehicle_count = len(items)
+        result = MissionResult(self._op, ok, detail, len(self._items), now - self._t_start,
+                               self._resent, False, items)
+        self.state = "idle"
+        self._deadline = None
+        self._inflight.clear()
+        if self.on_result:
+            self.on_result(result)
+
+    def cancel(self, detail: str = "İptal edildi"):
+        if self.busy:
+            self._finish(False, detail, time.monotonic())
+
+    # --- döngü -----------------------------------------------------------
+
+    def poll(self, now: float):
+        if self.state == "download":
+            for seq, (deadline, attempts) in list(self._inflight.items()):
+                if now < deadline:
+                    continue
+                if attempts >= MAX_RETRIES:
+                    self._send_ack(mavlink.MAV_MISSION_OPERATION_CANCELLED)
+                    self._finish(False, f"Öğe {seq} alınamadı", now)
+                    return
+                self._resent += 1
+                self._request_item(seq, now, attempts + 1)
+            return
+        if self._deadline is None or now < self._deadline:
+            return
+        if self._attempts >= MAX_RETRIES:
+            if self.state == "probe":
+                # Görev protokolü yanıtsız: sayı bilinmiyor olarak kalır
+                self.state = "idle"
+                self._deadline = None
+                return
+            if self.state == "upload":
+                self._send_ack(mavlink.MAV_MISSION_OPERATION_CANCELLED)
+            self._finish(False, "Zaman aşımı", now)
+            return
+        self._attempts += 1
+        if self.state in ("probe", "count"):
+            self._send_request_list(now)
+        elif self._last_seq is None:
+            self._send_count(now)
+        else:
+            # Araç hâlâ aynı öğeyi bekliyor: sadece onu tekrar gönder
+            self._resent += 1
+            self._send_item(self._last_seq, now)
+
+    def time_until_due(self, now: float):
+        deadlines = [d for d, _ in self._inflight.values()]
+        if self._deadline is not None:
+            deadlines.append(self._deadline)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - now)
+
+    def on_message(self, msg):
+        msg_id = msg.get_msgId()
+        if msg_id == mavlink.MAVLINK_MSG_ID_MISSION_CURRENT:
+            # total alanı eski lehçelerde yok; o durumda sayı indirme/yüklemeden öğrenilir
+            total = getattr(msg, "total", 0)
+            if msg.get_srcSystem() == self.target_system and total:
+                self.vehicle_count = 0 if total == NO_MISSION else total
+            return
+        if self.state == "idle" or msg.get_srcSystem() != self.target_system:
+            return
+        if getattr(msg, "mission_type", mavlink.MAV_MISSION_TYPE_MISSION) != mavlink.MAV_MISSION_TYPE_MISSION:
+            return
+        now = time.monotonic()
+        if msg_id in (mavlink.MAVLINK_MSG_ID_MISSION_REQUEST_INT, mavlink.MAVLINK_MSG_ID_MISSION_REQUEST):
+            if self.state == "upload":
+                self._on_item_request(msg.seq, now)
+        elif msg_id == mavlink.MAVLINK_MSG_ID_MISSION_COUNT:
+            self._on_count(msg.count, now)
+        elif msg_id == mavlink.MAVLINK_MSG_ID_MISSION_ITEM_INT:
+            if self.state == "download":
+                self._on_item(msg, now)
+        elif msg_id == mavlink.MAVLINK_MSG_ID_MISSION_ACK:
+            if self.state == "upload":
+                if msg.type == mavlink.MAV_MISSION_ACCEPTED:
+                    self._finish(True, "Yüklendi", now)
+                else:
+                    self._finish(False, _ack_name(msg.type), now)
+            elif self.state in ("count", "download") and msg.type != mavlink.MAV_MISSION_ACCEPTED:
+                self._finish(False, _ack_name(msg.type), now)
+
+    def _on_item_request(self, seq, now):
+        if seq >= len(self._items):
+            return
+        if seq in self._requested:
+            self._resent += 1
+        self._requested.add(seq)
+        self._last_seq = seq
+        self._attempts = 0
+        self._send_item(seq, now)
+
+    def _on_count(self, count, now):
+        if self.state == "probe":
+            # İndirme işlemini hemen kapat; sadece sayıya bakıldı
+            self._send_ack()
+            self.vehicle_count = count
+            self.state = "idle"
+            self._deadline = None
+            return
+        if self.state != "count":
+            return
+        self.vehicle_count = count
+        if count == 0:
+            self._send_ack()
+            self._finish(True, "Araçta görev yok", now)
+            return
+        cache = self._load_cache()
+        if cache is not None and cache["count"] == count and self.on_result:
+            # Sayı tutuyor ama içerik aynı olmayabilir: sadece önizleme, indirme sürer
+            items = tuple(cache["items"])
+            self.on_result(MissionResult("download", True, "Cache (indiriliyor)", count,
+                                         now - self._t_start, 0, True, items))
+        self.state = "download"
+        self._items = [None] * count
+        self._deadline = None
+        self._status(f"Görev indiriliyor: {count} öğe")
+        self._request_items(now)
+
+    def _on_item(self, msg, now):
+        seq = msg.seq
+        if seq >= len(self._items) or self._items[seq] is not None:
+            return
+        self._items[seq] = MissionItem(msg.command, msg.x, msg.y, msg.z, msg.frame,
+                                       msg.param1, msg.param2, msg.param3, msg.param4,
+                                       msg.current, msg.autocontinue)
+        self._inflight.pop(seq, None)
+        if all(it is not None for it in self._items):
+            self._send_ack()
+            self._finish(True, "İndirildi", now)
+        else:
+            self._request_items(now)
+
+    def _status(self, text: str):
+        if self.on_status:
+            self.on_status(text)
+
+
+def _ack_name(result: int) -> str:
+    entry = mavlink.enums["MAV_MISSION_RESULT"].get(result)
+    return entry.name if entry is not None else str(result)
@@ -0,0 +1,206 @@
+import select
+import time
+
+from pymavlink import mavutil
+
+DEDUP_WINDOW = 0.5      # s, başka linkten gelen aynı frame bu süre içinde kopya sayılır
+LINK_TIMEOUT = 2.0      # s, bu süre mesaj gelmeyen link ölü sayılır
+LAG_ALPHA = 0.1         # gecikme EWMA katsayısı
+LOSS_ALPHA = 0.3        # kayıp yüzdesi EWMA katsayısı (report() başına)
+MAX_SEQ_GAP = 128
+
+
+def split_links(connection_str: str):
+    """'udpin:0.0.0.0:14550,/dev/ttyUSB0:57600' -> list of connection strings."""
+    return [s.strip() for s in connection_str.split(",") if s.strip()]
+
+
+class Link:
+    """One physical link of a MultiLinkConnection and its quality counters."""
+    def __init__(self, name: str, conn):
+        self.name = name
+        self.conn = conn
+        self.received = 0       # bu linkten gelen tüm frame'ler
+        self.first = 0          # ilk bu linkten gelip kullanılan frame'ler
+        self.duplicates = 0     # başka linkten önce gelmiş kopyalar
+        self.lag = 0.0          # s, ilk kopyaya göre gecikme (EWMA)
+        self.last_rx = 0.0
+        self._seqs = {}         # (sysid, compid) -> son seq
+        self._rx = 0
+        self._lost = 0
+        self.loss_pct = 0.0     # EWMA
+
+    @property
+    def fd(self):
+        return getattr(self.conn, "fd", None)
+
+    def alive(self, now: float) -> bool:
+        return now - self.last_rx < LINK_TIMEOUT
+
+    def count(self, key, seq, now):
+        self.received += 1
+        self._rx += 1
+        self.last_rx = now
+        last = self._seqs.get(key)
+        if last is not None:
+            gap = (seq - last - 1) & 0xFF
+            if gap < MAX_SEQ_GAP:
+                self._lost += gap
+        self._seqs[key] = seq
+
+    def add_lag(self, lag: float):
+        self.lag += LAG_ALPHA * (lag - self.lag)
+
+    def roll(self):
+        total = self._rx + self._lost
+        if total:
+            self.loss_pct += LOSS_ALPHA * (100.0 * self._lost / total - self.loss_pct)
+        self._rx = 0
+        self._lost = 0
+
+
+class MultiLinkConnection:
+    """
+    Stands in for a mavutil connection and ingests from several links at
+    once (e.g. a serial radio and a Wi-Fi UDP bridge).
+
+    Frames are de-duplicated by (sysid, compid, seq) plus their bytes: the
+    first copy is returned, copies arriving later on another link within
+    DEDUP_WINDOW are dropped and only feed that link's lag estimate. Sending
+    (`mav`, `write`) always goes through the best live link - lowest loss,
+    then lowest lag - so losing a link just moves traffic to the next one.
+    """
+    def __init__(self, connection_strings, **kwargs):
+        self.links = [Link(s, mavutil.mavlink_connection(s, **kwargs)) for s in connection_strings]
+        self._seen = {}       # (sysid, compid, seq) -> (frame, t, link)
+        self._next = 0        # round-robin başlangıcı
+        self._best = self.links[0]
+
+    @property
+    def fd(self):
+        return None
+
+    @property
+    def fds(self):
+        return [link.fd for link in self.links if link.fd is not None]
+
+    @property
+    def best(self) -> Link:
+        return self._best
+
+    def _current(self) -> Link:
+        # Aktif link düştüyse ilk gönderimde hemen diğerine geç
+        now = time.monotonic()
+        if not self._best.alive(now):
+            self.select_best(now)
+        return self._best
+
+    @property
+    def mav(self):
+        return self._current().conn.mav
+
+    @property
+    def target_system(self):
+        return self._current().conn.target_system
+
+    @property
+    def target_component(self):
+        return self._current().conn.target_component
+
+    def write(self, buf):
+        self._current().conn.write(buf)
+
+    def select_best(self, now: float):
+        alive = [link for link in self.links if link.alive(now)]
+        if alive:
+            self._best = min(alive, key=lambda l: (round(l.loss_pct), l.lag))
+        return self._best
+
+    def _recv_one(self, link: Link, now: float):
+        """Next new (not duplicate) message from a link, None if it has nothing buffered."""
+        while True:
+            msg = link.conn.recv_msg()
+            if msg is None:
+                return None
+            if msg.get_type() == "BAD_DATA":
+                return msg
+            sysid = msg.get_srcSystem()
+            compid = msg.get_srcComponent()
+            seq = msg.get_seq()
+            link.count((sysid, compid), seq, now)
+            key = (sysid, compid, seq)
+            frame = msg.get_msgbuf()
+            seen = self._seen.get(key)
+            if (seen is not None and seen[2] is not link and now - seen[1] < DEDUP_WINDOW
+                    and seen[0] == frame):
+                link.duplicates += 1
+                link.add_lag(now - seen[1])
+                continue
+            self._seen[key] = (frame, now, link)
+            link.first += 1
+            link.add_lag(0.0)
+            return msg
+
+    def recv_msg(self):
+        now = time.monotonic()
+        n = len(self.links)
+        for i in range(n):
+            link = self.links[(self._next + i) % n]
+            msg = self._recv_one(link, now)
+            if msg is not None:
+                # Adil sıra: bir sonraki çağrı sonraki linkten başlasın
+                self._next = (self._next + i + 1) % n
+                return msg
+        return None
+
+    def recv_match(self, condition=None, type=None, blocking=False, timeout=None):
+        if type is not None and not isinstance(type, (list, tuple, set)):
+            type = [type]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            msg = self.recv_msg()
+            if msg is None:
+                if not blocking:
+                    return None
+                remaining = 0.1 if deadline is None else deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                fds = self.fds
+                if fds:
+                    select.select(fds, [], [], min(remaining, 0.1))
+                else:
+                    time.sleep(min(remaining, 0.01))
+                continue
+            if type is not None and msg.get_type() not in type:
+                continue
+            if condition is not None and not mavutil.evaluate_condition(condition, {msg.get_type(): msg}):
+                continue
+            return msg
+
+    def wait_heartbeat(self, blocking=True, timeout=None):
+        return self.recv_match(type="HEARTBEAT", blocking=blocking, timeout=timeout)
+
+    def report(self, now: float) -> dict:
+        """Per-link quality, rolled once per second by the worker."""
+        for link in self.links:
+            link.roll()
+        best = self.select_best(now)
+        return {
+            link.name: {
+                "alive": link.alive(now),
+                "active": link is best,
+                "received": link.received,
+                "first": link.first,
+                "duplicates": link.duplicates,
+                "loss_pct": link.loss_pct,
+                "lag_ms": link.lag * 1e3,
+            }
+            for link in self.links
+        }
+
+    def close(self):
+        for link in self.links:
+            try:
+                link.conn.close()
+            except OSError:
+                pass
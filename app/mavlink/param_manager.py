@@ -0,0 +1,392 @@
+import json
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+
+from pymavlink import mavutil
+
+mavlink = mavutil.mavlink
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "config" / "param_cache"
+HASH_CHECK_ID = "_HASH_CHECK"   # PX4: tüm parametrelerin CRC32'si, index -1 ile okunur (ArduPilot'ta yok)
+
+VERSION_TIMEOUT = 1.0    # s, cache anahtarı için AUTOPILOT_VERSION beklenir
+HASH_TIMEOUT = 1.0       # s, _HASH_CHECK yanıtı gelmezse otopilot desteklemiyor sayılır
+LIST_GAP_TIMEOUT = 1.0   # s, liste akışı bu kadar susunca eksik indeksler istenir
+LIST_RETRIES = 3         # hiç PARAM_VALUE gelmezse PARAM_REQUEST_LIST tekrarı
+READ_BURST = 10          # tek turda PARAM_REQUEST_READ ile istenen eksik indeks sayısı
+READ_TIMEOUT = 0.5       # s, bir eksik indeks turunun süresi
+READ_ATTEMPTS = 3        # indeks başına en fazla istek
+SET_TIMEOUT = 1.0        # s, PARAM_SET sonrası PARAM_VALUE yankısı beklenir
+SET_RETRIES = 3
+PROGRESS_INTERVAL = 0.5  # s, indirme sırasında ilerleme bildirimi aralığı
+
+# Tamsayı tipler; diğerleri (REAL32) doğrudan float
+_INT_FORMATS = {
+    mavlink.MAV_PARAM_TYPE_UINT8: "<B",
+    mavlink.MAV_PARAM_TYPE_INT8: "<b",
+    mavlink.MAV_PARAM_TYPE_UINT16: "<H",
+    mavlink.MAV_PARAM_TYPE_INT16: "<h",
+    mavlink.MAV_PARAM_TYPE_UINT32: "<I",
+    mavlink.MAV_PARAM_TYPE_INT32: "<i",
+}
+_FLOAT = struct.Struct("<f")
+
+
+def decode_value(wire: float, ptype: int, bytewise: bool = False):
+    """PARAM_VALUE.param_value -> int/float according to the parameter type."""
+    fmt = _INT_FORMATS.get(ptype)
+    if fmt is None:
+        return wire
+    if bytewise:
+        # PX4: tamsayının byte'ları float alanına kopyalanır
+        return struct.unpack(fmt, _FLOAT.pack(wire)[:struct.calcsize(fmt)])[0]
+    return int(wire)
+
+
+def encode_value(value, ptype: int, bytewise: bool = False) -> float:
+    fmt = _INT_FORMATS.get(ptype)
+    if fmt is None:
+        return float(value)
+    if bytewise:
+        return _FLOAT.unpack(struct.pack(fmt, int(value)).ljust(4, b"\0"))[0]
+    return float(int(value))
+
+
+def param_hash(params) -> str:
+    """CRC32 over the sorted (name, wire value) pairs, as hex."""
+    crc = 0
+    for name in sorted(params):
+        crc = zlib.crc32(name.encode(), crc)
+        crc = zlib.crc32(_FLOAT.pack(params[name][2]), crc)
+    return f"{crc:08x}"
+
+
+class ParamManager:
+    """
+    Reads and writes autopilot parameters inside the receive loop.
+
+    start() first loads the disk cache for this vehicle and firmware, so
+    values are available before anything is downloaded. If the autopilot
+    answers the _HASH_CHECK read (PX4) with the hash stored in the cache,
+    nothing is downloaded at all. Otherwise PARAM_REQUEST_LIST is sent and
+    indices missing from the stream are re-requested one by one with
+    PARAM_REQUEST_READ instead of restarting the list. The complete set is
+    written back to the cache together with the autopilot hash.
+
+    ArduPilot has no _HASH_CHECK, so every connect to it downloads the full
+    list (after HASH_TIMEOUT). There the cache only makes the old values
+    available immediately and yields the `changed` and `removed` lists; a
+    count match or spot-checked values cannot prove that the rest is
+    unchanged.
+
+    set() sends PARAM_SET and waits for the PARAM_VALUE echo, retrying on
+    timeout. Call poll() every loop turn and on_message() for every
+    received message.
+    """
+    def __init__(self, master, target_system: int = 1, target_component: int = 1,
+                 on_update=None, on_status=None, cache_dir=None):
+        self.master = master
+        self.target_system = target_system
+        self.target_component = target_component
+        self.on_update = on_update
+        self.on_status = on_status
+        self.cache_dir = Path(CACHE_DIR if cache_dir is None else cache_dir)
+
+        self.params = {}            # name -> [index, type, wire_value]
+        self.count = None
+        self.state = "idle"         # idle -> version -> hash -> list -> missing -> ready | partial | failed
+        self.uid = 0
+        self.firmware = 0
+        self.bytewise = False
+        self.vehicle_hash = None
+        self.changed = []
+        self.removed = []           # son tam indirmede araçta artık olmayanlar
+        self._cache = None          # diskten okunan cache (dict)
+        self._received = set()      # bu indirmede gelen indeksler
+        self._fresh = set()         # bu indirmede gelen isimler
+        self._read_attempts = {}    # indeks -> istek sayısı
+        self._burst = set()
+        self._deadline = None
+        self._list_attempts = 0
+        self._last_rx = 0.0
+        self._t_start = 0.0
+        self._next_progress = 0.0
+        self._sets = {}             # name -> [wire, type, deadline, attempts]
+
+    # --- indirme ---------------------------------------------------------
+
+    def start(self, now: float = None):
+        now = time.monotonic() if now is None else now
+        self._t_start = now
+        self.state = "version"
+        self.master.mav.command_long_send(
+            self.target_system, self.target_component,
+            mavlink.MAV_CMD_REQUEST_MESSAGE, 0,
+            mavlink.MAVLINK_MSG_ID_AUTOPILOT_VERSION, 0, 0, 0, 0, 0, 0)
+        self._deadline = now + VERSION_TIMEOUT
+
+    def refresh(self, now: float = None):
+        """Re-validates the current values (hash check, then list download)."""
+        now = time.monotonic() if now is None else now
+        if self.state in ("version", "hash", "list", "missing"):
+            return
+        self._t_start = now
+        self._cache = self._snapshot_cache() if self.params else None
+        self._check_hash(now)
+
+    @property
+    def cache_path(self) -> Path:
+        return self.cache_dir / (f"{self.target_system}_{self.target_component}_"
+                                 f"{self.uid:016x}_{self.firmware:08x}.json")
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            params = {name: list(p) for name, p in cache["params"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self._cache = cache
+        self.params = params
+        self.count = cache.get("count", len(params))
+        self._status(f"Parametreler cache'ten yüklendi: {len(params)}")
+        self._update(include_values=True)
+
+    def _snapshot_cache(self):
+        return {
+            "hash": self.vehicle_hash,
+            "param_hash": param_hash(self.params),
+            "count": self.count,
+            "params": {name: list(p) for name, p in self.params.items()},
+        }
+
+    def _save_cache(self):
+        cache = self._snapshot_cache()
+        cache["vehicle"] = {"sysid": self.target_system, "compid": self.target_component,
+                            "uid": self.uid, "firmware": self.firmware}
+        if self._cache is not None and self._cache.get("param_hash") == cache["param_hash"] \
+                and self._cache.get("hash") == cache["hash"]:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp, self.cache_path)
+            self._cache = cache
+        except OSError as e:
+            self._status(f"Parametre cache yazılamadı: {e}")
+
+    def _check_hash(self, now: float):
+        if self._cache is None:
+            self._request_list(now)
+            return
+        self.state = "hash"
+        self.master.mav.param_request_read_send(
+            self.target_system, self.target_component, HASH_CHECK_ID.encode(), -1)
+        self._deadline = now + HASH_TIMEOUT
+
+    def _request_list(self, now: float):
+        self.state = "list"
+        self._received.clear()
+        self._fresh.clear()
+        self._read_attempts.clear()
+        self._list_attempts += 1
+        self.master.mav.param_request_list_send(self.target_system, self.target_component)
+        self._last_rx = now
+        self._deadline = None
+
+    def _request_missing(self, now: float):
+        self.state = "missing"
+        missing = [i for i in range(self.count) if i not in self._received
+                   and self._read_attempts.get(i, 0) < READ_ATTEMPTS]
+        if not missing:
+            self._finish(now)
+            return
+        self._burst = set(missing[:READ_BURST])
+        for index in self._burst:
+            self._read_attempts[index] = self._read_attempts.get(index, 0) + 1
+            self.master.mav.param_request_read_send(
+                self.target_system, self.target_component, b"", index)
+        self._deadline = now + READ_TIMEOUT
+
+    def _finish(self, now: float):
+        complete = self.count is not None and len(self._received) >= self.count
+        old = self._cache["params"] if self._cache else {}
+        if complete:
+            # Firmware güncellemesiyle kaldırılmış parametreler
+            self.removed = sorted((set(old) | set(self.params)) - self._fresh)
+            for name in self.removed:
+                self.params.pop(name, None)
+            self._save_cache()
+        else:
+            self.removed = []
+        self.changed = sorted(name for name in self._fresh
+                              if name not in old or old[name][2] != self.params[name][2])
+        self.state = "ready" if complete else "partial"
+        self._deadline = None
+        took = now - self._t_start
+        if complete:
+            self._status(f"Parametreler: {len(self.params)} ({len(self.changed)} değişti, "
+                         f"{len(self.removed)} kaldırıldı, {took:.1f} s)")
+        else:
+            self._status(f"Parametreler eksik: {len(self._received)}/{self.count}")
+        self._update(include_values=True)
+
+    # --- yazma -----------------------------------------------------------
+
+    def set(self, name: str, value, now: float = None) -> bool:
+        now = time.monotonic() if now is None else now
+        entry = self.params.get(name)
+        if entry is None:
+            self._status(f"Bilinmeyen parametre: {name}")
+            return False
+        ptype = entry[1]
+        wire = encode_value(value, ptype, self.bytewise)
+        self._sets[name] = [wire, ptype, now + SET_TIMEOUT, 1]
+        self._send_set(name, wire, ptype)
+        return True
+
+    def _send_set(self, name, wire, ptype):
+        self.master.mav.param_set_send(
+            self.target_system, self.target_component, name.encode(), wire, ptype)
+
+    # --- döngü -----------------------------------------------------------
+
+    def poll(self, now: float):
+        if self.state == "version" and now >= self._deadline:
+            # AUTOPILOT_VERSION desteklenmiyor: firmware bilinmeden cache anahtarı
+            self._load_cache()
+            self._check_hash(now)
+        elif self.state == "hash" and now >= self._deadline:
+            self._request_list(now)
+        elif self.state == "list" and now - self._last_rx >= LIST_GAP_TIMEOUT:
+            if self.count is not None and self._received:
+                self._request_missing(now)
+            elif self._list_attempts < LIST_RETRIES:
+                self._request_list(now)
+            else:
+                self.state = "failed"
+                self._status("Parametre listesi alınamadı")
+                self._update()
+        elif self.state == "missing" and now >= self._deadline:
+            self._request_missing(now)
+
+        for name, pending in list(self._sets.items()):
+            wire, ptype, deadline, attempts = pending
+            if now < deadline:
+                continue
+            if attempts < SET_RETRIES:
+                pending[2] = now + SET_TIMEOUT * (attempts + 1)
+                pending[3] = attempts + 1
+                self._send_set(name, wire, ptype)
+            else:
+                del self._sets[name]
+                self._status(f"Parametre yazılamadı: {name}")
+
+        if self.state in ("list", "missing") and now >= self._next_progress:
+            self._next_progress = now + PROGRESS_INTERVAL
+            self._update()
+
+    def time_until_due(self, now: float):
+        deadlines = [p[2] for p in self._sets.values()]
+        if self.state == "list":
+            deadlines.append(self._last_rx + LIST_GAP_TIMEOUT)
+        elif self._deadline is not None:
+            deadlines.append(self._deadline)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - now)
+
+    def on_message(self, msg):
+        msg_id = msg.get_msgId()
+        if msg_id == mavlink.MAVLINK_MSG_ID_PARAM_VALUE:
+            if msg.get_srcSystem() == self.target_system and msg.get_srcComponent() == self.target_component:
+                self._on_param_value(msg)
+        elif msg_id == mavlink.MAVLINK_MSG_ID_AUTOPILOT_VERSION:
+            if self.state == "version" and msg.get_srcSystem() == self.target_system:
+                self.uid = msg.uid
+                self.firmware = msg.flight_sw_version
+                self.bytewise = bool(msg.capabilities & mavlink.MAV_PROTOCOL_CAPABILITY_PARAM_ENCODE_BYTEWISE)
+                self._load_cache()
+                self._check_hash(time.monotonic())
+
+    def _on_param_value(self, msg):
+        now = time.monotonic()
+        name = msg.param_id
+        if name == HASH_CHECK_ID:
+            self.vehicle_hash = struct.unpack("<I", _FLOAT.pack(msg.param_value))[0]
+            if self.state == "hash":
+                if self._cache is not None and self._cache.get("hash") == self.vehicle_hash:
+                    # Hiçbir şey değişmemiş: indirme yok
+                    self.changed = []
+                    self.removed = []
+                    self.state = "ready"
+                    self._deadline = None
+                    self._status(f"Parametreler güncel (cache): {len(self.params)}")
+                    self._update(include_values=True)
+                else:
+                    self._request_list(now)
+            return
+
+        entry = [msg.param_index, msg.param_type, msg.param_value]
+        previous = self.params.get(name)
+        self.params[name] = entry
+
+        pending = self._sets.get(name)
+        if pending is not None:
+            del self._sets[name]
+            value = decode_value(msg.param_value, msg.param_type, self.bytewise)
+            if msg.param_value == pending[0]:
+                self._status(f"Parametre: {name} = {value}")
+            else:
+                self._status(f"Parametre reddedildi: {name} = {value}")
+
+        if self.state in ("list", "missing"):
+            self._last_rx = now
+            self.count = msg.param_count
+            if 0 <= msg.param_index < msg.param_count:
+                self._received.add(msg.param_index)
+                self._burst.discard(msg.param_index)
+            self._fresh.add(name)
+            if len(self._received) >= self.count:
+                self._finish(now)
+            elif self.state == "missing" and not self._burst:
+                self._request_missing(now)
+        elif previous is None or previous[2] != entry[2]:
+            # İndirme dışında gelen değişiklik (PARAM_SET yankısı veya başka GCS);
+            # otopilotun hash'i artık farklı, bir sonraki bağlantıda liste indirilir
+            if self.state == "ready":
+                self.vehicle_hash = None
+                self._save_cache()
+            self.changed = [name]
+            self.removed = []
+            self._update(include_values=True)
+
+    # --- raporlama -------------------------------------------------------
+
+    def values(self) -> dict:
+        return {name: decode_value(p[2], p[1], self.bytewise) for name, p in self.params.items()}
+
+    def report(self, include_values: bool = False) -> dict:
+        out = {
+            "state": self.state,
+            "received": len(self._received) if self.state in ("list", "missing") else len(self.params),
+            "count": self.count,
+            "changed": list(self.changed),
+            "removed": list(self.removed),
+        }
+        if include_values:
+            out["values"] = self.values()
+        return out
+
+    def _update(self, include_values: bool = False):
+        if self.on_update:
+            self.on_update(self.report(include_values))
+
+    def _status(self, text: str):
+        if self.on_status:
+            self.on_status(text)
@@ -0,0 +1,203 @@
+import multiprocessing as mp
+import threading
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from mavlink.shm_telemetry import SnapshotReader, SnapshotWriter
+from mavlink.telemetry_publisher import DEFAULT_UI_RATE_HZ
+
+# Çocuk sürece borudan gönderilebilecek MavlinkWorker metotları
+REMOTE_COMMANDS = frozenset(("start_mission", "send_manual_control", "test_motor", "replay_seek",
+                             "request_params", "set_param", "upload_mission", "download_mission"))
+STOP_TIMEOUT = 2.0     # s, çocuk süreç bu sürede çıkmazsa sonlandırılır
+
+
+def _command_loop(conn, worker):
+    while True:
+        try:
+            cmd, args = conn.recv()
+        except (EOFError, OSError):
+            worker.stop()
+            return
+        if cmd == "stop":
+            worker.stop()
+            return
+        if cmd in REMOTE_COMMANDS:
+            getattr(worker, cmd)(*args)
+
+
+def _ingest_main(shm_name, conn, worker_kwargs):
+    """
+    Child process entry point: runs MavlinkWorker.run() (link, parsing and
+    TelemetryHandler) on this process's main thread. The primary vehicle's
+    snapshots go to shared memory, everything else over the pipe.
+    """
+    from mavlink.mavlink_worker import MavlinkWorker
+
+    writer = SnapshotWriter(shm_name)
+    worker = MavlinkWorker(**worker_kwargs)
+    send_lock = threading.Lock()
+
+    def send(*event):
+        with send_lock:
+            try:
+                conn.send(event)
+            except (OSError, ValueError):
+                pass
+
+    def on_vehicle_telemetry(sysid, compid, snap):
+        if (sysid, compid) != worker.primary.key:
+            send("vehicle_telemetry", sysid, compid, snap)
+
+    worker.telemetry.connect(writer.write)
+    worker.vehicle_telemetry.connect(on_vehicle_telemetry)
+    worker.vehicle_added.connect(lambda sysid, compid: send("vehicle_added", sysid, compid))
+    worker.status.connect(lambda text: send("status", text))
+    worker.error.connect(lambda text: send("error", text))
+    worker.command_result.connect(lambda result: send("command_result", result))
+    worker.link_stats.connect(lambda stats: send("link_stats", stats))
+    worker.link_lost.connect(lambda silent: send("link_lost", silent))
+    worker.link_restored.connect(lambda took: send("link_restored", took))
+    worker.param_update.connect(lambda report: send("param_update", report))
+    worker.mission_result.connect(lambda result: send("mission_result", result))
+    worker.loop_stats.connect(lambda stats: send("loop_stats", stats))
+
+    threading.Thread(target=_command_loop, args=(conn, worker), daemon=True).start()
+    try:
+        worker.run()
+    finally:
+        writer.close()
+        send("exited")
+
+
+class _RemoteVehicle:
+    def __init__(self):
+        self.sysid = 0
+        self.compid = 0
+
+    @property
+    def key(self):
+        return self.sysid, self.compid
+
+
+class ProcessMavlinkWorker(QThread):
+    """
+    Drop-in replacement for MavlinkWorker that runs the link and MAVLink
+    decoding in a child process, so parsing does not compete for the GIL
+    with Qt painting, video conversion and JSON work.
+
+    The GUI side only reads the fixed-layout snapshot struct from shared
+    memory (seqlock, no copies of Python objects) and a low-rate event pipe
+    (status, stats, command results, secondary vehicles). Commands go back
+    over the same pipe.
+    """
+    telemetry = pyqtSignal(object)
+    vehicle_telemetry = pyqtSignal(int, int, object)
+    vehicle_added = pyqtSignal(int, int)
+    status    = pyqtSignal(str)
+    error     = pyqtSignal(str)
+    command_result = pyqtSignal(object)
+    link_stats = pyqtSignal(object)
+    link_lost = pyqtSignal(float)
+    link_restored = pyqtSignal(float)
+    param_update = pyqtSignal(object)
+    mission_result = pyqtSignal(object)
+    loop_stats = pyqtSignal(object)
+
+    def __init__(self, connection_string=None, ui_rate_hz=DEFAULT_UI_RATE_HZ, **kwargs):
+        super().__init__()
+        self._kwargs = dict(kwargs, connection_string=connection_string, ui_rate_hz=ui_rate_hz)
+        # Snapshot'ı yayın hızının iki katında yokla: en fazla yarım periyot ek gecikme
+        self._poll_interval = 0.5 / ui_rate_hz if ui_rate_hz > 0 else 0.01
+        self._ctx = mp.get_context("spawn")
+        self._conn, self._child_conn = self._ctx.Pipe()
+        self._send_lock = threading.Lock()
+        self._stop = False
+        self._proc = None
+        self.primary = _RemoteVehicle()
+        self.latest_snapshot = None
+
+    @property
+    def telemetry_state(self):
+        return self.latest_snapshot
+
+    def _send(self, cmd, *args):
+        with self._send_lock:
+            try:
+                self._conn.send((cmd, args))
+            except (OSError, ValueError):
+                pass
+
+    def stop(self):
+        self._stop = True
+        self._send("stop")
+
+    def start_mission(self):
+        self._send("start_mission")
+
+    def send_manual_control(self, x, y, z, r):
+        self._send("send_manual_control", x, y, z, r)
+
+    def test_motor(self, motor_id: int):
+        self._send("test_motor", motor_id)
+
+    def upload_mission(self, items):
+        self._send("upload_mission", list(items))
+
+    def download_mission(self):
+        self._send("download_mission")
+
+    def request_params(self):
+        self._send("request_params")
+
+    def set_param(self, name: str, value):
+        self._send("set_param", name, value)
+
+    def replay_seek(self, seconds: float):
+        self._send("replay_seek", seconds)
+
+    def run(self):
+        reader = SnapshotReader()
+        self._proc = self._ctx.Process(
+            target=_ingest_main, args=(reader.name, self._child_conn, self._kwargs),
+            name="MavlinkIngest", daemon=True)
+        try:
+            self._proc.start()
+            self._child_conn.close()
+            while not self._stop:
+                if self._conn.poll(self._poll_interval):
+                    if not self._drain_events():
+                        break
+                got = reader.read()
+                if got is not None:
+                    self.latest_snapshot = got[1]
+                    self.telemetry.emit(got[1])
+                if not self._proc.is_alive():
+                    self.error.emit("MAVLink süreci beklenmedik şekilde kapandı")
+                    break
+        except (OSError, EOFError) as e:
+            self.error.emit(f"MAVLink süreci hatası: {e}")
+        finally:
+            self._send("stop")
+            self._proc.join(STOP_TIMEOUT)
+            if self._proc.is_alive():
+                self._proc.terminate()
+                self._proc.join(STOP_TIMEOUT)
+            reader.close()
+
+    def _drain_events(self) -> bool:
+        """Emits every pending event; False once the child has exited."""
+        while self._conn.poll():
+            event = self._conn.recv()
+            kind = event[0]
+            if kind == "exited":
+                return False
+            if kind == "vehicle_added":
+                if self.primary.key == (0, 0):
+                    self.primary.sysid, self.primary.compid = event[1], event[2]
+                self.vehicle_added.emit(event[1], event[2])
+            elif kind == "vehicle_telemetry":
+                self.vehicle_telemetry.emit(*event[1:])
+            else:
+                getattr(self, kind).emit(event[1])
+        return True
@@ -0,0 +1,327 @@
+import abc
+import queue
+import select
+import socket
+import threading
+
+from mavlink.framing import frame_length, MARKER_V1, MARKER_V2
+
+OUTPUT_QUEUE_SIZE = 2000     # çıkış başına bekleyen frame sınırı
+INBOUND_QUEUE_SIZE = 500     # çıkışlardan araca gidecek frame sınırı
+POLL_INTERVAL = 0.1          # s, çıkış thread'lerinin en uzun select beklemesi
+TCP_SEND_TIMEOUT = 1.0       # s, bu sürede yazılamayan TCP istemcisi düşürülür
+
+
+class FrameSplitter:
+    """Cuts a byte stream (TCP) into whole MAVLink frames."""
+    def __init__(self):
+        self._buf = bytearray()
+
+    def feed(self, data: bytes):
+        buf = self._buf
+        buf += data
+        frames = []
+        off = 0
+        n = len(buf)
+        while off < n:
+            if buf[off] not in (MARKER_V1, MARKER_V2):
+                off += 1
+                continue
+            flen = frame_length(buf, off)
+            if flen is None or off + flen > n:
+                break
+            frames.append(bytes(buf[off:off + flen]))
+            off += flen
+        del buf[:off]
+        return frames
+
+
+class RouterOutput(abc.ABC):
+    """
+    One forwarding endpoint. send() only enqueues; a per-output thread does
+    the socket I/O, so a slow or dead consumer just fills its own bounded
+    queue (frames are then dropped and counted) and never blocks the
+    receive loop. Frames coming back from the endpoint are handed to
+    on_inbound().
+
+    Subclasses implement _run(), the thread body: loop until `_stop`, take
+    frames and readable sockets from _wait(), and close their sockets on
+    the way out.
+    """
+    def __init__(self, name: str, on_inbound, queue_size: int = OUTPUT_QUEUE_SIZE):
+        self.name = name
+        self.on_inbound = on_inbound
+        self._q = queue.Queue(maxsize=queue_size)
+        self._stop = False
+        self.sent = 0
+        self.dropped = 0
+        self.received = 0
+        # Kuyruk select'e verilemez; boşken gelen ilk frame bu çifti uyandırır
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._wake_pending = False
+        self._thread = threading.Thread(target=self._run, name=f"Router[{name}]", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def send(self, frame: bytes):
+        try:
+            self._q.put_nowait(frame)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if not self._wake_pending:
+            self._wake_pending = True
+            try:
+                self._wake_w.send(b"\0")
+            except OSError:
+                pass
+
+    def _wait(self, socks):
+        """
+        Blocks until frames are queued or one of `socks` is readable (at most
+        POLL_INTERVAL); returns (queued frames, readable sockets).
+        """
+        try:
+            readable, _, _ = select.select([self._wake_r] + socks, [], [], POLL_INTERVAL)
+        except (OSError, ValueError):
+            readable = []
+        if self._wake_r in readable:
+            readable.remove(self._wake_r)
+            try:
+                while self._wake_r.recv(1024):
+                    pass
+            except OSError:
+                pass
+            # Bayrak kuyruk boşaltılmadan önce sıfırlanır: sonra gelen frame yeniden uyandırır
+            self._wake_pending = False
+        frames = []
+        while True:
+            try:
+                frames.append(self._q.get_nowait())
+            except queue.Empty:
+                return frames, readable
+
+    @abc.abstractmethod
+    def _run(self):
+        """Thread body: forwards queued frames and reads replies until close()."""
+
+    def stats(self) -> dict:
+        return {"sent": self.sent, "dropped": self.dropped, "received": self.received,
+                "queued": self._q.qsize()}
+
+    def _close_sockets(self):
+        for s in (self._wake_r, self._wake_w):
+            try:
+                s.close()
+            except OSError:
+                pass
+
+    def close(self):
+        self._stop = True
+        if self._thread.is_alive():
+            try:
+                self._wake_w.send(b"\0")
+            except OSError:
+                pass
+            self._thread.join(timeout=1)
+        else:
+            self._close_sockets()
+
+
+class UdpOutput(RouterOutput):
+    """udp:HOST:PORT - sends to a fixed address, replies come back on the same socket."""
+    def __init__(self, host: str, port: int, on_inbound):
+        super().__init__(f"udp:{host}:{port}", on_inbound)
+        self.addr = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        if host.endswith(".255"):
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+    def _run(self):
+        sock = self.sock
+        while not self._stop:
+            # İkinci GCS'nin komutları boşta bekleyen downlink'te de hemen iletilir
+            frames, readable = self._wait([sock])
+            for frame in frames:
+                try:
+                    sock.sendto(frame, self.addr)
+                    self.sent += 1
+                except OSError:
+                    # Karşı taraf kapalı (ICMP unreachable) veya ağ yok
+                    self.dropped += 1
+            while readable:
+                try:
+                    data = sock.recv(65535)
+                except (BlockingIOError, OSError):
+                    break
+                self.received += 1
+                self.on_inbound(data)
+        sock.close()
+        self._close_sockets()
+
+    def close(self):
+        super().close()
+        if not self._thread.is_alive():
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+
+
+class TcpServerOutput(RouterOutput):
+    """tcpin:[HOST:]PORT - accepts any number of TCP clients and sends to all."""
+    def __init__(self, host: str, port: int, on_inbound):
+        super().__init__(f"tcpin:{host}:{port}", on_inbound)
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind((host, port))
+            self.server.listen(4)
+            self.server.setblocking(False)
+        except OSError:
+            self.server.close()
+            self._close_sockets()
+            raise
+        self.clients = {}   # socket -> FrameSplitter
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except (BlockingIOError, OSError):
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Yarım kalan gönderim akışı bozar; yetişemeyen istemci düşürülür
+            conn.settimeout(TCP_SEND_TIMEOUT)
+            self.clients[conn] = FrameSplitter()
+
+    def _drop_client(self, conn):
+        self.clients.pop(conn, None)
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def _run(self):
+        while not self._stop:
+            frames, readable = self._wait([self.server] + list(self.clients))
+            if self.server in readable:
+                readable.remove(self.server)
+                self._accept()
+            if frames and self.clients:
+                data = b"".join(frames)
+                for conn in list(self.clients):
+                    try:
+                        conn.sendall(data)
+                    except OSError:
+                        self.dropped += len(frames)
+                        self._drop_client(conn)
+                self.sent += len(frames)
+            for conn in readable:
+                if conn not in self.clients:
+                    continue        # gönderimde düşürüldü
+                try:
+                    data = conn.recv(65535)
+                except OSError:
+                    data = b""
+                if not data:
+                    self._drop_client(conn)
+                    continue
+                for frame in self.clients[conn].feed(data):
+                    self.received += 1
+                    self.on_inbound(frame)
+        for conn in list(self.clients):
+            self._drop_client(conn)
+        self.server.close()
+        self._close_sockets()
+
+    def close(self):
+        super().close()
+        if not self._thread.is_alive():
+            try:
+                self.server.close()
+            except OSError:
+                pass
+
+
+def split_output_spec(spec: str):
+    """'udp:HOST:PORT' or 'tcpin:[HOST:]PORT' -> (kind, host, port); ValueError if invalid."""
+    kind, _, rest = spec.strip().partition(":")
+    host, _, port = rest.rpartition(":")
+    if kind not in ("udp", "tcpin"):
+        raise ValueError(f"Bilinmeyen router çıkışı: {spec}")
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Geçersiz router çıkışı: {spec}")
+    if kind == "udp":
+        return kind, host or "127.0.0.1", int(port)
+    return kind, host or "0.0.0.0", int(port)
+
+
+def parse_output(spec: str, on_inbound) -> RouterOutput:
+    kind, host, port = split_output_spec(spec)
+    if kind == "udp":
+        return UdpOutput(host, port, on_inbound)
+    return TcpServerOutput(host, port, on_inbound)
+
+
+def parse_output_list(text: str):
+    """Comma separated settings string -> list of output specs."""
+    return [s.strip() for s in (text or "").split(",") if s.strip()]
+
+
+class MavlinkRouter:
+    """
+    Fans every raw frame received from the vehicle out to extra UDP/TCP
+    endpoints without re-encoding, and collects frames the endpoints send
+    back (commands from a second GCS) for the receive loop to write to the
+    vehicle link.
+    """
+    def __init__(self, specs, wake=None):
+        self._inbound = queue.Queue(maxsize=INBOUND_QUEUE_SIZE)
+        self._wake = wake
+        self.inbound_dropped = 0
+        self.outputs = []
+        try:
+            for spec in specs:
+                self.outputs.append(parse_output(spec, self._on_inbound))
+        except (OSError, ValueError):
+            # Port kullanımda / geçersiz spec: açılmış soketler sızmasın
+            self.close()
+            raise
+        for out in self.outputs:
+            out.start()
+
+    def _on_inbound(self, frame: bytes):
+        try:
+            self._inbound.put_nowait(frame)
+        except queue.Full:
+            self.inbound_dropped += 1
+            return
+        if self._wake is not None:
+            self._wake()
+
+    def forward(self, frame: bytes):
+        for out in self.outputs:
+            out.send(frame)
+
+    def pending_inbound(self):
+        """Frames to write to the vehicle; called from the receive loop."""
+        frames = []
+        while True:
+            try:
+                frames.append(self._inbound.get_nowait())
+            except queue.Empty:
+                return frames
+
+    def stats(self) -> dict:
+        out = {o.name: o.stats() for o in self.outputs}
+        out["inbound_dropped"] = self.inbound_dropped
+        return out
+
+    def close(self):
+        for out in self.outputs:
+            out.close()
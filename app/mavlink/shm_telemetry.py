@@ -0,0 +1,127 @@
+import math
+import struct
+from multiprocessing import shared_memory
+
+from mavlink.telemetry_handler import TelemetrySnapshot
+
+# Paylaşılan bellekteki sabit düzen: TelemetrySnapshot alanları sırasıyla.
+# Opsiyonel alanlar float64 olarak tutulur, None <-> NaN.
+_LAYOUT = (
+    ("heartbeat", "?"),
+    ("iha_enlem", "d"),
+    ("iha_boylam", "d"),
+    ("baglanilan_gps_sayisi", "d"),
+    ("iha_irtifa", "d"),
+    ("iha_dikilme", "d"),
+    ("iha_yonelme", "d"),
+    ("iha_yatis", "d"),
+    ("iha_hiz", "d"),
+    ("iha_batarya0", "d"),
+    ("iha_batarya1", "d"),
+    ("gps_saati", "d"),
+    ("hedef_merkez_X", "q"),
+    ("hedef_merkez_Y", "q"),
+    ("hedef_genislik", "q"),
+    ("hedef_yukseklik", "q"),
+    ("iha_otonom", "q"),
+    ("iha_kilitlenme", "q"),
+    ("time_boot_ms", "d"),
+    ("seq", "q"),
+    ("rx_time", "d"),
+    ("vehicle_utc", "d"),
+    ("age", "d"),
+)
+assert tuple(name for name, _ in _LAYOUT) == TelemetrySnapshot._fields
+
+_INT_OPTIONAL = frozenset(("baglanilan_gps_sayisi", "gps_saati", "time_boot_ms"))
+_OPTIONAL = frozenset(name for name, code in _LAYOUT if code == "d") - {"rx_time"}
+
+_SEQ = struct.Struct("<Q")
+_PAYLOAD = struct.Struct("<" + "".join(code for _, code in _LAYOUT))
+_PAYLOAD_OFFSET = 8
+SHM_SIZE = _PAYLOAD_OFFSET + _PAYLOAD.size
+
+_NAN = float("nan")
+MAX_READ_RETRIES = 100
+
+
+def _pack_values(snap):
+    out = []
+    for (name, code), value in zip(_LAYOUT, snap):
+        if code == "d" and value is None:
+            value = _NAN
+        out.append(value)
+    return out
+
+
+def _unpack_values(values):
+    out = []
+    for (name, _), value in zip(_LAYOUT, values):
+        if name in _OPTIONAL and math.isnan(value):
+            value = None
+        elif name in _INT_OPTIONAL:
+            value = int(value)
+        out.append(value)
+    return TelemetrySnapshot(*out)
+
+
+class SnapshotWriter:
+    """
+    Publishes the latest TelemetrySnapshot into a shared memory block using
+    a seqlock: the 64-bit counter is odd while a write is in progress, so
+    readers never see a half-written struct and the writer never waits.
+    """
+    def __init__(self, name: str):
+        self.shm = shared_memory.SharedMemory(name=name)
+        self._seq = _SEQ.unpack_from(self.shm.buf, 0)[0] & ~1
+
+    def write(self, snap):
+        buf = self.shm.buf
+        self._seq += 1
+        _SEQ.pack_into(buf, 0, self._seq)           # tek: yazılıyor
+        _PAYLOAD.pack_into(buf, _PAYLOAD_OFFSET, *_pack_values(snap))
+        self._seq += 1
+        _SEQ.pack_into(buf, 0, self._seq)           # çift: tutarlı
+
+    def close(self):
+        self.shm.close()
+
+
+class SnapshotReader:
+    """
+    Owns the shared memory block (created here, unlinked on close) and reads
+    the struct written by SnapshotWriter; read() is lock-free.
+    """
+    def __init__(self):
+        self.shm = shared_memory.SharedMemory(create=True, size=SHM_SIZE)
+        _SEQ.pack_into(self.shm.buf, 0, 0)
+        self.version = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def read(self):
+        """
+        (version, TelemetrySnapshot) if a newer snapshot than the last read
+        one is available, else None.
+        """
+        buf = self.shm.buf
+        for _ in range(MAX_READ_RETRIES):
+            v1 = _SEQ.unpack_from(buf, 0)[0]
+            if v1 & 1:
+                continue
+            if v1 == self.version:
+                return None
+            values = _PAYLOAD.unpack_from(buf, _PAYLOAD_OFFSET)
+            if _SEQ.unpack_from(buf, 0)[0] == v1:
+                self.version = v1
+                return v1, _unpack_values(values)
+        return None
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
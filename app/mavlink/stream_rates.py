@@ -0,0 +1,189 @@
+import time
+
+from pymavlink import mavutil
+
+mavlink = mavutil.mavlink
+
+# Profil -> {mesaj adı: Hz}. Profilde olmayan ama TelemetryHandler'ın
+# tükettiği mesajlar DEFAULT_RATE_HZ ile istenir.
+PROFILES = {
+    # 57600 baud telsiz: toplam ~1.5 KB/s civarında kal
+    "radio": {
+        "ATTITUDE": 10,
+        "GLOBAL_POSITION_INT": 5,
+        "VFR_HUD": 4,
+        "GPS_RAW_INT": 2,
+        "SYS_STATUS": 1,
+        "BATTERY_STATUS": 1,
+    },
+    "wifi": {
+        "ATTITUDE": 25,
+        "GLOBAL_POSITION_INT": 10,
+        "VFR_HUD": 10,
+        "GPS_RAW_INT": 5,
+        "SYS_STATUS": 2,
+        "BATTERY_STATUS": 2,
+    },
+    # Masa üstü / SITL: tam hız
+    "bench": {
+        "ATTITUDE": 50,
+        "GLOBAL_POSITION_INT": 25,
+        "VFR_HUD": 20,
+        "GPS_RAW_INT": 10,
+        "SYS_STATUS": 5,
+        "BATTERY_STATUS": 5,
+    },
+}
+DEFAULT_RATE_HZ = 1
+
+# SET_MESSAGE_INTERVAL desteklenmezse kullanılacak eski veri akışları
+LEGACY_STREAMS = {
+    mavlink.MAVLINK_MSG_ID_ATTITUDE:            mavlink.MAV_DATA_STREAM_EXTRA1,
+    mavlink.MAVLINK_MSG_ID_GLOBAL_POSITION_INT: mavlink.MAV_DATA_STREAM_POSITION,
+    mavlink.MAVLINK_MSG_ID_VFR_HUD:             mavlink.MAV_DATA_STREAM_EXTRA2,
+    mavlink.MAVLINK_MSG_ID_GPS_RAW_INT:         mavlink.MAV_DATA_STREAM_EXTENDED_STATUS,
+    mavlink.MAVLINK_MSG_ID_SYS_STATUS:          mavlink.MAV_DATA_STREAM_EXTENDED_STATUS,
+    mavlink.MAVLINK_MSG_ID_BATTERY_STATUS:      mavlink.MAV_DATA_STREAM_EXTRA3,
+}
+
+# Hız ayarlanmayan ama link bütçesine giren mesajlar (Hz)
+FIXED_RATE_MESSAGES = {mavlink.MAVLINK_MSG_ID_HEARTBEAT: 1}
+
+MAVLINK2_OVERHEAD = 12   # header (10) + CRC (2)
+ACK_TIMEOUT = 0.5        # s
+MAX_RETRIES = 3
+
+
+def frame_bytes(msg_id: int) -> int:
+    """Upper bound of a MAVLink 2 frame for msg_id (payload is not truncated)."""
+    cls = mavlink.mavlink_map.get(msg_id)
+    payload = cls.unpacker.size if cls is not None else 0
+    return MAVLINK2_OVERHEAD + payload
+
+
+class StreamRateManager:
+    """
+    Requests exactly the messages TelemetryHandler consumes, at the rates of a
+    named profile, with MAV_CMD_SET_MESSAGE_INTERVAL. Requests go one at a
+    time and each is confirmed with COMMAND_ACK, retried on timeout, and
+    falls back to REQUEST_DATA_STREAM if the autopilot rejects it.
+
+    Runs inside the receive loop: call poll() every loop turn and
+    on_message() for every received message.
+    """
+    def __init__(self, master, msg_ids, profile: str = "radio",
+                 target_system: int = 1, target_component: int = 1):
+        if profile not in PROFILES:
+            raise ValueError(f"Bilinmeyen akış profili: {profile}")
+        self.master = master
+        self.profile = profile
+        self.target_system = target_system
+        self.target_component = target_component
+
+        rates = PROFILES[profile]
+        self.rates = {}
+        for msg_id in sorted(msg_ids):
+            if msg_id in FIXED_RATE_MESSAGES:
+                continue
+            cls = mavlink.mavlink_map.get(msg_id)
+            name = cls.msgname if cls is not None else str(msg_id)
+            self.rates[msg_id] = rates.get(name, DEFAULT_RATE_HZ)
+
+        self._todo = []
+        self._pending = None      # (msg_id, deadline, attempts)
+        self.confirmed = set()
+        self.rejected = set()
+        self.state = "idle"       # idle -> setting -> done | fallback
+
+        self._bytes = 0
+        self._window_start = time.monotonic()
+        self.measured_bps = 0.0
+
+    @property
+    def expected_bps(self) -> float:
+        total = sum(hz * frame_bytes(i) for i, hz in self.rates.items())
+        total += sum(hz * frame_bytes(i) for i, hz in FIXED_RATE_MESSAGES.items())
+        return float(total)
+
+    def start(self):
+        self._todo = list(self.rates.items())
+        self._pending = None
+        self.confirmed.clear()
+        self.rejected.clear()
+        self.state = "setting"
+        self._send_next(time.monotonic())
+
+    def _send_interval(self, msg_id, hz):
+        interval_us = int(1e6 / hz) if hz > 0 else -1   # -1: mesajı kapat
+        self.master.mav.command_long_send(
+            self.target_system, self.target_component,
+            mavlink.MAV_CMD_SET_MESSAGE_INTERVAL, 0,
+            msg_id, interval_us, 0, 0, 0, 0, 0)
+
+    def _send_next(self, now):
+        if not self._todo:
+            self._pending = None
+            self._finish()
+            return
+        msg_id, hz = self._todo.pop(0)
+        self._send_interval(msg_id, hz)
+        self._pending = (msg_id, now + ACK_TIMEOUT, 1)
+
+    def _finish(self):
+        if not self.rejected:
+            self.state = "done"
+            return
+        # Eski yöntem: reddedilen mesajların akışlarını en yüksek hızla iste
+        streams = {}
+        for msg_id in self.rejected:
+            stream = LEGACY_STREAMS.get(msg_id)
+            if stream is not None:
+                streams[stream] = max(streams.get(stream, 0), self.rates[msg_id])
+        for stream, hz in streams.items():
+            self.master.mav.request_data_stream_send(
+                self.target_system, self.target_component, stream, int(max(1, hz)), 1)
+        self.state = "fallback"
+
+    def poll(self, now: float):
+        if self._pending is None:
+            return
+        msg_id, deadline, attempts = self._pending
+        if now < deadline:
+            return
+        if attempts < MAX_RETRIES:
+            self._send_interval(msg_id, self.rates[msg_id])
+            self._pending = (msg_id, now + ACK_TIMEOUT * (attempts + 1), attempts + 1)
+        else:
+            self.rejected.add(msg_id)
+            self._send_next(now)
+
+    def on_message(self, msg):
+        self._bytes += len(msg.get_msgbuf())
+        if self._pending is None or msg.get_msgId() != mavlink.MAVLINK_MSG_ID_COMMAND_ACK:
+            return
+        if msg.command != mavlink.MAV_CMD_SET_MESSAGE_INTERVAL or msg.get_srcSystem() != self.target_system:
+            return
+        if msg.result == mavlink.MAV_RESULT_IN_PROGRESS:
+            return
+        msg_id = self._pending[0]
+        if msg.result == mavlink.MAV_RESULT_ACCEPTED:
+            self.confirmed.add(msg_id)
+        else:
+            self.rejected.add(msg_id)
+        self._send_next(time.monotonic())
+
+    def report(self, now: float) -> dict:
+        dt = now - self._window_start
+        if dt > 0:
+            self.measured_bps = self._bytes / dt
+        self._bytes = 0
+        self._window_start = now
+        return {
+            "profile": self.profile,
+            "state": self.state,
+            "expected_bps": self.expected_bps,
+            "measured_bps": self.measured_bps,
+            "confirmed": len(self.confirmed),
+            "rejected": len(self.rejected),
+            "requested": len(self.rates),
+        }
@@ -1,6 +1,11 @@
 import math
-from dataclasses import dataclass
-from typing import Optional
+import time
+from dataclasses import dataclass, fields
+from typing import Callable, NamedTuple, Optional
+
+from pymavlink import mavutil
+
+mavlink = mavutil.mavlink
 
 @dataclass
 class Telemetry:
@@ -25,53 +30,201 @@ class Telemetry:
     iha_otonom: int = 0
     iha_kilitlenme: int = 0
 
+    # Son örneğin araç üzerindeki zamanı (time_boot_ms)
+    time_boot_ms: Optional[int] = None
+
+    def snapshot(self, seq: int, rx_time: float, vehicle_utc: Optional[float] = None,
+                 age: Optional[float] = None) -> "TelemetrySnapshot":
+        """
+        Returns an immutable copy of the current state, tagged with a
+        publish sequence number, the monotonic receive time of the last
+        message that changed it and, once the clocks are synced, the
+        sample's vehicle UTC and estimated age.
+        """
+        return TelemetrySnapshot(*[getattr(self, f) for f in _TELEMETRY_FIELDS],
+                                 seq, rx_time, vehicle_utc, age)
+
+
+_TELEMETRY_FIELDS = tuple(f.name for f in fields(Telemetry))
+
+
+class TelemetrySnapshot(NamedTuple):
+    """
+    Read-only telemetry view handed to the GUI and server threads.
+    Field names match Telemetry so consumers can use either.
+    """
+    heartbeat: bool
+    iha_enlem: Optional[float]
+    iha_boylam: Optional[float]
+    baglanilan_gps_sayisi: Optional[int]
+    iha_irtifa: Optional[float]
+    iha_dikilme: Optional[float]
+    iha_yonelme: Optional[float]
+    iha_yatis: Optional[float]
+    iha_hiz: Optional[float]
+    iha_batarya0: Optional[float]
+    iha_batarya1: Optional[float]
+    gps_saati: Optional[int]
+    hedef_merkez_X: int
+    hedef_merkez_Y: int
+    hedef_genislik: int
+    hedef_yukseklik: int
+    iha_otonom: int
+    iha_kilitlenme: int
+    time_boot_ms: Optional[int] = None
+    seq: int = 0          # monoton yayın sıra numarası
+    rx_time: float = 0.0  # time.monotonic(), son güncelleyen mesajın alınma anı
+    vehicle_utc: Optional[float] = None   # örneğin araçtaki UTC zamanı (unix s)
+    age: Optional[float] = None           # s, örneğin araçta alınmasından yayına kadar
+
+
+# ---- Mesaj işleyicileri: (msg, state) -> state güncellendi mi ----
+
+# AUTO / GUIDED (ArduPilot'ta AUTO, GUIDED, RTL, LOITER...) modlarında otopilot uçuruyor
+_AUTONOMOUS_FLAGS = mavlink.MAV_MODE_FLAG_AUTO_ENABLED | mavlink.MAV_MODE_FLAG_GUIDED_ENABLED
+
+
+def _on_heartbeat(msg, state: Telemetry) -> bool:
+    # Her heartbeat'te yayın yapma; sadece bağlantı ya da otonom durumu değişince
+    otonom = 1 if msg.base_mode & _AUTONOMOUS_FLAGS else 0
+    changed = not state.heartbeat or state.iha_otonom != otonom
+    state.heartbeat = True
+    state.iha_otonom = otonom
+    return changed
+
+
+def _on_global_position_int(msg, state: Telemetry) -> bool:
+    state.iha_enlem = msg.lat / 1e7
+    state.iha_boylam = msg.lon / 1e7
+    state.iha_irtifa = msg.relative_alt / 1000.0 # mm -> m
+    state.time_boot_ms = msg.time_boot_ms
+    return True
+
+
+def _on_attitude(msg, state: Telemetry) -> bool:
+    state.iha_yatis = math.degrees(msg.roll)
+    state.iha_dikilme = math.degrees(msg.pitch)
+    state.iha_yonelme = (math.degrees(msg.yaw) + 360) % 360
+    state.time_boot_ms = msg.time_boot_ms
+    return True
+
+
+def _on_gps_raw_int(msg, state: Telemetry) -> bool:
+    state.baglanilan_gps_sayisi = msg.satellites_visible
+    return True
+
+
+def _on_vfr_hud(msg, state: Telemetry) -> bool:
+    state.iha_hiz = msg.groundspeed
+    return True
+
+
+def _on_sys_status(msg, state: Telemetry) -> bool:
+    if msg.voltage_battery > 0:
+        state.iha_batarya0 = msg.voltage_battery / 1000.0
+    return True
+
+
+def _on_battery_status(msg, state: Telemetry) -> bool:
+    if msg.voltages[0] < 65535:
+        volts = sum(v for v in msg.voltages if v < 65535) / 1000.0
+        if msg.id == 0:
+            state.iha_batarya0 = volts
+        elif msg.id == 1:
+            state.iha_batarya1 = volts
+    return True
+
+
+DEFAULT_HANDLERS = {
+    mavlink.MAVLINK_MSG_ID_HEARTBEAT:           _on_heartbeat,
+    mavlink.MAVLINK_MSG_ID_GLOBAL_POSITION_INT: _on_global_position_int,
+    mavlink.MAVLINK_MSG_ID_ATTITUDE:            _on_attitude,
+    mavlink.MAVLINK_MSG_ID_GPS_RAW_INT:         _on_gps_raw_int,
+    mavlink.MAVLINK_MSG_ID_VFR_HUD:             _on_vfr_hud,
+    mavlink.MAVLINK_MSG_ID_SYS_STATUS:          _on_sys_status,
+    mavlink.MAVLINK_MSG_ID_BATTERY_STATUS:      _on_battery_status,
+}
+
+
+def msg_name(msg_id: int) -> str:
+    cls = mavlink.mavlink_map.get(msg_id)
+    return cls.msgname if cls is not None else str(msg_id)
+
+
 class TelemetryHandler:
-    def handle_message(self, msg, state: Telemetry) -> bool:
+    """
+    Dispatches MAVLink messages to registered handler functions through a
+    table keyed by message id. Unsubscribed ids are dropped with a single
+    dict lookup. Per-type message counts and handler time are kept for
+    profiling; see stats(). Every state update is also appended to the
+    TelemetryHistory passed to handle_message(), or to self.history.
+    """
+    def __init__(self, handlers=None, history=None):
+        self.history = history
+        self._handlers = {}
+        self._stats = {}  # msg_id -> [count, toplam süre (s)]
+        self.dropped = 0
+        for msg_id, fn in (DEFAULT_HANDLERS if handlers is None else handlers).items():
+            self.register(msg_id, fn)
+
+    def register(self, msg_id: int, fn: Callable[..., bool]):
+        self._handlers[msg_id] = fn
+        self._stats.setdefault(msg_id, [0, 0.0])
+
+    def unregister(self, msg_id: int):
+        self._handlers.pop(msg_id, None)
+
+    def wants(self, msg_id: int) -> bool:
+        return msg_id in self._handlers
+
+    @property
+    def subscribed_ids(self):
+        return frozenset(self._handlers)
+
+    @property
+    def subscribed_types(self):
+        return frozenset(msg_name(i) for i in self._handlers)
+
+    def handle_message(self, msg, state: Telemetry, history=None) -> bool:
         """
         Parses a Mavlink message and updates the Telemetry state.
         Returns True if the state was updated, False otherwise.
         """
-        msg_type = msg.get_type()
-        updated = False
-
-        if msg_type == 'HEARTBEAT':
-            state.heartbeat = True
-            # updated = True 
-
-        elif msg_type == 'GLOBAL_POSITION_INT':
-            state.iha_enlem = msg.lat / 1e7
-            state.iha_boylam = msg.lon / 1e7
-            state.iha_irtifa = msg.relative_alt / 1000.0 # mm -> m
-            updated = True
-
-        elif msg_type == 'ATTITUDE':
-            state.iha_yatis = math.degrees(msg.roll)
-            state.iha_dikilme = math.degrees(msg.pitch)
-            state.iha_yonelme = (math.degrees(msg.yaw) + 360) % 360
-            updated = True
-        
-        elif msg_type == 'GPS_RAW_INT':
-            state.baglanilan_gps_sayisi = msg.satellites_visible
-            updated = True
-
-        elif msg_type == 'VFR_HUD':
-            state.iha_hiz = msg.groundspeed
-            updated = True
-
-        elif msg_type == 'SYS_STATUS':
-            if msg.voltage_battery > 0:
-                 state.iha_batarya0 = msg.voltage_battery / 1000.0
-            updated = True
-        
-        elif msg_type == 'BATTERY_STATUS':
-            if msg.id == 0:
-                if msg.voltages[0] < 65535:
-                   volts = sum(v for v in msg.voltages if v < 65535) / 1000.0
-                   state.iha_batarya0 = volts
-            elif msg.id == 1:
-                if msg.voltages[0] < 65535:
-                   volts = sum(v for v in msg.voltages if v < 65535) / 1000.0
-                   state.iha_batarya1 = volts
-            updated = True
+        msg_id = msg.get_msgId()
+        fn = self._handlers.get(msg_id)
+        if fn is None:
+            self.dropped += 1
+            return False
 
+        t0 = time.perf_counter()
+        updated = fn(msg, state)
+        if updated:
+            if history is None:
+                history = self.history
+            if history is not None:
+                history.record(msg_id, state, time.monotonic())
+        st = self._stats[msg_id]
+        st[0] += 1
+        st[1] += time.perf_counter() - t0
         return updated
+
+    def stats(self) -> dict:
+        """
+        Returns {msg_type: {"count", "total_s", "avg_us"}} for every type
+        that has been handled at least once.
+        """
+        out = {}
+        for msg_id, (count, total) in self._stats.items():
+            if count:
+                out[msg_name(msg_id)] = {
+                    "count": count,
+                    "total_s": total,
+                    "avg_us": total / count * 1e6,
+                }
+        return out
+
+    def reset_stats(self):
+        self.dropped = 0
+        for st in self._stats.values():
+            st[0] = 0
+            st[1] = 0.0
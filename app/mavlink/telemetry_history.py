@@ -0,0 +1,189 @@
+import math
+
+import numpy as np
+from pymavlink import mavutil
+
+mavlink = mavutil.mavlink
+
+# Grup adı -> (kaydı tetikleyen mesaj id'leri, saklanan Telemetry alanları)
+# Aynı gruptaki kolonlar tek bir zaman kolonunu paylaşır.
+HISTORY_GROUPS = {
+    "position": ((mavlink.MAVLINK_MSG_ID_GLOBAL_POSITION_INT,), ("iha_enlem", "iha_boylam", "iha_irtifa")),
+    "attitude": ((mavlink.MAVLINK_MSG_ID_ATTITUDE,), ("iha_yatis", "iha_dikilme", "iha_yonelme")),
+    "gps":      ((mavlink.MAVLINK_MSG_ID_GPS_RAW_INT,), ("baglanilan_gps_sayisi",)),
+    "speed":    ((mavlink.MAVLINK_MSG_ID_VFR_HUD,), ("iha_hiz",)),
+    "battery":  ((mavlink.MAVLINK_MSG_ID_SYS_STATUS, mavlink.MAVLINK_MSG_ID_BATTERY_STATUS),
+                 ("iha_batarya0", "iha_batarya1")),
+}
+
+# 2**17 örnek: 50 Hz'de ~43 dk, 10 Hz'de ~3.6 saat. Grup başına sabit bellek.
+DEFAULT_CAPACITY = 1 << 17
+
+# Dolu halkada başka thread'den okurken en eski bu kadar satır atlanır: okuma
+# sürerken yazar bunların üzerine yazabilir (50 Hz'de ~1.3 s'lik pay)
+READ_MARGIN = 64
+
+
+class RingBuffer:
+    """
+    Fixed-capacity, preallocated ring buffer.
+
+    Every sample is written twice (at i and i + capacity) so the live window
+    is always one contiguous slice of the backing array; view() therefore
+    returns a NumPy view, never a copy. Appends are O(1).
+
+    Once the ring is full, the next append overwrites the oldest sample,
+    which is element 0 of every view handed out before it. A view is only
+    valid until the next append.
+    """
+    def __init__(self, capacity: int, dtype=np.float64):
+        self.capacity = int(capacity)
+        self._data = np.full(2 * self.capacity, np.nan, dtype=dtype)
+        self._head = 0   # bir sonraki yazma indeksi, [0, capacity)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    def append(self, value):
+        i = self._head
+        self._data[i] = value
+        self._data[i + self.capacity] = value
+        self._head = i + 1 if i + 1 < self.capacity else 0
+        if self._count < self.capacity:
+            self._count += 1
+
+    def view(self) -> np.ndarray:
+        """Oldest-to-newest samples as a read-only view, valid until the next append."""
+        start = (self._head - self._count) % self.capacity if self._count else 0
+        return self.window(start, self._count)
+
+    def window(self, start: int, count: int) -> np.ndarray:
+        """Read-only view of `count` samples from ring index `start` on."""
+        v = self._data[start:start + count]
+        v.flags.writeable = False
+        return v
+
+
+class SeriesGroup:
+    """
+    Columns that are sampled together, sharing one monotonic time column.
+
+    The receive thread appends; other threads read. After a row is written
+    to every column, one (head, count, total) tuple is published. Readers
+    take that tuple once and slice all columns from it, so times and values
+    always have the same length and are aligned, without a lock. On a full
+    ring the oldest READ_MARGIN rows are left out, because the writer may
+    overwrite them during the read. Copies are checked afterwards and
+    retried if the writer got further than that.
+    """
+    def __init__(self, name: str, fields, capacity: int = DEFAULT_CAPACITY):
+        self.name = name
+        self.fields = tuple(fields)
+        self.capacity = int(capacity)
+        self.time = RingBuffer(capacity)
+        self.columns = {f: RingBuffer(capacity) for f in self.fields}
+        self._span = (0, 0, 0)      # (head, count, toplam append) - tek atamayla yayınlanır
+
+    def __len__(self):
+        return self._span[1]
+
+    @property
+    def nbytes(self):
+        return self.time.nbytes + sum(c.nbytes for c in self.columns.values())
+
+    def append(self, t: float, state):
+        self.time.append(t)
+        for f, col in self.columns.items():
+            v = getattr(state, f, None)
+            col.append(math.nan if v is None else v)
+        self._span = (self.time._head, self.time._count, self._span[2] + 1)
+
+    def _window(self):
+        """(start, count, total) of the rows that are safe to read now."""
+        head, count, total = self._span
+        margin = min(READ_MARGIN, count - 1) if count == self.capacity else 0
+        count -= max(0, margin)
+        return (head - count) % self.capacity if count else 0, count, total
+
+    def _read(self, fields, t0: float, t1: float, copy: bool):
+        while True:
+            start, count, total = self._window()
+            times = self.time.window(start, count)
+            i0 = int(np.searchsorted(times, t0, side="left"))
+            i1 = int(np.searchsorted(times, t1, side="right"))
+            times = times[i0:i1]
+            values = {f: self.columns[f].window(start, count)[i0:i1] for f in fields}
+            if not copy:
+                return times, values
+            times = times.copy()
+            values = {f: v.copy() for f, v in values.items()}
+            if count < self.capacity - READ_MARGIN or self._span[2] - total < READ_MARGIN:
+                return times, values
+
+    def time_range(self, t0: float, t1: float, copy: bool = True):
+        """
+        Returns (times, {field: values}) for t0 <= t <= t1; the lookup is O(log n).
+        Copies by default, which is safe from any thread. copy=False returns
+        zero-copy views; they stay correct only until READ_MARGIN more rows
+        are appended, so use them right away.
+        """
+        return self._read(self.fields, t0, t1, copy)
+
+    def value_at(self, field: str, t: float):
+        start, count, _ = self._window()
+        times = self.time.window(start, count)
+        i = int(np.searchsorted(times, t, side="right")) - 1
+        if i < 0:
+            return None
+        v = self.columns[field].window(start, count)[i]
+        return None if math.isnan(v) else float(v)
+
+
+class TelemetryHistory:
+    """
+    Bounded, full-rate telemetry history. TelemetryHandler calls record()
+    after each handled message; readers slice by monotonic time.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, groups=None):
+        self.groups = {}
+        self._by_msg_id = {}
+        self._by_field = {}
+        for name, (msg_ids, fields) in (HISTORY_GROUPS if groups is None else groups).items():
+            group = SeriesGroup(name, fields, capacity)
+            self.groups[name] = group
+            for msg_id in msg_ids:
+                self._by_msg_id[msg_id] = group
+            for f in fields:
+                self._by_field.setdefault(f, group)
+
+    @property
+    def nbytes(self):
+        return sum(g.nbytes for g in self.groups.values())
+
+    def record(self, msg_id: int, state, t: float):
+        group = self._by_msg_id.get(msg_id)
+        if group is not None:
+            group.append(t, state)
+
+    def group_for(self, field: str) -> SeriesGroup:
+        try:
+            return self._by_field[field]
+        except KeyError:
+            raise KeyError(f"Geçmişte tutulmayan alan: {field}") from None
+
+    def time_range(self, field: str, t0: float, t1: float, copy: bool = True):
+        """
+        (times, values) for one field between t0 and t1 (monotonic s), with the
+        same copy semantics as SeriesGroup.time_range().
+        """
+        times, values = self.group_for(field)._read((field,), t0, t1, copy)
+        return times, values[field]
+
+    def value_at(self, field: str, t: float):
+        """Last recorded value at or before t, None if there is none."""
+        return self.group_for(field).value_at(field, t)
@@ -0,0 +1,61 @@
+import math
+
+# Bu alanlar değiştiğinde rate limiti beklemeden hemen yayınla. İkisi de HEARTBEAT'ten
+# gelir; iha_kilitlenme worker'da değil, arayüz / sunucu tarafında belirlenir.
+URGENT_FIELDS = ("heartbeat", "iha_otonom")
+
+DEFAULT_UI_RATE_HZ = 25.0
+
+
+class TelemetryPublisher:
+    """
+    Coalesces telemetry updates between the MAVLink receive loop and the GUI.
+
+    The worker calls offer() after every state change. An update is published
+    at most once per 1/rate_hz seconds; anything in between is merged into the
+    next publish. A change in one of the urgent fields is published at once.
+    """
+    def __init__(self, rate_hz: float = DEFAULT_UI_RATE_HZ, urgent_fields=URGENT_FIELDS):
+        self.interval = 1.0 / rate_hz if rate_hz and rate_hz > 0 else 0.0
+        self.urgent_fields = tuple(urgent_fields)
+        self._pending = False
+        self._last_publish = -math.inf
+        self._last_urgent = None
+        self.merged = 0      # ayrı yayınlanmayıp sonrakine katılan güncelleme sayısı
+        self.published = 0
+
+    def _urgent_values(self, state):
+        return tuple(getattr(state, f, None) for f in self.urgent_fields)
+
+    def _mark(self, now, urgent):
+        self._pending = False
+        self._last_publish = now
+        self._last_urgent = urgent
+        self.published += 1
+
+    def offer(self, state, now: float) -> bool:
+        """
+        Registers an update. Returns True if the caller should publish now.
+        """
+        urgent = self._urgent_values(state)
+        if urgent != self._last_urgent or now - self._last_publish >= self.interval:
+            self._mark(now, urgent)
+            return True
+        self._pending = True
+        self.merged += 1
+        return False
+
+    def due(self, state, now: float) -> bool:
+        """
+        Returns True if merged updates are waiting and the interval has elapsed.
+        """
+        if self._pending and now - self._last_publish >= self.interval:
+            self._mark(now, self._urgent_values(state))
+            return True
+        return False
+
+    def time_until_due(self, now: float):
+        """Seconds until the pending update must go out, None if nothing is pending."""
+        if not self._pending:
+            return None
+        return max(0.0, self._last_publish + self.interval - now)
@@ -0,0 +1,121 @@
+import time
+from collections import deque
+from datetime import datetime
+
+from pymavlink import mavutil
+
+mavlink = mavutil.mavlink
+
+SYNC_INTERVAL = 1.0          # s, TIMESYNC isteği aralığı
+FAST_SYNC_INTERVAL = 0.2     # s, bağlantının başında hızlı yakınsama
+FAST_SYNC_COUNT = 5
+FILTER_SAMPLES = 32          # min-filtre penceresi (~30 s)
+SYSTEM_TIME_REQUEST_INTERVAL = 10.0   # s, SYSTEM_TIME gelmiyorsa tekrar iste
+
+
+class TimeSync:
+    """
+    Estimates the offset between the vehicle's boot clock and the GCS
+    monotonic clock with a TIMESYNC exchange, and the vehicle's UTC from
+    SYSTEM_TIME.
+
+    Each TIMESYNC reply gives an RTT and an offset assuming a symmetric
+    path; the estimate is taken from the sample with the smallest RTT in the
+    last FILTER_SAMPLES (queueing delay only ever adds to the RTT, so the
+    fastest exchange is the least biased one).
+
+    Call poll() every loop turn and on_message() for every received message.
+    """
+    def __init__(self, master, target_system: int = 1, target_component: int = 1):
+        self.master = master
+        self.target_system = target_system
+        self.target_component = target_component
+        self._samples = deque(maxlen=FILTER_SAMPLES)   # (rtt_ns, offset_ns)
+        self._sent = deque(maxlen=8)                   # yanıt beklenen ts1 değerleri
+        self._next_sync = 0.0
+        self._syncs_sent = 0
+        self._next_time_request = 0.0
+        self.offset_ns = None        # araç boot saati - GCS monotonic
+        self.rtt_ns = None
+        self.utc_offset_ns = None    # araç UTC - araç boot saati
+
+    @property
+    def synced(self) -> bool:
+        return self.offset_ns is not None
+
+    def poll(self, now: float):
+        if now >= self._next_sync:
+            ts1 = time.monotonic_ns()
+            self._sent.append(ts1)
+            self.master.mav.timesync_send(0, ts1)
+            self._syncs_sent += 1
+            interval = FAST_SYNC_INTERVAL if self._syncs_sent < FAST_SYNC_COUNT else SYNC_INTERVAL
+            self._next_sync = now + interval
+        if self.utc_offset_ns is None and now >= self._next_time_request:
+            self.master.mav.command_long_send(
+                self.target_system, self.target_component,
+                mavlink.MAV_CMD_REQUEST_MESSAGE, 0,
+                mavlink.MAVLINK_MSG_ID_SYSTEM_TIME, 0, 0, 0, 0, 0, 0)
+            self._next_time_request = now + SYSTEM_TIME_REQUEST_INTERVAL
+
+    def time_until_due(self, now: float) -> float:
+        return max(0.0, self._next_sync - now)
+
+    def on_message(self, msg):
+        msg_id = msg.get_msgId()
+        if msg_id == mavlink.MAVLINK_MSG_ID_TIMESYNC:
+            if msg.get_srcSystem() == self.target_system:
+                self._on_timesync(msg)
+        elif msg_id == mavlink.MAVLINK_MSG_ID_SYSTEM_TIME:
+            if msg.get_srcSystem() == self.target_system and msg.time_unix_usec:
+                self.utc_offset_ns = msg.time_unix_usec * 1000 - msg.time_boot_ms * 1_000_000
+
+    def _on_timesync(self, msg):
+        now_ns = time.monotonic_ns()
+        if msg.tc1 == 0:
+            # Araçtan gelen istek: kendi saatimizle yanıtla
+            self.master.mav.timesync_send(now_ns, msg.ts1)
+            return
+        if msg.ts1 not in self._sent:
+            return
+        self._sent.remove(msg.ts1)
+        rtt = now_ns - msg.ts1
+        offset = msg.tc1 - (msg.ts1 + now_ns) // 2
+        self._samples.append((rtt, offset))
+        self.rtt_ns, self.offset_ns = min(self._samples)
+
+    def to_local(self, time_boot_ms: int):
+        """Vehicle boot time -> GCS time.monotonic() seconds, None if not synced."""
+        if self.offset_ns is None or time_boot_ms is None:
+            return None
+        return (time_boot_ms * 1_000_000 - self.offset_ns) / 1e9
+
+    def to_utc(self, time_boot_ms: int):
+        """Vehicle boot time -> UTC unix seconds from SYSTEM_TIME, None if unknown."""
+        if self.utc_offset_ns is None or time_boot_ms is None:
+            return None
+        return (time_boot_ms * 1_000_000 + self.utc_offset_ns) / 1e9
+
+    def report(self) -> dict:
+        return {
+            "synced": self.synced,
+            "offset_ms": self.offset_ns / 1e6 if self.offset_ns is not None else None,
+            "rtt_ms": self.rtt_ns / 1e6 if self.rtt_ns is not None else None,
+            "samples": len(self._samples),
+            "utc": self.utc_offset_ns is not None,
+        }
+
+
+def gps_saati(t):
+    """
+    Competition 'gps_saati' dict from the vehicle's UTC at the time of the
+    sample (snapshot.vehicle_utc), falling back to the GCS clock.
+    """
+    utc = getattr(t, "vehicle_utc", None)
+    now = datetime.fromtimestamp(utc) if utc else datetime.now()
+    return {
+        "saat": now.hour,
+        "dakika": now.minute,
+        "saniye": now.second,
+        "milisaniye": int(now.microsecond / 1000)
+    }
@@ -0,0 +1,434 @@
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from array import array
+
+import numpy as np
+from pymavlink import mavutil
+
+from mavlink.framing import frame_length, frame_header
+
+mavlink = mavutil.mavlink
+
+# tlog formatı: her frame'in önünde 8 byte big-endian unix zamanı (µs)
+_TS = struct.Struct(">Q")
+TS_LEN = _TS.size
+
+WRITER_QUEUE_SIZE = 20000
+
+
+class TlogWriter:
+    """
+    Appends raw MAVLink frames to a tlog file from a background thread so the
+    receive loop never blocks on disk. write() never blocks; if the queue is
+    full the frame is dropped and counted in `dropped`.
+    """
+    def __init__(self, path, queue_size: int = WRITER_QUEUE_SIZE):
+        self.path = str(path)
+        self._q = queue.Queue(maxsize=queue_size)
+        self._f = open(self.path, "ab", buffering=1 << 16)
+        self.written = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="TlogWriter", daemon=True)
+        self._thread.start()
+
+    def write(self, frame: bytes, t_us: int = None):
+        if t_us is None:
+            t_us = int(time.time() * 1.0e6) & ~3
+        try:
+            self._q.put_nowait((t_us, frame))
+        except queue.Full:
+            self.dropped += 1
+
+    def _on_frame(self, offset: int, t_us: int, frame: bytes):
+        """Hook for subclasses that track frame offsets (e.g. indexing)."""
+        pass
+
+    def _run(self):
+        f = self._f
+        while True:
+            item = self._q.get()
+            if item is None:
+                break
+            t_us, frame = item
+            offset = f.tell()
+            f.write(_TS.pack(t_us))
+            f.write(frame)
+            self._on_frame(offset, t_us, frame)
+            self.written += 1
+        f.flush()
+
+    def close(self):
+        self._q.put(None)
+        self._thread.join(timeout=5)
+        try:
+            self._f.close()
+        except OSError:
+            pass
+
+
+class TlogReader:
+    """
+    Memory-mapped tlog reader. frames() walks the file without decoding and
+    yields (t_us, offset, frame) where frame is a memoryview into the map.
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        self._f = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Boş dosya eşlenemez
+            self._map = b""
+        self._view = memoryview(self._map)
+        self.size = len(self._map)
+
+    def frame_at(self, offset: int):
+        """(t_us, frame, next_offset) for a record at a known offset, None at EOF."""
+        buf = self._view
+        start = offset + TS_LEN
+        flen = frame_length(buf, start)
+        if flen is None or start + flen > self.size:
+            return None
+        t_us = _TS.unpack_from(buf, offset)[0]
+        return t_us, buf[start:start + flen], start + flen
+
+    def frames(self, start_offset: int = 0):
+        off = start_offset
+        size = self.size
+        while off + TS_LEN < size:
+            rec = self.frame_at(off)
+            if rec is None:
+                # Bozuk kayıt: bir byte ilerleyip yeniden senkronize ol
+                off += 1
+                continue
+            t_us, frame, nxt = rec
+            yield t_us, off, frame
+            off = nxt
+
+    def close(self):
+        try:
+            self._view.release()
+            if isinstance(self._map, mmap.mmap):
+                self._map.close()
+        except BufferError:
+            # Dışarıda hâlâ frame view'ları var; GC kapatır
+            pass
+        self._f.close()
+
+
+INDEX_DTYPE = np.dtype([("t_us", "<u8"), ("offset", "<u8"), ("msg_id", "<u4")])
+
+
+def index_path(tlog_path) -> str:
+    return str(tlog_path) + ".idx"
+
+
+class TlogIndex:
+    """
+    Time / message-type -> byte-offset index of a tlog, stored next to it as
+    "<log>.idx" (a .npy array of INDEX_DTYPE, memory-mapped on load).
+
+    Built in one streaming pass over the log, or on the fly while recording
+    (IndexingTlogWriter). Time seeks are O(log n) via searchsorted.
+    """
+    def __init__(self, entries: np.ndarray):
+        self.entries = entries
+        # tlog zamanları nadiren geri gidebilir; arama için monoton zarf kullan
+        t = entries["t_us"]
+        self._search_t = np.maximum.accumulate(t) if len(t) else t
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def start_us(self):
+        return int(self.entries["t_us"][0]) if len(self) else 0
+
+    @property
+    def end_us(self):
+        return int(self._search_t[-1]) if len(self) else 0
+
+    @classmethod
+    def from_arrays(cls, t_us, offsets, msg_ids):
+        entries = np.empty(len(t_us), dtype=INDEX_DTYPE)
+        entries["t_us"] = np.frombuffer(t_us, dtype=np.uint64) if len(t_us) else []
+        entries["offset"] = np.frombuffer(offsets, dtype=np.uint64) if len(offsets) else []
+        entries["msg_id"] = np.frombuffer(msg_ids, dtype=np.uint32) if len(msg_ids) else []
+        return cls(entries)
+
+    @classmethod
+    def build(cls, reader: "TlogReader") -> "TlogIndex":
+        t_us, offsets, msg_ids = array("Q"), array("Q"), array("I")
+        for t, off, frame in reader.frames():
+            t_us.append(t)
+            offsets.append(off)
+            msg_ids.append(frame_header(frame, 0)[3])
+        return cls.from_arrays(t_us, offsets, msg_ids)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            np.save(f, self.entries)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            entries = np.load(path, mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        if entries.dtype != INDEX_DTYPE:
+            return None
+        return cls(entries)
+
+    def covers(self, reader: "TlogReader") -> bool:
+        """
+        True if the index spans the whole log: it starts at the first record,
+        ends exactly at the end of the file, and a few sampled entries are
+        followed by the next indexed record (or by corrupt bytes frames()
+        skipped). An index of only the frames appended in one session fails
+        the start check.
+        """
+        if not len(self):
+            return reader.size == 0
+        offsets = self.entries["offset"]
+        first = next(reader.frames(), None)
+        if first is None or int(offsets[0]) != first[1]:
+            return False
+        rec = reader.frame_at(int(offsets[-1]))
+        if rec is None or rec[2] != reader.size:
+            return False
+        n = len(self)
+        for p in {0, n // 4, n // 2, (3 * n) // 4, n - 2}:
+            if 0 <= p < n - 1:
+                rec = reader.frame_at(int(offsets[p]))
+                nxt = int(offsets[p + 1])
+                if rec is None or nxt < rec[2]:
+                    return False
+                if nxt > rec[2] and reader.frame_at(rec[2]) is not None:
+                    return False    # arada indekslenmemiş bir kayıt var
+        return True
+
+    @classmethod
+    def load_or_build(cls, reader: "TlogReader") -> "TlogIndex":
+        path = index_path(reader.path)
+        index = cls.load(path) if os.path.exists(path) else None
+        if index is None or not index.covers(reader):
+            index = cls.build(reader)
+            try:
+                index.save(path)
+            except OSError:
+                pass  # salt okunur dizin: indeks bellekte kalır
+        return index
+
+    def position_for_time(self, t_us: int) -> int:
+        return int(np.searchsorted(self._search_t, t_us, side="left"))
+
+    def positions(self, msg_ids=None, start: int = 0) -> np.ndarray:
+        """Entry positions from `start` on, optionally restricted to msg_ids."""
+        if msg_ids is None:
+            return np.arange(start, len(self))
+        ids = np.fromiter(msg_ids, dtype=np.uint32)
+        mask = np.isin(self.entries["msg_id"][start:], ids)
+        return np.flatnonzero(mask) + start
+
+
+class IndexingTlogWriter(TlogWriter):
+    """
+    TlogWriter that also writes "<log>.idx" on close, so no rescan is needed.
+    When appending to an existing log, its frames are indexed first so the
+    saved index covers the whole file, not just this session.
+    """
+    def __init__(self, path, queue_size: int = WRITER_QUEUE_SIZE):
+        self._t_us, self._offsets, self._msg_ids = array("Q"), array("Q"), array("I")
+        if os.path.exists(path) and os.path.getsize(path):
+            reader = TlogReader(path)
+            try:
+                existing = TlogIndex.load_or_build(reader).entries
+                self._t_us.extend(int(t) for t in existing["t_us"])
+                self._offsets.extend(int(o) for o in existing["offset"])
+                self._msg_ids.extend(int(m) for m in existing["msg_id"])
+                del existing
+            finally:
+                reader.close()
+        super().__init__(path, queue_size)
+
+    def _on_frame(self, offset, t_us, frame):
+        self._t_us.append(t_us)
+        self._offsets.append(offset)
+        self._msg_ids.append(frame_header(frame, 0)[3])
+
+    def close(self):
+        super().close()
+        try:
+            TlogIndex.from_arrays(self._t_us, self._offsets, self._msg_ids).save(index_path(self.path))
+        except OSError:
+            pass
+
+
+class _NullFile:
+    def write(self, buf):
+        return len(buf)
+
+
+class ReplayConnection:
+    """
+    Stands in for a mavutil connection and feeds a recorded tlog through the
+    normal MavlinkWorker / TelemetryHandler path.
+
+    speed: 1.0 = real time, N = N times faster, 0 = as fast as possible.
+    msg_ids: if given, only these message ids are decoded and returned.
+    Commands sent through `mav` are discarded.
+
+    The log's index is loaded (or built once and saved) so seek() is
+    O(log n) and filtered replays skip unwanted frames without decoding.
+    """
+    fd = None
+
+    def __init__(self, path, speed: float = 1.0, msg_ids=None, use_index: bool = True):
+        self.reader = TlogReader(path)
+        self.index = TlogIndex.load_or_build(self.reader) if use_index else None
+        self.msg_ids = frozenset(msg_ids) if msg_ids else None
+        self.speed = max(0.0, float(speed))
+        self.mav = mavlink.MAVLink(_NullFile(), srcSystem=255, srcComponent=0)
+        self._decoder = mavlink.MAVLink(None)
+        self._decoder.robust_parsing = True
+        self._frames = self._iter_frames(0)
+        self._next = None
+        self._log_t0 = None
+        self._wall_t0 = None
+        self.eof = False
+        self.target_system = 1
+        self.target_component = 1
+        self.messages_replayed = 0
+
+    def _iter_frames(self, pos: int):
+        if self.index is not None:
+            offsets = self.index.entries["offset"]
+            for p in self.index.positions(self.msg_ids, pos):
+                rec = self.reader.frame_at(int(offsets[p]))
+                if rec is not None:
+                    yield rec[0], int(offsets[p]), rec[1]
+            return
+        ids = self.msg_ids
+        for t_us, off, frame in self.reader.frames():
+            if ids is None or frame_header(frame, 0)[3] in ids:
+                yield t_us, off, frame
+
+    def seek(self, seconds: float):
+        """
+        Jumps to `seconds` from the start of the log; playback continues at
+        the same speed from there. Needs the index.
+        """
+        if self.index is None or not len(self.index):
+            return
+        target = self.index.start_us + int(max(0.0, seconds) * 1e6)
+        pos = self.index.position_for_time(target)
+        self._frames.close()
+        self._frames = self._iter_frames(pos)
+        self._next = None
+        self.eof = False
+        self._log_t0 = None
+
+    @property
+    def duration(self) -> float:
+        if self.index is None or not len(self.index):
+            return 0.0
+        return (self.index.end_us - self.index.start_us) * 1e-6
+
+    def _peek(self):
+        if self._next is None and not self.eof:
+            self._next = next(self._frames, None)
+            if self._next is None:
+                self.eof = True
+        return self._next
+
+    def _restart_clock(self, t_us):
+        self._log_t0 = t_us
+        self._wall_t0 = time.monotonic()
+
+    def _due_in(self, t_us):
+        if self.speed <= 0:
+            return 0.0
+        if self._log_t0 is None:
+            self._restart_clock(t_us)
+        due = self._wall_t0 + (t_us - self._log_t0) * 1e-6 / self.speed
+        return due - time.monotonic()
+
+    def _decode(self, t_us, frame):
+        try:
+            msg = self._decoder.decode(bytearray(frame))
+        except mavlink.MAVError:
+            return None
+        msg._timestamp = t_us * 1e-6
+        return msg
+
+    def recv_msg(self):
+        """Next message whose replay time has come, None otherwise."""
+        while True:
+            rec = self._peek()
+            if rec is None:
+                return None
+            t_us, _, frame = rec
+            if self._due_in(t_us) > 0:
+                return None
+            self._next = None
+            msg = self._decode(t_us, frame)
+            if msg is None:
+                continue
+            self.messages_replayed += 1
+            if msg.get_type() == "HEARTBEAT" and msg.type != mavlink.MAV_TYPE_GCS:
+                self.target_system = msg.get_srcSystem()
+                self.target_component = msg.get_srcComponent()
+            return msg
+
+    def recv_match(self, condition=None, type=None, blocking=False, timeout=None):
+        if type is not None and not isinstance(type, (list, set, tuple)):
+            type = [type]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            rec = self._peek()
+            if rec is None:
+                return None
+            wait = self._due_in(rec[0])
+            if wait > 0:
+                if not blocking:
+                    return None
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        return None
+                time.sleep(min(wait, 0.05))
+                continue
+            msg = self.recv_msg()
+            if msg is None:
+                continue  # EOF ya da henüz zamanı gelmedi: _peek/_due_in tekrar bakar
+            if type is not None and msg.get_type() not in type:
+                continue
+            return msg
+
+    def wait_heartbeat(self, blocking=True, timeout=None):
+        return self.recv_match(type="HEARTBEAT", blocking=blocking, timeout=timeout)
+
+    def write(self, buf):
+        # Kayıttaki araca yazılamaz; router'dan gelen frame'ler atılır
+        pass
+
+    def close(self):
+        self._next = None
+        self._frames.close()
+        self.reader.close()
+
+
+def parse_replay_string(conn_str: str):
+    """
+    "replay:<speed>:<path>" -> (path, speed). Path may contain ':'.
+    """
+    _, speed, path = conn_str.split(":", 2)
+    try:
+        speed = float(speed)
+    except ValueError:
+        speed = 1.0
+    return path, speed
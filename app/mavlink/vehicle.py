@@ -0,0 +1,42 @@
+import time
+
+from mavlink.telemetry_handler import Telemetry
+from mavlink.telemetry_history import TelemetryHistory, DEFAULT_CAPACITY
+from mavlink.telemetry_publisher import TelemetryPublisher, DEFAULT_UI_RATE_HZ
+
+# Birincil araç dışındakiler için daha küçük geçmiş (grup başına ~8 dk @ 50 Hz)
+SECONDARY_HISTORY_CAPACITY = 1 << 15
+
+
+class Vehicle:
+    """
+    Per (sysid, compid) receive-side state: the worker-owned Telemetry, its
+    publisher, history and the last published snapshot.
+    """
+    def __init__(self, sysid: int, compid: int, ui_rate_hz: float = DEFAULT_UI_RATE_HZ,
+                 history_capacity: int = DEFAULT_CAPACITY):
+        self.sysid = sysid
+        self.compid = compid
+        self.state = Telemetry()
+        self.publisher = TelemetryPublisher(rate_hz=ui_rate_hz)
+        self.history = TelemetryHistory(capacity=history_capacity)
+        self.latest_snapshot = None
+        self.last_rx = 0.0
+        self._seq = 0
+
+    @property
+    def key(self):
+        return self.sysid, self.compid
+
+    def snapshot(self, clock=None):
+        """clock: TimeSync of the link, used to tag the vehicle time and age."""
+        self._seq += 1
+        vehicle_utc = age = None
+        if clock is not None and self.state.time_boot_ms is not None:
+            vehicle_utc = clock.to_utc(self.state.time_boot_ms)
+            sampled = clock.to_local(self.state.time_boot_ms)
+            if sampled is not None:
+                age = time.monotonic() - sampled
+        snap = self.state.snapshot(self._seq, self.last_rx, vehicle_utc, age)
+        self.latest_snapshot = snap
+        return snap
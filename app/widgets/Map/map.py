@@ -100,33 +100,43 @@ class MapWidget(QFrame):
         js = f"window.setCenterZoom({lat_js}, {lon_js}, {zoom_js});"
         self._view.page().runJavaScript(js)
 
-    def update_vehicle(self, lat: float, lon: float, heading: float = None):
-        """Araç marker'ını ekle/güncelle ve opsiyonel heading çizgisi çiz."""
-        # Son konumu hafızada tut
-        self._last_lat = lat
-        self._last_lon = lon
+    def update_vehicle(self, lat: float, lon: float, heading: float = None,
+                       marker_id: str = "vehicle", opacity: float = None):
+        """
+        Araç marker'ını ekle/güncelle ve opsiyonel heading çizgisi çiz.
+        marker_id varsayılan ("vehicle") birincil araçtır; diğer araçlar kendi
+        id'leriyle aynı ikonu kullanır ama ortalama/son konuma etki etmez.
+        """
+        primary = marker_id == "vehicle"
+        if primary:
+            # Son konumu hafızada tut
+            self._last_lat = lat
+            self._last_lon = lon
         lat_js = "null" if lat is None else str(lat)
         lon_js = "null" if lon is None else str(lon)
         icon_part = f"'{self._vehicle_icon_url}'" if self._vehicle_icon_url else "null"
         heading_part = "null" if heading is None else str(heading)
+        opacity_part = "null" if opacity is None else str(float(opacity))
 
         js = (
-            "window.addOrUpdateMarker('vehicle', "
+            f"window.addOrUpdateMarker('{marker_id}', "
             + lat_js + ", " + lon_js + ", "
-            + "{ iconUrl: " + icon_part + ", iconSize: [44,44], heading: " + heading_part + " });"
+            + "{ iconUrl: " + icon_part + ", iconSize: [44,44], heading: " + heading_part
+            + ", opacity: " + opacity_part + " });"
         )
         self._view.page().runJavaScript(js)
 
         if heading is not None and lat is not None and lon is not None:
             js_line = (
-                "window.drawHeadingLine('vehicleHeading', "
+                f"window.drawHeadingLine('{marker_id}Heading', "
                 + str(lat) + ", " + str(lon) + ", " + str(heading) + ", 600);"
             )
             self._view.page().runJavaScript(js_line)
 
         # İlk veri geldiğinde bir kez otomatik merkez ve zoom
         if (
-            self._auto_center_enabled
+            primary
+            and self._auto_center_enabled
             and not self._did_initial_center
             and lat is not None and lon is not None
         ):
@@ -183,6 +193,11 @@ class MapWidget(QFrame):
             )
              self._view.page().runJavaScript(js_line)
 
+    def clear_markers(self, prefix: str):
+        """Id'si prefix ile başlayan marker'ları kaldırır."""
+        safe = prefix.replace("\\", "\\\\").replace("'", "\\'")
+        self._view.page().runJavaScript(f"window.clearMarkers('{safe}');")
+
     def fit_to_markers(self):
         self._view.page().runJavaScript("window.fitToMarkers();")
 
@@ -1,10 +1,13 @@
 
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
-    QComboBox, QStackedWidget, QGroupBox, QMessageBox, QFormLayout
+    QComboBox, QStackedWidget, QGroupBox, QMessageBox, QFormLayout,
+    QCheckBox, QFileDialog
 )
 from PyQt5.QtCore import Qt
 from config.settings_manager import SettingsManager
+from mavlink.stream_rates import PROFILES
+from mavlink.router import parse_output_list, split_output_spec
 
 class ConnectionDialog(QDialog):
     def __init__(self, parent=None):
@@ -25,7 +28,7 @@ class ConnectionDialog(QDialog):
         type_layout = QHBoxLayout()
         type_layout.addWidget(QLabel("Bağlantı Tipi:"))
         self.conn_type_combo = QComboBox()
-        self.conn_type_combo.addItems(["UDP", "Serial"])
+        self.conn_type_combo.addItems(["UDP", "Serial", "Replay"])
         type_layout.addWidget(self.conn_type_combo)
         plane_layout.addLayout(type_layout)
 
@@ -59,7 +62,59 @@ class ConnectionDialog(QDialog):
         
         self.plane_stack.addWidget(w_serial)
 
+        # Page 3: Replay (.tlog)
+        page_replay = QFormLayout()
+        file_row = QHBoxLayout()
+        self.replay_file_input = QLineEdit()
+        btn_browse = QPushButton("...")
+        btn_browse.setFixedWidth(32)
+        btn_browse.clicked.connect(self.on_browse_replay)
+        file_row.addWidget(self.replay_file_input)
+        file_row.addWidget(btn_browse)
+        self.replay_speed_input = QLineEdit()
+        self.replay_speed_input.setToolTip("1 = gerçek zaman, N = N kat hızlı, 0 = olabildiğince hızlı")
+        page_replay.addRow("Log Dosyası:", file_row)
+        page_replay.addRow("Hız (x):", self.replay_speed_input)
+
+        w_replay = QGroupBox("Replay Detayları")
+        w_replay.setLayout(page_replay)
+
+        self.plane_stack.addWidget(w_replay)
+
         plane_layout.addWidget(self.plane_stack)
+
+        # Yedek link: ikinci bir telsiz/köprüden aynı anda okunur
+        secondary_layout = QHBoxLayout()
+        secondary_layout.addWidget(QLabel("Yedek Link:"))
+        self.secondary_link_input = QLineEdit()
+        self.secondary_link_input.setPlaceholderText("/dev/ttyUSB0:57600 veya udpin:0.0.0.0:14551")
+        secondary_layout.addWidget(self.secondary_link_input)
+        plane_layout.addLayout(secondary_layout)
+
+        self.record_check = QCheckBox("Ham MAVLink akışını kaydet (.tlog)")
+        plane_layout.addWidget(self.record_check)
+
+        self.ingest_process_check = QCheckBox("MAVLink'i ayrı süreçte işle")
+        self.ingest_process_check.setToolTip("Çözümleme GUI'den ayrı bir süreçte yapılır, telemetri paylaşılan bellekten okunur")
+        plane_layout.addWidget(self.ingest_process_check)
+
+        # Mesaj hızı profili (SET_MESSAGE_INTERVAL)
+        profile_layout = QHBoxLayout()
+        profile_layout.addWidget(QLabel("Akış Profili:"))
+        self.stream_profile_combo = QComboBox()
+        self.stream_profile_combo.addItem("Değiştirme", "")
+        for name in PROFILES:
+            self.stream_profile_combo.addItem(name, name)
+        profile_layout.addWidget(self.stream_profile_combo)
+        plane_layout.addLayout(profile_layout)
+
+        # Router: ham akışı diğer bilgisayarlara (anten takip, yedek YKİ) dağıt
+        router_layout = QHBoxLayout()
+        router_layout.addWidget(QLabel("Router Çıkışları:"))
+        self.router_outputs_input = QLineEdit()
+        self.router_outputs_input.setPlaceholderText("udp:192.168.1.20:14550, tcpin:5760")
+        router_layout.addWidget(self.router_outputs_input)
+        plane_layout.addLayout(router_layout)
         layout.addWidget(plane_group)
 
         # --- Camera Connection Section ---
@@ -140,17 +195,36 @@ class ConnectionDialog(QDialog):
              QMessageBox.warning(self, "Hata", "Kullanıcı adı en az 3 karakter olmalı.")
              return False
         
-        new_settings = {
+        if current_type == "replay" and not self.replay_file_input.text().strip():
+             QMessageBox.warning(self, "Hata", "Replay için bir .tlog dosyası seçin.")
+             return False
+
+        for spec in parse_output_list(self.router_outputs_input.text()):
+            try:
+                split_output_spec(spec)
+            except ValueError as e:
+                QMessageBox.warning(self, "Hata", str(e))
+                return False
+
+        new_settings = dict(self.settings)
+        new_settings.update({
             "plane_connection_type": current_type,
             "plane_address": self.tcp_addr_input.text().strip(),
             "plane_port": self.tcp_port_input.text().strip(),
             "plane_serial_port": self.serial_port_input.text().strip(),
             "plane_baud": self.serial_baud_input.text().strip(),
+            "secondary_link": self.secondary_link_input.text().strip(),
+            "replay_file": self.replay_file_input.text().strip(),
+            "replay_speed": self.replay_speed_input.text().strip(),
+            "record_tlog": self.record_check.isChecked(),
+            "ingest_process": self.ingest_process_check.isChecked(),
+            "stream_profile": self.stream_profile_combo.currentData(),
+            "router_outputs": self.router_outputs_input.text().strip(),
             "camera_port": self.cam_port_input.text().strip(),
             "server_address": self.server_url_input.text().strip(),
             "server_username": self.server_user_input.text().strip(),
             "server_password": self.server_pass_input.text().strip()
-        }
+        })
         
         return SettingsManager.save_settings(new_settings)
 
@@ -161,6 +235,13 @@ class ConnectionDialog(QDialog):
     def on_type_changed(self, index):
         self.plane_stack.setCurrentIndex(index)
 
+    def on_browse_replay(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Log Dosyası Seç", self.replay_file_input.text(),
+            "MAVLink Telemetri Logu (*.tlog);;Tüm Dosyalar (*)")
+        if path:
+            self.replay_file_input.setText(path)
+
     def load_to_ui(self):
         s = self.settings
         
@@ -168,6 +249,8 @@ class ConnectionDialog(QDialog):
         ctype = s.get("plane_connection_type", "udp")
         if ctype.lower() == "serial":
             self.conn_type_combo.setCurrentIndex(1)
+        elif ctype.lower() == "replay":
+            self.conn_type_combo.setCurrentIndex(2)
         else:
             self.conn_type_combo.setCurrentIndex(0)
             
@@ -175,6 +258,14 @@ class ConnectionDialog(QDialog):
         self.tcp_port_input.setText(str(s.get("plane_port", "14550")))
         self.serial_port_input.setText(s.get("plane_serial_port", "/dev/ttyUSB0"))
         self.serial_baud_input.setText(str(s.get("plane_baud", "57600")))
+        self.secondary_link_input.setText(s.get("secondary_link", ""))
+        self.replay_file_input.setText(s.get("replay_file", ""))
+        self.replay_speed_input.setText(str(s.get("replay_speed", "1")))
+        self.record_check.setChecked(bool(s.get("record_tlog", False)))
+        self.ingest_process_check.setChecked(bool(s.get("ingest_process", False)))
+        idx = self.stream_profile_combo.findData(s.get("stream_profile", "") or "")
+        self.stream_profile_combo.setCurrentIndex(max(0, idx))
+        self.router_outputs_input.setText(s.get("router_outputs", ""))
         
         # Camera
         self.cam_port_input.setText(str(s.get("camera_port", "5000")))
@@ -25,6 +25,11 @@ class ControlsPanel(QWidget):
         self.missionBtn.setObjectName("missionBtn")
         self.missionBtn.setFixedHeight(32)
 
+        # Rota (waypoint dosyasını araca yükle)
+        self.routeBtn = QPushButton("Rota")
+        self.routeBtn.setObjectName("routeBtn")
+        self.routeBtn.setFixedHeight(32)
+
         # QR Noktası
         self.qrBtn = QPushButton("QR")
         self.qrBtn.setObjectName("qrBtn")
@@ -40,6 +45,7 @@ class ControlsPanel(QWidget):
         lay.addWidget(self.centerBtn)
         lay.addWidget(self.regionBtn)
         lay.addWidget(self.missionBtn)
+        lay.addWidget(self.routeBtn)
         lay.addWidget(self.qrBtn)
         lay.addWidget(self.preCheckBtn)
 
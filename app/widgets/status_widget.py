@@ -20,10 +20,15 @@ class ConnectionStatusWidget(QWidget):
         self.plane_lbl = self._create_indicator("Uçak: Bağlı Değil", self.color_gray)
         self.cam_lbl = self._create_indicator("Kamera: Kapalı", self.color_gray)
         self.server_lbl = self._create_indicator("Sunucu: Beklemede", self.color_gray)
+        self.link_lbl = self._create_indicator("Link: -", self.color_gray)
 
         self.layout.addWidget(self.plane_lbl)
         self.layout.addWidget(self.cam_lbl)
         self.layout.addWidget(self.server_lbl)
+        self.layout.addWidget(self.link_lbl)
+
+        self._server_rate_line = ""
+        self._server_endpoint_lines = []
 
     def _create_indicator(self, text, initial_style):
         lbl = QLabel(text)
@@ -74,3 +79,87 @@ class ConnectionStatusWidget(QWidget):
             txt = f"Sunucu: Hata"
             if code: txt += f" ({code})"
             self.server_lbl.setText(txt)
+
+    def set_server_stats(self, stats):
+        """ServerWorker.endpoint_stats: uç nokta başına gecikme/hata, tooltip'te."""
+        lines = []
+        for name, s in (stats or {}).items():
+            if "avg_ms" not in s:
+                continue
+            line = (f"{name:<20} {s['requests']:>5} istek  ort {s['avg_ms']:.0f} ms  "
+                    f"p95 {s['p95_ms']:.0f} ms  maks {s['max_ms']:.0f} ms")
+            if s["errors"]:
+                line += f"  hata {s['errors']} (zaman aşımı {s['timeouts']})"
+            lines.append(line)
+        self._server_endpoint_lines = lines
+        self._update_server_tooltip()
+
+    def set_server_rate(self, rate):
+        """ServerWorker.telemetry_rate: gerçekleşen telemetri hızı ve zamanlama sapması, tooltip'in ilk satırı."""
+        if not rate:
+            self._server_rate_line = ""
+        else:
+            self._server_rate_line = (f"Telemetri {rate['achieved_hz']:.2f}/{rate['target_hz']:.0f} Hz  "
+                                      f"sapma p95 {rate['jitter_p95_ms']:.0f} ms  maks {rate['jitter_max_ms']:.0f} ms  "
+                                      f"kaçırılan {rate['missed']}  meşgul {rate['busy']}")
+        self._update_server_tooltip()
+
+    def _update_server_tooltip(self):
+        lines = [self._server_rate_line] if self._server_rate_line else []
+        self.server_lbl.setToolTip("\n".join(lines + self._server_endpoint_lines))
+
+    def set_link_stats(self, stats):
+        """
+        MavlinkWorker.link_stats (1 Hz): kayıp, mesaj/s, kB/s, RSSI ve
+        heartbeat yaşı. Ayrıntılar (tip başına hızlar, bileşen başına kayıp)
+        tooltip'te.
+        """
+        if not stats:
+            self.link_lbl.setStyleSheet(self.style_base + self.color_gray)
+            self.link_lbl.setText("Link: -")
+            self.link_lbl.setToolTip("")
+            return
+
+        loss = stats["loss_pct"]
+        hb_age = stats.get("heartbeat_age")
+        parts = [f"Kayıp %{loss:.1f}",
+                 f"{stats['msgs_per_sec']:.0f} msg/s",
+                 f"{stats['bytes_per_sec'] / 1024:.1f} kB/s"]
+        radio = stats.get("radio")
+        if radio:
+            parts.append(f"RSSI {radio['rssi']}/{radio['remrssi']}")
+        if hb_age is not None:
+            parts.append(f"HB {hb_age:.1f}s")
+        sync = stats.get("timesync")
+        if sync and sync["rtt_ms"] is not None:
+            parts.append(f"RTT {sync['rtt_ms']:.0f} ms")
+        links = stats.get("links") or {}
+        active = [name for name, l in links.items() if l["active"]]
+        if active:
+            alive = sum(1 for l in links.values() if l["alive"])
+            parts.append(f"{active[0]} ({alive}/{len(links)})")
+        self.link_lbl.setText("Link: " + " | ".join(parts))
+
+        if hb_age is None or hb_age > 5.0 or loss > 10.0:
+            style = self.color_red
+        elif hb_age > 2.0 or loss > 2.0:
+            style = self.color_yellow
+        else:
+            style = self.color_green
+        self.link_lbl.setStyleSheet(self.style_base + style)
+
+        lines = []
+        for name, l in links.items():
+            mark = "*" if l["active"] else ("-" if l["alive"] else "x")
+            lines.append(f"{mark} {name}  kayıp %{l['loss_pct']:.1f}  gecikme {l['lag_ms']:.0f} ms  "
+                         f"ilk {l['first']}  kopya {l['duplicates']}")
+        for (sysid, compid), c in stats["components"].items():
+            lines.append(f"{sysid}:{compid}  kayıp %{c['loss_pct']:.1f} ({c['lost']}/{c['received'] + c['lost']})")
+        if radio:
+            lines.append(f"Gürültü {radio['noise']}/{radio['remnoise']}  rxerr {radio['rxerrors']}  txbuf %{radio['txbuf']}")
+        reconnects = stats.get("reconnects")
+        if reconnects and reconnects["count"]:
+            lines.append(f"Yeniden bağlanma {reconnects['count']}  son {reconnects['last_s']:.1f} s")
+        for mtype, t in stats["types"].items():
+            lines.append(f"{mtype:<22} {t['msgs_per_sec']:6.1f} msg/s  {t['bytes_per_sec']:7.0f} B/s")
+        self.link_lbl.setToolTip("\n".join(lines))
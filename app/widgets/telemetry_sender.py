@@ -8,6 +8,8 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import QTimer, pyqtSignal, QThread, Qt
 
+from mavlink.time_sync import gps_saati
+
 # Arka planda request atacak thread
 class SenderThread(QThread):
     response_signal = pyqtSignal(bool, str, str, object) # success, status_text, detail, json_data
@@ -162,14 +164,8 @@ class TelemetrySenderDialog(QDialog):
         else:
             pct = 0
             
-        # Zaman objesi
-        now = datetime.datetime.now()
-        gps_time = {
-            "saat": now.hour,
-            "dakika": now.minute,
-            "saniye": now.second,
-            "milisaniye": int(now.microsecond / 1000)
-        }
+        # Zaman objesi: örneğin araçtaki zamanı, senkron yoksa sistem saati
+        gps_time = gps_saati(t)
         
         payload = {
             "takim_numarasi": takim_numarasi,
@@ -0,0 +1,91 @@
+import asyncio
+import math
+import time
+from collections import deque
+
+RATE_WINDOW = 10.0      # s, gerçekleşen Hz bu pencerede hesaplanır
+JITTER_SAMPLES = 200    # son N gönderimin zamanlama sapması
+
+
+class FixedRateScheduler:
+    """
+    Fixed-rate tick source on absolute deadlines (start + k * period), so a
+    slow tick never shifts the ones after it.
+
+    wait() sleeps until the next slot. If the loop is more than one period
+    late, the missed slots are counted and skipped instead of being sent in
+    a burst. begin()/end() bracket each request. A tick is skipped when
+    max_in_flight requests are still open.
+    """
+    def __init__(self, period: float, max_in_flight: int = 2):
+        self.period = period
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._start = None
+        self._tick = 0
+        self.sent = 0           # başlatılan istek
+        self.completed = 0
+        self.missed = 0         # geride kalındığı için atlanan slot
+        self.busy = 0           # max_in_flight dolu olduğu için atlanan slot
+        self._jitter = deque(maxlen=JITTER_SAMPLES)     # s, gerçek başlangıç - slot zamanı
+        self._sends = deque()                           # RATE_WINDOW içindeki başlangıç zamanları
+
+    @property
+    def hz(self) -> float:
+        return 1.0 / self.period
+
+    def next_deadline(self, now: float) -> float:
+        if self._start is None:
+            self._start = now
+        deadline = self._start + self._tick * self.period
+        if now - deadline >= self.period:
+            # Birden fazla slot kaçtı: hepsini sırayla göndermek yerine atla
+            skipped = int((now - deadline) // self.period)
+            self.missed += skipped
+            self._tick += skipped
+            deadline = self._start + self._tick * self.period
+        return deadline
+
+    async def wait(self) -> float:
+        """Sleeps until the next slot; returns its deadline."""
+        deadline = self.next_deadline(time.monotonic())
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._tick += 1
+        return deadline
+
+    def begin(self, deadline: float) -> bool:
+        """Claims an in-flight slot for the tick at `deadline`; False if the tick must be skipped."""
+        if self.in_flight >= self.max_in_flight:
+            self.busy += 1
+            return False
+        now = time.monotonic()
+        self.in_flight += 1
+        self.sent += 1
+        self._jitter.append(now - deadline)
+        self._sends.append(now)
+        return True
+
+    def end(self):
+        self.in_flight -= 1
+        self.completed += 1
+
+    def report(self, now: float = None) -> dict:
+        now = time.monotonic() if now is None else now
+        while self._sends and now - self._sends[0] > RATE_WINDOW:
+            self._sends.popleft()
+        window = min(RATE_WINDOW, now - self._start) if self._start is not None else 0.0
+        jitter = sorted(abs(j) for j in self._jitter)
+        return {
+            "target_hz": self.hz,
+            "achieved_hz": len(self._sends) / window if window > 0 else 0.0,
+            "sent": self.sent,
+            "completed": self.completed,
+            "in_flight": self.in_flight,
+            "missed": self.missed,
+            "busy": self.busy,
+            "jitter_avg_ms": sum(jitter) / len(jitter) * 1e3 if jitter else 0.0,
+            "jitter_p95_ms": jitter[min(len(jitter) - 1, math.floor(len(jitter) * 0.95))] * 1e3 if jitter else 0.0,
+            "jitter_max_ms": jitter[-1] * 1e3 if jitter else 0.0,
+        }
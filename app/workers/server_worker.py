@@ -1,26 +1,39 @@
+import asyncio
+from PyQt5.QtCore import QThread, pyqtSignal, QMutex
+from api.async_client import AsyncCompetitionClient
+from workers.rate_scheduler import FixedRateScheduler
 
-import time
-import json
-from PyQt5.QtCore import QThread, pyqtSignal, QMutex, QWaitCondition
-from api.client import CompetitionClient
+TELEMETRY_PERIOD = 0.5      # s, 2 Hz telemetri gönderimi
+TELEMETRY_IN_FLIGHT = 2     # aynı anda yanıt bekleyen en fazla telemetri isteği
+COORD_REFRESH = 10.0        # s, QR / HSS koordinatlarının yenilenme aralığı
+STATS_PERIOD = 1.0          # s, endpoint_stats yayın aralığı
 
 class ServerWorker(QThread):
     # Signals
     login_result = pyqtSignal(bool, str)     # success, msg
     telemetry_result = pyqtSignal(bool, object) # success, data (list of competitors or error)
     data_fetched = pyqtSignal(str, object)   # type (qr/hss), data
+    request_result = pyqtSignal(str, bool, object)  # endpoint (kilitlenme_bilgisi/kamikaze_bilgisi), success, data
+    endpoint_stats = pyqtSignal(object)      # dict, AsyncCompetitionClient.report()
+    telemetry_rate = pyqtSignal(object)      # dict, FixedRateScheduler.report()
     error = pyqtSignal(str)
 
-    def __init__(self, base_url, username, password):
+    def __init__(self, base_url, username, password, coord_refresh=COORD_REFRESH):
         super().__init__()
-        self.client = CompetitionClient(base_url)
+        self.client = AsyncCompetitionClient(base_url)
         self.username = username
         self.password = password
-        
+        self.coord_refresh = coord_refresh
+        self.scheduler = FixedRateScheduler(TELEMETRY_PERIOD, TELEMETRY_IN_FLIGHT)
+
         self._running = False
         self._telemetry_data = None
         self._mutex = QMutex()
-        self._start_telemetry_event = False
+        self._loop = None           # worker thread'inin asyncio döngüsü
+        self._stop_event = None
+        self._tasks = set()         # tek seferlik istek ve telemetri görevleri
+        self._telemetry_seq = 0     # gönderilen son telemetri isteğinin sırası
+        self._telemetry_shown = 0   # sonucu yayınlanan en yeni istek
 
     def update_telemetry_data(self, data):
         """
@@ -30,52 +43,129 @@ class ServerWorker(QThread):
         self._telemetry_data = data
         self._mutex.unlock()
 
+    def send_lock_info(self, data):
+        """POST /api/kilitlenme_bilgisi without waiting for the telemetry loop; result via request_result."""
+        self._submit("kilitlenme_bilgisi", self.client.send_lock_info, data)
+
+    def send_kamikaze_info(self, text_info):
+        """POST /api/kamikaze_bilgisi; result via request_result."""
+        self._submit("kamikaze_bilgisi", self.client.send_kamikaze_info, text_info)
+
+    def _submit(self, endpoint, call, arg):
+        loop = self._loop
+        if loop is None or not self._running:
+            self.request_result.emit(endpoint, False, "Sunucu bağlantısı yok")
+            return
+        try:
+            loop.call_soon_threadsafe(self._spawn, endpoint, call, arg)
+        except RuntimeError:        # döngü kapanıyor
+            self.request_result.emit(endpoint, False, "Sunucu bağlantısı yok")
+
     def stop(self):
         self._running = False
+        loop, stop_event = self._loop, self._stop_event
+        if loop is not None and stop_event is not None:
+            try:
+                loop.call_soon_threadsafe(stop_event.set)
+            except RuntimeError:
+                pass
         self.wait()
 
     def run(self):
         self._running = True
-        
-        # 1. Automatic Login
-        self.login_result.emit(False, "Giriş yapılıyor...") # Info
-        success, resp = self.client.login(self.username, self.password)
-        if not success:
-            self.login_result.emit(False, f"Giriş Başarısız: {resp}")
+        try:
+            asyncio.run(self._main())
+        except Exception as e:
+            self.error.emit(f"Sunucu worker hatası: {e}")
+        finally:
             self._running = False
-            return
-        
-        self.login_result.emit(True, "Giriş Başarılı")
-        
-        # 2. Fetch Initial Data
-        # QR
-        s, r = self.client.get_qr_coord()
-        if s: self.data_fetched.emit("qr", r)
-        
-        # HSS
-        s, r = self.client.get_hss_coords()
-        if s: self.data_fetched.emit("hss", r)
-        
-        # 3. Telemetry Loop
-        while self._running:
-            start_time = time.time()
-            
+            self._loop = None
+            self._stop_event = None
+
+    async def _main(self):
+        self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        async with self.client:
+            # 1. Automatic Login
+            self.login_result.emit(False, "Giriş yapılıyor...") # Info
+            login = asyncio.create_task(self.client.login(self.username, self.password))
+            stopped = asyncio.create_task(self._stop_event.wait())
+            # stop() yavaş bir girişi beklemesin
+            await asyncio.wait({login, stopped}, return_when=asyncio.FIRST_COMPLETED)
+            if not login.done():
+                login.cancel()
+                return
+            stopped.cancel()
+            success, resp = login.result()
+            if not success:
+                self.login_result.emit(False, f"Giriş Başarısız: {resp}")
+                return
+            self.login_result.emit(True, "Giriş Başarılı")
+            if not self._running:       # stop() döngü kurulmadan çağrıldı
+                return
+
+            # 2. Telemetri, koordinat yenileme ve tek seferlik istekler birbirini beklemeden çalışır
+            loops = [asyncio.create_task(self._telemetry_loop()),
+                     asyncio.create_task(self._coord_loop()),
+                     asyncio.create_task(self._stats_loop())]
+            await self._stop_event.wait()
+            pending = loops + list(self._tasks)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _telemetry_loop(self):
+        # Mutlak slotlar: yavaş bir yanıt sonraki gönderimleri kaydırmaz, önceki
+        # istek sürerken de her slotta en güncel veri gönderilir
+        while True:
+            deadline = await self.scheduler.wait()
+
             # Get current data safely
             self._mutex.lock()
             current_data = self._telemetry_data
             self._mutex.unlock()
-            
-            if current_data:
-                # Send
-                s, r = self.client.send_telemetry(current_data)
-                if s:
-                    # r usually contains competitor info
-                    self.telemetry_result.emit(True, r)
-                else:
-                    self.telemetry_result.emit(False, r)
-            
-            # Rate limit (e.g. 2Hz = 0.5s)
-            elapsed = time.time() - start_time
-            sleep_time = max(0.0, 0.5 - elapsed)
-            time.sleep(sleep_time)
 
+            if current_data and self.scheduler.begin(deadline):
+                self._telemetry_seq += 1
+                task = asyncio.create_task(self._send_telemetry(self._telemetry_seq, current_data))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _send_telemetry(self, seq, data):
+        try:
+            s, r = await self.client.send_telemetry(data)
+        finally:
+            self.scheduler.end()
+        # Yanıtlar sırasız gelebilir; eski bir yanıt daha yeni rakip konumlarının üstüne yazmasın
+        if seq > self._telemetry_shown:
+            self._telemetry_shown = seq
+            # r usually contains competitor info
+            self.telemetry_result.emit(s, r)
+
+    async def _coord_loop(self):
+        last = {}
+        while True:
+            (qs, qr), (hs, hss) = await asyncio.gather(self.client.get_qr_coord(), self.client.get_hss_coords())
+            # Sadece değişince yayınla; harita her yenilemede yeniden çizilmesin
+            for dtype, ok, data in (("qr", qs, qr), ("hss", hs, hss)):
+                if ok and last.get(dtype) != data:
+                    last[dtype] = data
+                    self.data_fetched.emit(dtype, data)
+            if self.coord_refresh <= 0:
+                return
+            await asyncio.sleep(self.coord_refresh)
+
+    async def _stats_loop(self):
+        while True:
+            await asyncio.sleep(STATS_PERIOD)
+            self.endpoint_stats.emit(self.client.report())
+            self.telemetry_rate.emit(self.scheduler.report())
+
+    def _spawn(self, endpoint, call, arg):
+        task = asyncio.create_task(self._one_shot(endpoint, call, arg))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _one_shot(self, endpoint, call, arg):
+        s, r = await call(arg)
+        self.request_result.emit(endpoint, s, r)
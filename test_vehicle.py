@@ -0,0 +1,571 @@
+# Donanımsız test için sahte MAVLink aracı (test_server.py'nin uçak tarafı karşılığı).
+#
+#   python test_vehicle.py                           # udpout:127.0.0.1:14550 (GCS varsayılanı)
+#   python test_vehicle.py --udp 192.168.1.10:14550
+#   python test_vehicle.py --pty                     # seri port: yazdırılan /dev/pts/N yoluna bağlan
+#   python test_vehicle.py --rate ATTITUDE=500 --rate GLOBAL_POSITION_INT=200 --path eight
+#   python test_vehicle.py --path gorev.waypoints --armed
+#
+# Senaryo rotasını (daire, sekiz veya QGC WPL dosyası) takip eder; ARM/DISARM, mod
+# değişimi, MISSION_START, motor testi, SET_MESSAGE_INTERVAL, TIMESYNC, parametre ve
+# görev protokollerine yanıt verir.
+import argparse
+import heapq
+import math
+import os
+import select
+import socket
+import time
+import tty
+
+from pymavlink import mavutil
+
+mavlink = mavutil.mavlink
+
+HOME = (40.7128, 29.6652)       # Telemetry varsayılan konumu
+CRUISE_SPEED = 18.0             # m/s
+CRUISE_ALT = 100.0              # m, rota dosyası irtifa vermezse
+CLIMB_RATE = 5.0                # m/s
+TURN_RATE = math.radians(25)    # rad/s
+WP_RADIUS = 20.0                # m
+EARTH_RADIUS = 6378137.0
+MIN_RATE, MAX_RATE = 1.0, 1000.0
+
+# Varsayılan yayın hızları (Hz); --rate ile 1-1000 Hz arası değiştirilebilir
+DEFAULT_RATES = {
+    "HEARTBEAT": 1,
+    "ATTITUDE": 20,
+    "GLOBAL_POSITION_INT": 10,
+    "VFR_HUD": 10,
+    "GPS_RAW_INT": 5,
+    "SYS_STATUS": 2,
+    "BATTERY_STATUS": 1,
+    "SYSTEM_TIME": 1,
+}
+
+# ArduPlane modları
+MODE_NAMES = mavutil.mode_mapping_apm
+MODES = {v: k for k, v in MODE_NAMES.items()}
+LOITER_MODES = {MODES["RTL"], MODES["LOITER"], MODES["CIRCLE"]}
+
+
+def circle_path(center, radius=150.0, points=24, alt=CRUISE_ALT):
+    return [_offset(center, radius * math.cos(2 * math.pi * i / points),
+                    radius * math.sin(2 * math.pi * i / points)) + (alt,) for i in range(points)]
+
+
+def eight_path(center, radius=200.0, points=32, alt=CRUISE_ALT):
+    # Bernoulli lemniskatı
+    path = []
+    for i in range(points):
+        t = 2 * math.pi * i / points
+        d = 1 + math.sin(t) ** 2
+        path.append(_offset(center, radius * math.cos(t) / d, radius * math.sin(t) * math.cos(t) / d) + (alt,))
+    return path
+
+
+def load_path(path):
+    """(lat, lon, alt) list from a QGC WPL 110 file, skipping home and non-position items."""
+    points = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f.readlines()[1:]:
+            cols = line.split()
+            if len(cols) < 12 or cols[0] == "0":
+                continue
+            lat, lon, alt = float(cols[8]), float(cols[9]), float(cols[10])
+            if lat or lon:
+                points.append((lat, lon, alt or CRUISE_ALT))
+    if not points:
+        raise ValueError(f"{path}: no waypoints")
+    return points
+
+
+def _offset(origin, north, east):
+    lat = origin[0] + math.degrees(north / EARTH_RADIUS)
+    lon = origin[1] + math.degrees(east / (EARTH_RADIUS * math.cos(math.radians(origin[0]))))
+    return lat, lon
+
+
+def _distance_bearing(a, b):
+    north = math.radians(b[0] - a[0]) * EARTH_RADIUS
+    east = math.radians(b[1] - a[1]) * EARTH_RADIUS * math.cos(math.radians(a[0]))
+    return math.hypot(north, east), math.atan2(east, north)
+
+
+def _wrap_pi(a):
+    return (a + math.pi) % (2 * math.pi) - math.pi
+
+
+class UdpPort:
+    """Sends to a fixed GCS address; replies come back to the same socket."""
+    def __init__(self, addr):
+        host, port = addr.rsplit(":", 1)
+        self.dest = (host, int(port))
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.name = f"udp {host}:{port}"
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def write(self, buf):
+        try:
+            self.sock.sendto(buf, self.dest)
+            return True
+        except (BlockingIOError, ConnectionRefusedError):
+            return False
+
+    def read(self):
+        try:
+            return self.sock.recv(65535)
+        except (BlockingIOError, ConnectionRefusedError):
+            return b""
+
+    def close(self):
+        self.sock.close()
+
+
+class PtyPort:
+    """Pseudo-terminal; the GCS opens the slave path as a serial port."""
+    def __init__(self):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        self.name = os.ttyname(self.slave)
+
+    def fileno(self):
+        return self.master
+
+    def write(self, buf):
+        # Karşıda okuyan yoksa tampon dolar; gerçek telsiz gibi mesaj düşer
+        try:
+            os.write(self.master, buf)
+            return True
+        except (BlockingIOError, OSError):
+            return False
+
+    def read(self):
+        try:
+            return os.read(self.master, 65535)
+        except (BlockingIOError, OSError):
+            return b""
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+
+class SimVehicle:
+    def __init__(self, port, rates, path, sysid=1, params=50, armed=False):
+        self.port = port
+        self.mav = mavlink.MAVLink(None, srcSystem=sysid, srcComponent=1)
+        self.mav.robust_parsing = True
+        self.t0 = time.monotonic()
+
+        self.home = HOME
+        self.path = path
+        self.mission = []           # yüklenen görev (lat, lon, alt); AUTO'da rota yerine izlenir
+        self.route = path
+        self.wp = 0
+        self.lat, self.lon = HOME
+        self.alt = 0.0
+        self.heading = 0.0
+        self.yaw_rate = 0.0
+        self.speed = 0.0
+        self.armed = armed
+        self.mode = MODES["AUTO"] if armed else MODES["MANUAL"]
+        self.throttle = 0
+        self.motor_test_until = 0.0
+        self.battery_mah = 0.0
+        self.last_sim = time.monotonic()
+
+        self.params = {"SYSID_THISMAV": float(sysid), "WP_RADIUS": WP_RADIUS,
+                       "TRIM_ARSPD_CM": CRUISE_SPEED * 100, "ARMING_CHECK": 1.0}
+        for i in range(max(0, params - len(self.params))):
+            self.params[f"SIM_PARAM_{i:04d}"] = float(i)
+        self._param_queue = []
+        self._upload = None         # [gcs, items, beklenen seq, son istek zamanı]
+        self._stored = []           # araçtaki görev öğeleri (MISSION_ITEM_INT)
+
+        self.sent = self.dropped = self.received = 0
+        self.bytes_sent = 0
+        self.rates = {}
+        self._generation = {}
+        self._schedule = []
+        for name, hz in rates.items():
+            self.set_rate(name, hz)
+
+    # --- yayın zamanlaması ----------------------------------------------
+
+    def set_rate(self, name, hz):
+        """hz <= 0 stops the stream."""
+        # Eski kayıt kuyrukta kalır; due_streams() nesli eşleşmeyeni atar
+        gen = self._generation[name] = self._generation.get(name, 0) + 1
+        if hz <= 0:
+            self.rates.pop(name, None)
+            return
+        self.rates[name] = min(max(hz, MIN_RATE), MAX_RATE)
+        heapq.heappush(self._schedule, (time.monotonic(), name, gen))
+
+    def due_streams(self, now):
+        while self._schedule and self._schedule[0][0] <= now:
+            deadline, name, gen = heapq.heappop(self._schedule)
+            if self._generation[name] != gen:
+                continue
+            # Mutlak zaman çizelgesi: gecikme birikmez, çok gerideysek atla
+            period = 1.0 / self.rates[name]
+            deadline += period
+            if deadline < now:
+                deadline = now + period
+            heapq.heappush(self._schedule, (deadline, name, gen))
+            yield name
+
+    def next_deadline(self):
+        return self._schedule[0][0] if self._schedule else None
+
+    # --- benzetim --------------------------------------------------------
+
+    def step(self, now):
+        dt = now - self.last_sim
+        self.last_sim = now
+        if not self.armed:
+            self.speed = self.yaw_rate = 0.0
+            self.alt = max(0.0, self.alt - CLIMB_RATE * 2 * dt)
+            self.throttle = 15 if now < self.motor_test_until else 0
+            return
+        route = self.route
+        target = route[self.wp % len(route)]
+        dist, bearing = _distance_bearing((self.lat, self.lon), target)
+        if dist < max(WP_RADIUS, self.speed * dt):
+            self.wp = (self.wp + 1) % len(route)
+        err = _wrap_pi(bearing - self.heading)
+        self.yaw_rate = max(-TURN_RATE, min(TURN_RATE, err / max(dt, 1e-3)))
+        self.heading = _wrap_pi(self.heading + self.yaw_rate * dt)
+        self.speed = min(CRUISE_SPEED, self.speed + 3.0 * dt)
+        self.lat, self.lon = _offset((self.lat, self.lon), self.speed * dt * math.cos(self.heading),
+                                     self.speed * dt * math.sin(self.heading))
+        climb = max(-CLIMB_RATE * dt, min(CLIMB_RATE * dt, target[2] - self.alt))
+        self.alt += climb
+        self.throttle = 55 + int(climb / max(dt, 1e-3) * 5)
+        self.battery_mah += self._current_a() * dt / 3.6
+
+    def _current_a(self):
+        return 0.5 + self.throttle * 0.3
+
+    def _set_route(self):
+        if self.mode in LOITER_MODES:
+            center = self.home if self.mode == MODES["RTL"] else (self.lat, self.lon)
+            self.route = circle_path(center, radius=80.0, points=12, alt=max(self.alt, 50.0))
+        elif self.mode == MODES["AUTO"] and self.mission:
+            self.route = self.mission
+        else:
+            self.route = self.path
+        self.wp = 0
+
+    def set_mode(self, mode):
+        if mode not in MODE_NAMES:
+            return False
+        self.mode = mode
+        self._set_route()
+        print(f"Mode: {MODE_NAMES[mode]}")
+        return True
+
+    # --- gönderme --------------------------------------------------------
+
+    def send(self, msg):
+        buf = msg.pack(self.mav)
+        self.mav.seq = (self.mav.seq + 1) % 256
+        if self.port.write(buf):
+            self.sent += 1
+            self.bytes_sent += len(buf)
+        else:
+            self.dropped += 1
+
+    def send_stream(self, name, now):
+        m = self.mav
+        boot_ms = int((now - self.t0) * 1000) & 0xFFFFFFFF
+        if name == "HEARTBEAT":
+            base = mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED
+            if self.armed:
+                base |= mavlink.MAV_MODE_FLAG_SAFETY_ARMED
+            state = mavlink.MAV_STATE_ACTIVE if self.armed else mavlink.MAV_STATE_STANDBY
+            msg = m.heartbeat_encode(mavlink.MAV_TYPE_FIXED_WING, mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                                     base, self.mode, state)
+        elif name == "ATTITUDE":
+            roll = math.atan(self.speed * self.yaw_rate / 9.81)
+            msg = m.attitude_encode(boot_ms, roll, 0.05 if self.armed else 0.0, self.heading,
+                                    0.0, 0.0, self.yaw_rate)
+        elif name == "GLOBAL_POSITION_INT":
+            vn = self.speed * math.cos(self.heading)
+            ve = self.speed * math.sin(self.heading)
+            hdg = int(math.degrees(self.heading) % 360 * 100)
+            msg = m.global_position_int_encode(boot_ms, int(self.lat * 1e7), int(self.lon * 1e7),
+                                               int(self.alt * 1000), int(self.alt * 1000),
+                                               int(vn * 100), int(ve * 100), 0, hdg)
+        elif name == "VFR_HUD":
+            msg = m.vfr_hud_encode(self.speed, self.speed, int(math.degrees(self.heading) % 360),
+                                   self.throttle, self.alt, 0.0)
+        elif name == "GPS_RAW_INT":
+            msg = m.gps_raw_int_encode(int(time.time() * 1e6), 3, int(self.lat * 1e7), int(self.lon * 1e7),
+                                       int(self.alt * 1000), 80, 120, int(self.speed * 100),
+                                       int(math.degrees(self.heading) % 360 * 100), 14)
+        elif name == "SYS_STATUS":
+            volts, remaining = self._battery(0)
+            msg = m.sys_status_encode(0, 0, 0, 500, int(volts * 1000), int(self._current_a() * 100),
+                                      remaining, 0, 0, 0, 0, 0, 0)
+        elif name == "BATTERY_STATUS":
+            for battery in (0, 1):
+                volts, remaining = self._battery(battery)
+                cells = [int(volts / 4 * 1000)] * 4 + [65535] * 6
+                self.send(m.battery_status_encode(battery, 0, 0, 3000, cells, int(self._current_a() * 100),
+                                                  int(self.battery_mah), -1, remaining))
+            return
+        elif name == "SYSTEM_TIME":
+            msg = m.system_time_encode(int(time.time() * 1e6), boot_ms)
+        else:
+            return
+        self.send(msg)
+
+    def _battery(self, battery):
+        # 4S, 5000 mAh; ikinci batarya (aviyonik) daha yavaş boşalır
+        used = self.battery_mah / (1 if battery == 0 else 4)
+        remaining = max(0, 100 - int(used / 50))
+        return 13.2 + 3.6 * remaining / 100, remaining
+
+    def _ack(self, command, result):
+        self.send(self.mav.command_ack_encode(command, result))
+
+    # --- gelen mesajlar ------------------------------------------------
+
+    def handle(self, msg, now):
+        self.received += 1
+        t = msg.get_type()
+        if t == "COMMAND_LONG":
+            self._on_command(msg, now)
+        elif t == "SET_MODE":
+            self.set_mode(msg.custom_mode)
+        elif t == "TIMESYNC" and msg.tc1 == 0:
+            # tc1 araç boot saatinde: akışlardaki time_boot_ms ile aynı saat
+            self.send(self.mav.timesync_encode(int((time.monotonic() - self.t0) * 1e9), msg.ts1))
+        elif t == "PARAM_REQUEST_LIST":
+            self._param_queue = list(range(len(self.params)))
+        elif t == "PARAM_REQUEST_READ":
+            self._on_param_read(msg)
+        elif t == "PARAM_SET":
+            if msg.param_id in self.params:
+                self.params[msg.param_id] = msg.param_value
+                self._send_param(list(self.params).index(msg.param_id))
+        elif t in ("MISSION_COUNT", "MISSION_ITEM_INT", "MISSION_REQUEST_LIST", "MISSION_REQUEST_INT",
+                   "MISSION_REQUEST"):
+            self._on_mission(msg, t, now)
+
+    def _on_command(self, msg, now):
+        cmd = msg.command
+        if cmd == mavlink.MAV_CMD_COMPONENT_ARM_DISARM:
+            if msg.param1 == 1 and now < self.motor_test_until:
+                self._ack(cmd, mavlink.MAV_RESULT_TEMPORARILY_REJECTED)
+                return
+            self.armed = msg.param1 == 1
+            print("ARMED" if self.armed else "DISARMED")
+            self._ack(cmd, mavlink.MAV_RESULT_ACCEPTED)
+        elif cmd == mavlink.MAV_CMD_MISSION_START:
+            if not self.armed:
+                self._ack(cmd, mavlink.MAV_RESULT_DENIED)
+                return
+            self.set_mode(MODES["AUTO"])
+            self._ack(cmd, mavlink.MAV_RESULT_ACCEPTED)
+        elif cmd == mavlink.MAV_CMD_DO_SET_MODE:
+            ok = self.set_mode(int(msg.param2))
+            self._ack(cmd, mavlink.MAV_RESULT_ACCEPTED if ok else mavlink.MAV_RESULT_DENIED)
+        elif cmd == mavlink.MAV_CMD_DO_MOTOR_TEST:
+            # Motor testi sadece disarm iken
+            if self.armed:
+                self._ack(cmd, mavlink.MAV_RESULT_DENIED)
+                return
+            self.motor_test_until = now + max(0.0, msg.param4)
+            print(f"Motor test: motor {int(msg.param1)}, {msg.param3:.0f}%, {msg.param4:.0f} s")
+            self._ack(cmd, mavlink.MAV_RESULT_ACCEPTED)
+        elif cmd == mavlink.MAV_CMD_SET_MESSAGE_INTERVAL:
+            entry = mavlink.mavlink_map.get(int(msg.param1))
+            name = entry.msgname if entry is not None else None
+            if name not in DEFAULT_RATES:
+                self._ack(cmd, mavlink.MAV_RESULT_UNSUPPORTED)
+                return
+            interval_us = msg.param2
+            if interval_us == 0:
+                hz = DEFAULT_RATES[name]
+            else:
+                hz = 0 if interval_us < 0 else 1e6 / interval_us
+            self.set_rate(name, hz)
+            self._ack(cmd, mavlink.MAV_RESULT_ACCEPTED)
+        elif cmd == mavlink.MAV_CMD_REQUEST_MESSAGE:
+            msg_id = int(msg.param1)
+            if msg_id == mavlink.MAVLINK_MSG_ID_AUTOPILOT_VERSION:
+                self._ack(cmd, mavlink.MAV_RESULT_ACCEPTED)
+                caps = mavlink.MAV_PROTOCOL_CAPABILITY_MAVLINK2 | mavlink.MAV_PROTOCOL_CAPABILITY_MISSION_INT
+                self.send(self.mav.autopilot_version_encode(caps, 0x04050000, 0, 0, 0, [0] * 8, [0] * 8,
+                                                            [0] * 8, 0, 0, 0))
+            else:
+                entry = mavlink.mavlink_map.get(msg_id)
+                if entry is not None and entry.msgname in DEFAULT_RATES:
+                    self._ack(cmd, mavlink.MAV_RESULT_ACCEPTED)
+                    self.send_stream(entry.msgname, now)
+                else:
+                    self._ack(cmd, mavlink.MAV_RESULT_UNSUPPORTED)
+        else:
+            self._ack(cmd, mavlink.MAV_RESULT_UNSUPPORTED)
+
+    # --- parametreler ----------------------------------------------------
+
+    def _send_param(self, index):
+        name = list(self.params)[index]
+        self.send(self.mav.param_value_encode(name.encode(), self.params[name],
+                                              mavlink.MAV_PARAM_TYPE_REAL32, len(self.params), index))
+
+    def _on_param_read(self, msg):
+        names = list(self.params)
+        if msg.param_index >= 0 and msg.param_index < len(names) and msg.param_index != 65535:
+            self._send_param(msg.param_index)
+        elif msg.param_id in self.params:
+            self._send_param(names.index(msg.param_id))
+        # _HASH_CHECK gibi bilinmeyen adlar ArduPilot'taki gibi yanıtsız kalır
+
+    def pump_params(self, budget=20):
+        """Streams the pending PARAM_VALUE list a few at a time so it does not flood the link."""
+        for _ in range(min(budget, len(self._param_queue))):
+            self._send_param(self._param_queue.pop(0))
+
+    # --- görev -----------------------------------------------------------
+
+    def _on_mission(self, msg, t, now):
+        if getattr(msg, "mission_type", 0) != mavlink.MAV_MISSION_TYPE_MISSION:
+            return
+        gcs = (msg.get_srcSystem(), msg.get_srcComponent())
+        if t == "MISSION_COUNT":
+            self._upload = [gcs, [None] * msg.count, 0, now]
+            if msg.count == 0:
+                self._finish_upload()
+            else:
+                self._request_next(now)
+        elif t == "MISSION_ITEM_INT" and self._upload is not None:
+            items = self._upload[1]
+            if msg.seq < len(items) and items[msg.seq] is None:
+                items[msg.seq] = msg
+                if all(it is not None for it in items):
+                    self._finish_upload()
+                else:
+                    self._upload[2] = items.index(None)
+                    self._request_next(now)
+        elif t == "MISSION_REQUEST_LIST":
+            self.send(self.mav.mission_count_encode(*gcs, len(self._stored)))
+        elif t in ("MISSION_REQUEST_INT", "MISSION_REQUEST") and msg.seq < len(self._stored):
+            it = self._stored[msg.seq]
+            self.send(self.mav.mission_item_int_encode(
+                *gcs, msg.seq, it.frame, it.command, 0, it.autocontinue,
+                it.param1, it.param2, it.param3, it.param4, it.x, it.y, it.z))
+
+    def _request_next(self, now):
+        gcs, _, seq, _ = self._upload
+        self.send(self.mav.mission_request_int_encode(*gcs, seq))
+        self._upload[3] = now
+
+    def poll_upload(self, now):
+        """Re-requests the awaited mission item when the GCS goes quiet, as ArduPilot does."""
+        if self._upload is not None and now - self._upload[3] > 1.0:
+            self._request_next(now)
+
+    def _finish_upload(self):
+        gcs, items, _, _ = self._upload
+        self._upload = None
+        self._stored = items
+        # 0. öğe ArduPilot'ta home
+        self.mission = [(it.x / 1e7, it.y / 1e7, it.z or CRUISE_ALT) for it in items[1:]
+                        if it.command == mavlink.MAV_CMD_NAV_WAYPOINT and (it.x or it.y)]
+        if items and (items[0].x or items[0].y):
+            self.home = (items[0].x / 1e7, items[0].y / 1e7)
+        self.send(self.mav.mission_ack_encode(*gcs, mavlink.MAV_MISSION_ACCEPTED))
+        print(f"Mission received: {len(items)} items")
+        if self.mode == MODES["AUTO"]:
+            self._set_route()
+
+
+def run(vehicle, stats_period=5.0):
+    port = vehicle.port
+    print(f"Simulated vehicle on {port.name}, streams: " +
+          ", ".join(f"{n} {hz:g} Hz" for n, hz in vehicle.rates.items()))
+    next_stats = time.monotonic() + stats_period
+    sent = bytes_sent = 0
+    try:
+        while True:
+            now = time.monotonic()
+            deadline = vehicle.next_deadline()
+            timeout = 0.05 if deadline is None else min(0.05, max(0.0, deadline - now))
+            readable, _, _ = select.select([port], [], [], timeout)
+            now = time.monotonic()
+            if readable:
+                data = port.read()
+                if data:
+                    for msg in vehicle.mav.parse_buffer(data) or ():
+                        if msg.get_type() != "BAD_DATA":
+                            vehicle.handle(msg, now)
+            vehicle.step(now)
+            for name in vehicle.due_streams(now):
+                vehicle.send_stream(name, now)
+            vehicle.pump_params()
+            vehicle.poll_upload(now)
+            if now >= next_stats:
+                rate = (vehicle.sent - sent) / stats_period
+                kbps = (vehicle.bytes_sent - bytes_sent) / stats_period / 1024
+                sent, bytes_sent = vehicle.sent, vehicle.bytes_sent
+                print(f"{rate:8.0f} msg/s  {kbps:7.1f} kB/s  dropped {vehicle.dropped}  rx {vehicle.received}  "
+                      f"{'ARMED' if vehicle.armed else 'disarmed'} {MODE_NAMES.get(vehicle.mode, vehicle.mode)}  "
+                      f"{vehicle.lat:.6f},{vehicle.lon:.6f} {vehicle.alt:.0f} m")
+                next_stats = now + stats_period
+    except KeyboardInterrupt:
+        print("\nVehicle stopped.")
+    finally:
+        port.close()
+
+
+def _parse_rate(text):
+    name, _, hz = text.partition("=")
+    name = name.strip().upper()
+    if name not in DEFAULT_RATES:
+        raise argparse.ArgumentTypeError(f"unknown message {name}; one of {', '.join(DEFAULT_RATES)}")
+    try:
+        return name, float(hz)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad rate {hz!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic MAVLink vehicle for testing the GCS without hardware")
+    link = parser.add_mutually_exclusive_group()
+    link.add_argument("--udp", default="127.0.0.1:14550", help="GCS address (host:port)")
+    link.add_argument("--pty", action="store_true", help="serve on a pseudo-terminal instead of UDP")
+    parser.add_argument("--rate", type=_parse_rate, action="append", default=[], metavar="MSG=HZ",
+                        help="stream rate, 1-1000 Hz (0 disables)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every stream rate")
+    parser.add_argument("--path", default="circle", help="circle, eight or a QGC WPL file")
+    parser.add_argument("--sysid", type=int, default=1)
+    parser.add_argument("--params", type=int, default=50, help="number of parameters to serve")
+    parser.add_argument("--armed", action="store_true", help="start armed in AUTO")
+    args = parser.parse_args(argv)
+
+    rates = {name: hz * args.scale for name, hz in DEFAULT_RATES.items()}
+    rates.update(args.rate)
+    if args.path == "circle":
+        path = circle_path(HOME)
+    elif args.path == "eight":
+        path = eight_path(HOME)
+    else:
+        path = load_path(args.path)
+
+    port = PtyPort() if args.pty else UdpPort(args.udp)
+    if args.pty:
+        print(f"Serial port: {port.name} (connect the GCS to {port.name}:57600)")
+    run(SimVehicle(port, rates, path, sysid=args.sysid, params=args.params, armed=args.armed))
+
+
+if __name__ == '__main__':
+    main()
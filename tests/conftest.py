@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Uygulama modülleri app/ köküne göre import edilir (cd app && python main.py gibi)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
@@ -0,0 +1,99 @@
+from pymavlink import mavutil
+from pymavlink.dialects.v20 import ardupilotmega as v20
+
+from mavlink.batch_reader import BatchReader
+
+ATTITUDE = mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE
+
+
+class FakeMaster:
+    """Minimal mavutil connection: recv() hands out queued bytes once."""
+    def __init__(self):
+        self.mav = mavutil.mavlink.MAVLink(None)
+        self.data = bytearray()
+        self.posted = []
+
+    def recv(self, n):
+        out, self.data = bytes(self.data[:n]), self.data[n:]
+        return out
+
+    def post_message(self, msg):
+        self.posted.append(msg)
+
+
+def _v2_frames():
+    enc = v20.MAVLink(None, srcSystem=1, srcComponent=1)
+    bad = bytearray(enc.attitude_encode(1, 0.1, 0.2, 0.3, 0, 0, 0).pack(enc))
+    bad[-1] ^= 0xFF     # CRC bozuk
+    good = enc.heartbeat_encode(1, 3, 0, 0, 0).pack(enc)
+    return bytes(bad), good
+
+
+def test_corrupt_v2_frame_after_dialect_switch_is_skipped():
+    master = FakeMaster()
+    reader = BatchReader(master, decode_ids={ATTITUDE})
+    # pymavlink ilk MAVLink 2 frame'inde master.mav'ı v20 dialect'iyle değiştirir
+    master.mav = v20.MAVLink(None)
+    bad, good = _v2_frames()
+    master.data += bad + good
+
+    reader.read()
+    msgs = reader.parse()
+
+    assert [m.get_type() for m in msgs] == ["HEARTBEAT"]
+    assert reader.mav is master.mav
+    assert reader.bad_bytes == len(bad)
+    assert reader.buffered == 0
+
+
+def test_corrupt_v2_frame_with_reader_created_after_switch():
+    master = FakeMaster()
+    master.mav = v20.MAVLink(None)
+    reader = BatchReader(master, decode_ids={ATTITUDE})
+    bad, good = _v2_frames()
+    master.data += bad + good + bad
+
+    reader.read()
+    msgs = reader.parse()
+
+    assert [m.get_type() for m in msgs] == ["HEARTBEAT"]
+    assert len(master.posted) == 1
+
+
+def test_raw_frame_with_bad_crc_is_dropped():
+    master = FakeMaster()
+    master.mav = v20.MAVLink(None)
+    reader = BatchReader(master, decode_ids={ATTITUDE})
+    enc = v20.MAVLink(None, srcSystem=1, srcComponent=1)
+    raw = bytes(enc.vfr_hud_encode(12.0, 11.5, 90, 50, 100.0, 0.5).pack(enc))
+    bad = bytearray(raw)
+    bad[12] ^= 0x01     # payload biti değişti, uzunluk sağlam
+    master.data += bytes(bad) + raw
+
+    reader.read()
+    msgs = reader.parse()
+
+    assert len(msgs) == 1
+    assert msgs[0].get_type() == "VFR_HUD" and msgs[0].get_msgbuf() == raw
+    assert reader.skipped == 1 and reader.decoded == 0
+    assert reader.bad_bytes == len(bad)
+
+
+def test_raw_frames_pass_crc_check_for_v1_and_signed_v2():
+    master = FakeMaster()
+    master.mav = v20.MAVLink(None)
+    reader = BatchReader(master, decode_ids={ATTITUDE})
+    v1 = mavutil.mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+    signed = v20.MAVLink(None, srcSystem=1, srcComponent=1)
+    signed.signing.secret_key = bytes(range(32))
+    signed.signing.link_id = 1
+    signed.signing.sign_outgoing = True
+    frames = [bytes(v1.vfr_hud_encode(1.0, 1.0, 0, 0, 0.0, 0.0).pack(v1)),
+              bytes(signed.vfr_hud_encode(2.0, 2.0, 0, 0, 0.0, 0.0).pack(signed))]
+    master.data += b"".join(frames)
+
+    reader.read()
+    msgs = reader.parse()
+
+    assert [m.get_msgbuf() for m in msgs] == frames
+    assert reader.bad_bytes == 0
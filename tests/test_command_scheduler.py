@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from mavlink.command_scheduler import PRIORITY_NORMAL, PRIORITY_SAFETY, CommandScheduler
+
+
+def test_safety_lane_is_taken_before_normal_fifo_within_lane():
+    s = CommandScheduler()
+    s.submit("motor_test", 1)
+    s.submit("replay_seek", 2)
+    s.submit("start_mission")
+    s.submit("arm", priority=PRIORITY_SAFETY)
+
+    assert [s.pop()[0] for _ in range(4)] == ["start_mission", "arm", "motor_test", "replay_seek"]
+    assert s.pop() is None
+
+
+def test_unknown_command_defaults_to_normal_priority():
+    s = CommandScheduler()
+    s.submit("something", "x")
+    s.submit("start_mission", priority=PRIORITY_NORMAL)
+
+    assert s.pop() == ("something", "x")
+    assert s.pop() == ("start_mission", None)
+
+
+def test_manual_control_latest_wins_and_counts_overwrites():
+    s = CommandScheduler(manual_rate_hz=10.0)
+    s.set_manual((1, 0, 0, 0))
+    s.set_manual((2, 0, 0, 0))
+    s.set_manual((3, 0, 0, 0))
+    now = time.monotonic()
+
+    assert s.manual_due(now) == (3, 0, 0, 0)
+    assert s.manual_overwritten == 2
+    assert s.stats()["latency"]["manual_control"]["count"] == 1
+
+
+def test_manual_control_is_rate_limited():
+    s = CommandScheduler(manual_rate_hz=10.0)
+    s.set_manual((1, 0, 0, 0))
+    now = time.monotonic()
+
+    assert s.manual_due(now) is not None
+    assert s.manual_due(now + 0.05) is None
+    assert s.time_until_manual(now + 0.05) == pytest.approx(0.05)
+    assert s.manual_due(now + 0.1) == (1, 0, 0, 0)
+
+
+def test_stale_manual_sample_is_dropped():
+    s = CommandScheduler(manual_timeout=0.5)
+    s.set_manual((1, 0, 0, 0))
+    now = time.monotonic()
+
+    assert s.manual_due(now + 0.6) is None
+    assert s.time_until_manual(now + 0.6) is None
+    assert s.manual_due(now + 1.0) is None
+
+
+def test_pop_records_queue_wait_per_command():
+    s = CommandScheduler()
+    s.submit("motor_test")
+    s.submit("motor_test")
+    s.pop()
+    s.pop()
+
+    stats = s.stats()["latency"]["motor_test"]
+    assert stats["count"] == 2
+    assert 0.0 <= stats["avg_ms"] <= stats["max_ms"]
@@ -0,0 +1,173 @@
+import time
+
+import pytest
+
+from pymavlink import mavutil
+
+from mavlink.command_tracker import BACKOFF, CommandStep, CommandTracker
+
+mavlink = mavutil.mavlink
+ARM = mavlink.MAV_CMD_COMPONENT_ARM_DISARM
+MODE = mavlink.MAV_CMD_DO_SET_MODE
+
+
+class FakeMav:
+    def __init__(self):
+        self.sent = []      # (command, confirmation)
+
+    def command_long_send(self, target_system, target_component, command, confirmation, *params):
+        self.sent.append((command, confirmation))
+
+
+class FakeMaster:
+    def __init__(self):
+        self.mav = FakeMav()
+
+
+_enc = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+_dec = mavlink.MAVLink(None)
+
+
+def _vehicle_msg(msg):
+    """Round-trips through the wire format so the header (sysid) is set."""
+    return _dec.decode(bytearray(msg.pack(_enc)))
+
+
+def ack(command, result=mavlink.MAV_RESULT_ACCEPTED):
+    return _vehicle_msg(_enc.command_ack_encode(command, result))
+
+
+def heartbeat(base_mode=0):
+    return _vehicle_msg(_enc.heartbeat_encode(mavlink.MAV_TYPE_FIXED_WING,
+                                              mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA, base_mode, 0, 0))
+
+
+def make_tracker():
+    master = FakeMaster()
+    results = []
+    return CommandTracker(master, results.append), master.mav.sent, results
+
+
+def test_ack_accepted_finishes_with_rtt():
+    tracker, sent, results = make_tracker()
+    assert tracker.start("arm", [CommandStep("ARM", ARM, (1,))])
+    assert sent == [(ARM, 0)]
+
+    tracker.on_message(ack(ARM))
+
+    assert len(results) == 1 and results[0].ok
+    assert results[0].attempts == 1
+    assert results[0].rtt >= 0.0
+    assert "arm" in tracker.stats()
+    assert not tracker.active
+
+
+def test_same_name_refused_while_running():
+    tracker, _, _ = make_tracker()
+    step = CommandStep("ARM", ARM, (1,))
+    assert tracker.start("arm", [step])
+    assert not tracker.start("arm", [step])
+
+
+def test_timeout_resends_with_confirmation_and_backoff():
+    tracker, sent, results = make_tracker()
+    tracker.start("arm", [CommandStep("ARM", ARM, (1,), ack_timeout=1.0)])
+    first_deadline = tracker.active["arm"].deadline
+
+    tracker.poll(first_deadline)
+
+    assert sent == [(ARM, 0), (ARM, 1)]
+    second_deadline = tracker.active["arm"].deadline
+    assert second_deadline - first_deadline == pytest.approx(1.0 * BACKOFF)
+    assert not results
+
+
+def test_gives_up_after_max_attempts():
+    tracker, sent, results = make_tracker()
+    tracker.start("arm", [CommandStep("ARM", ARM, (1,), ack_timeout=0.1, max_attempts=3)])
+    now = time.monotonic()
+    for _ in range(10):
+        now += 10.0
+        tracker.poll(now)
+
+    assert [c for _, c in sent] == [0, 1, 2]
+    assert len(results) == 1 and not results[0].ok
+    assert "zaman aşımı" in results[0].detail
+    assert results[0].attempts == 3
+
+
+def test_rejected_ack_fails_immediately():
+    tracker, _, results = make_tracker()
+    tracker.start("arm", [CommandStep("ARM", ARM, (1,))])
+
+    tracker.on_message(ack(ARM, mavlink.MAV_RESULT_DENIED))
+
+    assert not results[0].ok
+    assert "DENIED" in results[0].detail
+
+
+def test_in_progress_ack_extends_deadline_without_resend():
+    tracker, sent, results = make_tracker()
+    tracker.start("arm", [CommandStep("ARM", ARM, (1,), ack_timeout=1.0)])
+    before = tracker.active["arm"].deadline
+
+    tracker.on_message(ack(ARM, mavlink.MAV_RESULT_IN_PROGRESS))
+
+    assert tracker.active["arm"].deadline >= before
+    assert sent == [(ARM, 0)]
+    assert not results
+
+
+def test_ack_for_other_command_or_vehicle_is_ignored():
+    tracker, _, results = make_tracker()
+    tracker.start("arm", [CommandStep("ARM", ARM, (1,))])
+    tracker.target_system = 2
+
+    tracker.on_message(ack(ARM))
+    tracker.target_system = 1
+    tracker.on_message(ack(MODE))
+
+    assert not results
+
+
+def test_confirm_step_waits_for_heartbeat_then_advances():
+    tracker, sent, results = make_tracker()
+    armed = lambda hb: bool(hb.base_mode & mavlink.MAV_MODE_FLAG_SAFETY_ARMED)
+    tracker.start("start", [CommandStep("ARM", ARM, (1,), confirm=armed),
+                            CommandStep("MODE", MODE, (1, 10))])
+
+    tracker.on_message(ack(ARM))
+    assert tracker.active["start"].phase == "confirm"
+    tracker.on_message(heartbeat(0))
+    assert sent == [(ARM, 0)]
+
+    tracker.on_message(heartbeat(mavlink.MAV_MODE_FLAG_SAFETY_ARMED))
+    assert sent == [(ARM, 0), (MODE, 0)]
+
+    tracker.on_message(ack(MODE))
+    assert len(results) == 1 and results[0].ok
+    assert results[0].attempts == 2
+
+
+def test_confirm_timeout_fails():
+    tracker, _, results = make_tracker()
+    tracker.start("arm", [CommandStep("ARM", ARM, (1,), confirm=lambda hb: False, confirm_timeout=2.0)])
+    tracker.on_message(ack(ARM))
+
+    tracker.poll(tracker.active["arm"].deadline)
+
+    assert not results[0].ok
+    assert "durum değişmedi" in results[0].detail
+
+
+def test_cancel_all_reports_each_sequence():
+    tracker, _, results = make_tracker()
+    tracker.start("a", [CommandStep("ARM", ARM, (1,))])
+    tracker.start("b", [CommandStep("MODE", MODE, (1, 10))])
+
+    tracker.cancel_all("Bağlantı koptu")
+
+    assert sorted(r.name for r in results) == ["a", "b"]
+    assert all(not r.ok and r.detail == "Bağlantı koptu" for r in results)
+    assert tracker.time_until_deadline(time.monotonic()) is None
+
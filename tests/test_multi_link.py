@@ -0,0 +1,166 @@
+from collections import deque
+
+import pytest
+from pymavlink.dialects.v20 import common as mavlink2
+
+from mavlink import multi_link
+from mavlink.multi_link import DEDUP_WINDOW, MultiLinkConnection
+
+
+class FakeConn:
+    """mavutil bağlantısı yerine: kuyruğa konan frame'leri kendi decoder'ıyla çözer."""
+    def __init__(self, name):
+        self.name = name
+        self.mav = mavlink2.MAVLink(None)
+        self.pending = deque()
+        self.written = []
+        self.target_system = 1
+        self.target_component = 1
+
+    def push(self, *frames):
+        self.pending.extend(frames)
+
+    def recv_msg(self):
+        while self.pending:
+            msg = self.mav.parse_char(self.pending.popleft())
+            if msg is not None:
+                return msg
+        return None
+
+    def write(self, buf):
+        self.written.append(buf)
+
+    def close(self):
+        pass
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(multi_link.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def conn(monkeypatch, clock):
+    monkeypatch.setattr(multi_link.mavutil, "mavlink_connection", lambda s, **kw: FakeConn(s))
+    return MultiLinkConnection(["radio", "wifi"])
+
+
+def frames(count, start_seq=0):
+    enc = mavlink2.MAVLink(None, srcSystem=1, srcComponent=1)
+    out = []
+    for i in range(count):
+        enc.seq = (start_seq + i) & 0xFF     # pack() seq'i kendisi artırmıyor
+        out.append(bytes(enc.attitude_encode(i, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0).pack(enc)))
+    return out
+
+
+def drain(conn):
+    out = []
+    while True:
+        msg = conn.recv_msg()
+        if msg is None:
+            return out
+        out.append(msg)
+
+
+def test_same_frame_on_two_links_is_returned_once(conn, clock):
+    radio, wifi = conn.links
+    stream = frames(5)
+    radio.conn.push(*stream)
+    wifi.conn.push(*stream)
+
+    msgs = drain(conn)
+
+    assert [m.time_boot_ms for m in msgs] == [0, 1, 2, 3, 4]
+    assert radio.first + wifi.first == 5
+    assert radio.duplicates + wifi.duplicates == 5
+    assert radio.received == wifi.received == 5
+
+
+def test_late_copy_feeds_lag_of_slower_link(conn, clock):
+    radio, wifi = conn.links
+    stream = frames(3)
+    radio.conn.push(*stream)
+    drain(conn)
+
+    clock.now += 0.2
+    wifi.conn.push(*stream)
+    assert drain(conn) == []
+
+    assert wifi.duplicates == 3 and wifi.first == 0
+    assert wifi.lag > 0.0
+    assert radio.lag == 0.0
+
+
+def test_copy_outside_window_is_new(conn, clock):
+    radio, wifi = conn.links
+    stream = frames(1)
+    radio.conn.push(*stream)
+    assert len(drain(conn)) == 1
+
+    clock.now += DEDUP_WINDOW + 0.01
+    wifi.conn.push(*stream)
+    assert len(drain(conn)) == 1
+
+
+def test_same_key_with_different_bytes_is_not_a_duplicate(conn, clock):
+    radio, wifi = conn.links
+    radio.conn.push(*frames(1))
+    enc = mavlink2.MAVLink(None, srcSystem=1, srcComponent=1)
+    other = bytes(enc.attitude_encode(999, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0).pack(enc))   # seq 0
+    wifi.conn.push(other)
+
+    assert sorted(m.time_boot_ms for m in drain(conn)) == [0, 999]
+    assert wifi.duplicates == 0
+
+
+def test_repeat_on_same_link_is_not_dropped(conn, clock):
+    radio, _ = conn.links
+    stream = frames(1)
+    radio.conn.push(*stream, *stream)
+
+    assert len(drain(conn)) == 2
+    assert radio.duplicates == 0
+
+
+def test_loss_and_best_link_selection(conn, clock):
+    radio, wifi = conn.links
+    full = frames(10)
+    radio.conn.push(*full)
+    wifi.conn.push(*full[::2])          # wifi her iki frame'den birini kaçırıyor
+    drain(conn)
+
+    report = conn.report(clock.now)
+
+    assert report["wifi"]["loss_pct"] > report["radio"]["loss_pct"]
+    assert report["radio"]["active"] and not report["wifi"]["active"]
+    conn.write(b"x")
+    assert radio.conn.written == [b"x"]
+
+
+def test_writes_move_to_live_link_when_best_dies(conn, clock):
+    radio, wifi = conn.links
+    stream = frames(2)
+    radio.conn.push(*stream)
+    wifi.conn.push(*stream)
+    drain(conn)
+    conn.select_best(clock.now)
+
+    clock.now += multi_link.LINK_TIMEOUT / 2
+    live = wifi if conn.best is radio else radio
+    live.conn.push(*frames(1, start_seq=2))
+    drain(conn)
+    clock.now += multi_link.LINK_TIMEOUT / 2 + 0.01
+
+    conn.write(b"y")
+    assert live.conn.written == [b"y"]
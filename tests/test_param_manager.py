@@ -0,0 +1,74 @@
+import time
+
+from pymavlink import mavutil
+
+from mavlink import param_manager
+from mavlink.param_manager import HASH_TIMEOUT, VERSION_TIMEOUT, ParamManager
+
+mavlink = mavutil.mavlink
+REAL32 = mavlink.MAV_PARAM_TYPE_REAL32
+
+
+class FakeMav:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        # *_send çağrılarını kaydet
+        return lambda *args: self.calls.append((name, args))
+
+
+class FakeMaster:
+    def __init__(self):
+        self.mav = FakeMav()
+
+
+_enc = mavlink.MAVLink(None, srcSystem=1, srcComponent=1)
+_dec = mavlink.MAVLink(None)
+
+
+def param_value(name, value, index, count):
+    msg = _enc.param_value_encode(name.encode(), value, REAL32, count, index)
+    return _dec.decode(bytearray(msg.pack(_enc)))
+
+
+def download(manager, params):
+    """Runs start() -> (no AUTOPILOT_VERSION / hash answer) -> full list from `params`."""
+    reports = []
+    manager.on_update = reports.append
+    now = time.monotonic()
+    manager.start(now)
+    now += VERSION_TIMEOUT
+    manager.poll(now)
+    if manager.state == "hash":
+        now += HASH_TIMEOUT
+        manager.poll(now)
+    assert manager.state == "list"
+    for i, (name, value) in enumerate(params):
+        manager.on_message(param_value(name, value, i, len(params)))
+    return reports[-1]
+
+
+def test_diff_reports_changed_and_removed(tmp_path):
+    first = download(ParamManager(FakeMaster(), cache_dir=tmp_path),
+                     [("A", 1.0), ("B", 2.0), ("C", 3.0)])
+    assert first["state"] == "ready"
+    assert first["changed"] == ["A", "B", "C"] and first["removed"] == []
+
+    manager = ParamManager(FakeMaster(), cache_dir=tmp_path)
+    second = download(manager, [("A", 1.0), ("B", 5.0), ("D", 4.0)])
+
+    assert second["state"] == "ready"
+    assert second["changed"] == ["B", "D"]
+    assert second["removed"] == ["C"]
+    assert sorted(second["values"]) == ["A", "B", "D"]
+    assert "C" not in manager.params
+
+
+def test_cache_dir_default_is_read_at_call_time(tmp_path, monkeypatch):
+    monkeypatch.setattr(param_manager, "CACHE_DIR", tmp_path)
+    manager = ParamManager(FakeMaster())
+    assert manager.cache_dir == tmp_path
+
+    download(manager, [("A", 1.0)])
+    assert list(tmp_path.glob("*.json"))
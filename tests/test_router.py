@@ -0,0 +1,73 @@
+import pytest
+from pymavlink.dialects.v20 import common as mavlink2
+
+from mavlink.router import FrameSplitter, parse_output_list, split_output_spec
+
+_enc = mavlink2.MAVLink(None, srcSystem=1, srcComponent=1)
+
+
+def heartbeat_frame():
+    msg = _enc.heartbeat_encode(mavlink2.MAV_TYPE_FIXED_WING, mavlink2.MAV_AUTOPILOT_ARDUPILOTMEGA, 0, 0, 0)
+    return bytes(msg.pack(_enc))
+
+
+def attitude_frame():
+    return bytes(_enc.attitude_encode(1000, 0.1, 0.2, 0.3, 0.0, 0.0, 0.0).pack(_enc))
+
+
+def test_splits_back_to_back_frames():
+    a, b = heartbeat_frame(), attitude_frame()
+    assert FrameSplitter().feed(a + b) == [a, b]
+
+
+def test_keeps_partial_frame_until_complete():
+    frame = attitude_frame()
+    splitter = FrameSplitter()
+
+    assert splitter.feed(frame[:1]) == []          # başlık eksik
+    assert splitter.feed(frame[1:7]) == []         # payload eksik
+    assert splitter.feed(frame[7:]) == [frame]
+    assert splitter.feed(b"") == []
+
+
+def test_skips_garbage_between_frames():
+    a, b = heartbeat_frame(), attitude_frame()
+    assert FrameSplitter().feed(b"\x00\x11" + a + b"junk" + b) == [a, b]
+
+
+def test_one_byte_at_a_time():
+    frames = [heartbeat_frame(), attitude_frame(), heartbeat_frame()]
+    splitter = FrameSplitter()
+    out = []
+    for byte in b"".join(frames):
+        out += splitter.feed(bytes([byte]))
+    assert out == frames
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("udp:10.0.0.5:14550", ("udp", "10.0.0.5", 14550)),
+    ("udp::14550", ("udp", "127.0.0.1", 14550)),
+    ("tcpin:5760", ("tcpin", "0.0.0.0", 5760)),
+    ("tcpin:192.168.1.2:5760", ("tcpin", "192.168.1.2", 5760)),
+    ("  udp:127.0.0.1:14551 ", ("udp", "127.0.0.1", 14551)),
+])
+def test_split_output_spec(spec, expected):
+    assert split_output_spec(spec) == expected
+
+
+@pytest.mark.parametrize("spec", [
+    "tcp:127.0.0.1:5760",       # sadece tcpin destekleniyor
+    "udp:127.0.0.1",
+    "udp:127.0.0.1:port",
+    "udp:127.0.0.1:0",
+    "tcpin:70000",
+    "",
+])
+def test_split_output_spec_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        split_output_spec(spec)
+
+
+def test_parse_output_list_drops_empty_entries():
+    assert parse_output_list(" udp:a:1, ,tcpin:2,") == ["udp:a:1", "tcpin:2"]
+    assert parse_output_list(None) == []
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from mavlink.shm_telemetry import _SEQ, SnapshotReader, SnapshotWriter
+from mavlink.telemetry_handler import Telemetry
+
+
+@pytest.fixture
+def shm():
+    reader = SnapshotReader()
+    writer = SnapshotWriter(reader.name)
+    yield reader, writer
+    writer.close()
+    reader.close()
+
+
+def make_snapshot(seq, **values):
+    state = Telemetry(**values)
+    return state.snapshot(seq, rx_time=12.5)
+
+
+def test_round_trip_keeps_values_and_none(shm):
+    reader, writer = shm
+    snap = make_snapshot(7, heartbeat=True, iha_irtifa=102.25, baglanilan_gps_sayisi=11,
+                         gps_saati=123456789, iha_otonom=1, hedef_merkez_X=320, time_boot_ms=5000)
+    writer.write(snap)
+
+    version, got = reader.read()
+
+    assert version == 2
+    assert got == snap
+    assert got.iha_hiz is None and got.vehicle_utc is None
+    assert isinstance(got.baglanilan_gps_sayisi, int)
+
+
+def test_read_returns_none_until_next_write(shm):
+    reader, writer = shm
+    assert reader.read() is None
+
+    writer.write(make_snapshot(1))
+    assert reader.read() is not None
+    assert reader.read() is None
+
+    writer.write(make_snapshot(2, iha_hiz=18.0))
+    version, got = reader.read()
+    assert version == 4 and got.seq == 2 and got.iha_hiz == 18.0
+
+
+def test_write_in_progress_is_not_read(shm):
+    reader, writer = shm
+    writer.write(make_snapshot(1))
+    _SEQ.pack_into(reader.shm.buf, 0, 3)     # yazar yarıda: sayaç tek
+
+    assert reader.read() is None
+
+
+def test_reopened_writer_continues_counter(shm):
+    reader, writer = shm
+    writer.write(make_snapshot(1))
+    reader.read()
+
+    second = SnapshotWriter(reader.name)
+    try:
+        second.write(make_snapshot(2))
+        version, got = reader.read()
+    finally:
+        second.close()
+    assert version == 4 and got.seq == 2
+
+
+def test_concurrent_reads_are_never_torn(shm):
+    reader, writer = shm
+    done = threading.Event()
+
+    def write_loop():
+        for i in range(1, 20000):
+            # Tüm tamsayı alanları aynı değeri taşır; yırtık okuma farklı değerler görür
+            writer.write(make_snapshot(i, hedef_merkez_X=i, hedef_merkez_Y=i,
+                                       hedef_genislik=i, hedef_yukseklik=i))
+        done.set()
+
+    thread = threading.Thread(target=write_loop)
+    thread.start()
+    reads = 0
+    while not done.is_set():
+        got = reader.read()
+        if got is None:
+            continue
+        snap = got[1]
+        assert snap.seq == snap.hedef_merkez_X == snap.hedef_merkez_Y == snap.hedef_genislik == snap.hedef_yukseklik
+        reads += 1
+    thread.join()
+    assert reads > 0